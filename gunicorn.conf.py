@@ -3,22 +3,25 @@ import os
 import multiprocessing
 
 # Server socket
-bind = f"0.0.0.0:{os.environ.get('PORT', 8000)}"
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', 8000)}"
 backlog = 2048
 
 # Worker processes
-workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
-worker_class = "sync"
-workers = 1
+# По умолчанию 2 * CPU + 1; на машинах с малым объемом памяти задайте WEB_CONCURRENCY равным числу CPU.
+# Задачи и статусы хранятся в БД, поэтому запросы к одной задаче могут обслуживать разные воркеры
+workers = int(os.environ.get('GUNICORN_WORKERS') or os.environ.get('WEB_CONCURRENCY') or multiprocessing.cpu_count() * 2 + 1)
+# gthread: долгоживущие потоки статуса (SSE) не должны занимать весь worker.
+# Каждая открытая страница статуса держит поток до 30 секунд (STATUS_STREAM_MAX_SECONDS),
+# поэтому GUNICORN_THREADS должен покрывать одновременно открытые страницы статуса плюс обычные запросы
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
 worker_connections = 1000
-max_requests = 1000
-max_requests_jitter = 100
 timeout = int(os.environ.get('GUNICORN_TIMEOUT', 300))  # 5 минут для обработки файлов
 keepalive = 2
 
 # Restart workers
 max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
-max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 50))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
 preload_app = True
 
 # Logging
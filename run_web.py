@@ -5,15 +5,19 @@
 """
 
 import os
+import re
 import sys
 import json
 import uuid
 import time
+import gzip
 import hashlib
+import mimetypes
+import shutil
 import threading
 from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Tuple
 import logging
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor
@@ -26,11 +30,20 @@ except ImportError:
     # python-dotenv не установлен, переменные окружения должны быть установлены системно
     pass
 
+# Brotli (опционально): без него статика сжимается только gzip
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
 # Веб-фреймворк
 try:
-    from flask import Flask, request, render_template_string, jsonify, send_file, redirect, url_for, flash, session
+    from flask import Flask, Response, request, render_template, stream_template, jsonify, send_file, redirect, url_for, flash, session, stream_with_context
     from werkzeug.utils import secure_filename as werkzeug_secure_filename
+    from werkzeug.security import safe_join
     from werkzeug.exceptions import RequestEntityTooLarge
+    from markupsafe import Markup, escape
 except ImportError:
     print("❌ Установите Flask: pip install Flask")
     sys.exit(1)
@@ -40,7 +53,8 @@ try:
     from meeting_processor import MeetingProcessor
     from config_loader import ConfigLoader
     from file_utils import FileUtils
-    from web_templates import WebTemplates
+    from web_templates import WebTemplates, TEMPLATE_FILTERS, DOCS_METADATA, render_markdown, render_markdown_with_toc
+    from web_assets import AssetBundle
     from auth import create_auth_system, require_auth, get_current_user_id, \
         get_current_user, is_authenticated, is_current_user_admin
     from database import create_database_manager
@@ -60,16 +74,21 @@ except ImportError as e:
 # Настройка логирования
 def setup_logging(log_level: str = "DEBUG", log_file: str = "web_app.log"):
     """Настраивает систему логирования"""
-    from logging.handlers import RotatingFileHandler
+    from logging.handlers import RotatingFileHandler, QueueHandler
     
     level = getattr(logging, log_level.upper(), logging.INFO)
     
-    # Создаем папку для логов
-    os.makedirs("logs", exist_ok=True)
-    log_path = os.path.join("logs", log_file)
+    # Создаем папку для логов (LOG_DIR переопределяет ее, например, для тестов)
+    log_dir = os.environ.get('LOG_DIR', 'logs')
+    os.makedirs(log_dir, exist_ok=True)
+    log_path = os.path.join(log_dir, log_file)
     
-    # Очищаем существующие обработчики
+    # Логирование через очередь уже настроено точкой входа (wsgi.py): не заменяем его
     root_logger = logging.getLogger()
+    if any(isinstance(handler, QueueHandler) for handler in root_logger.handlers):
+        return logging.getLogger(__name__)
+    
+    # Очищаем существующие обработчики
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
     
@@ -101,6 +120,67 @@ logger = setup_logging()
 # Не пустая строка, чтобы не ломать required-валидацию формы и DatabaseValidator.
 NO_PROTOCOL_TEMPLATE = 'none'
 
+# Server-Sent Events статуса задачи: как часто перечитывать БД без уведомлений
+# (задача может обрабатываться другим worker'ом) и сколько живёт одно соединение.
+# Открытый поток занимает поток gthread-воркера, поэтому соединение короткое:
+# EventSource переподключается сам через STATUS_STREAM_RETRY_MS и может попасть в другой воркер
+STATUS_STREAM_POLL_SECONDS = 2.0
+STATUS_STREAM_MAX_SECONDS = 30
+# Пауза перед переподключением EventSource и интервал комментариев-keepalive,
+# чтобы прокси не закрывали «молчащее» соединение
+STATUS_STREAM_RETRY_MS = 3000
+STATUS_STREAM_KEEPALIVE_SECONDS = 15.0
+
+# Типы статических файлов, которые имеет смысл сжимать заранее
+COMPRESSIBLE_STATIC_EXTENSIONS = {'.css', '.js', '.mjs', '.svg', '.json', '.html', '.txt'}
+
+# Сжатие динамических ответов «на лету»: типы, минимальный размер и уровни
+# (ниже, чем для заранее сжатой статики, — сжатие идет на каждый запрос)
+COMPRESSIBLE_RESPONSE_MIMETYPES = {'text/html', 'text/plain', 'text/markdown', 'application/json'}
+COMPRESS_MIN_SIZE = 500
+DYNAMIC_GZIP_LEVEL = 6
+DYNAMIC_BROTLI_QUALITY = 5
+
+# Загрузка файла частями: заголовок Content-Range части и допустимый идентификатор загрузки
+CONTENT_RANGE_RE = re.compile(r'bytes (\d+)-(\d+)/(\d+)')
+UPLOAD_ID_RE = re.compile(r'[\w-]{8,64}')
+
+# Время кеширования в браузере страниц без данных запроса (секунды)
+STATIC_PAGE_MAX_AGE = 300
+
+
+def compress_payload(data: bytes) -> Dict[str, bytes]:
+    """Сжимает данные всеми доступными кодировками (br — если установлен brotli)"""
+    variants = {'gzip': gzip.compress(data, compresslevel=9)}
+    if BROTLI_AVAILABLE:
+        variants['br'] = brotli.compress(data, quality=11)
+    return variants
+
+
+def compress_dynamic(data: bytes, encoding: str) -> bytes:
+    """Быстро сжимает тело динамического ответа указанной кодировкой"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=DYNAMIC_BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=DYNAMIC_GZIP_LEVEL)
+
+
+def choose_content_encoding(accept_encodings, available) -> Optional[str]:
+    """Выбирает кодировку ответа по заголовку Accept-Encoding (br предпочтительнее gzip)"""
+    for encoding in ('br', 'gzip'):
+        if encoding in available and accept_encodings[encoding] > 0:
+            return encoding
+    return None
+
+
+# Документы раздела "Документация" по имени в URL
+DOCS_BY_NAME = {doc['name']: doc for doc in DOCS_METADATA}
+
+
+def render_docs_markdown(text: str):
+    """Рендерит документацию: переносы строк сохраняются, строится оглавление"""
+    return render_markdown_with_toc(text, breaks=True)
+
+
 def secure_filename_unicode(filename: str) -> str:
     """
     Безопасная обработка имени файла с поддержкой русских символов
@@ -199,6 +279,19 @@ class WorkingMeetingWebApp:
         
         # Инициализируем шаблоны
         self.templates = WebTemplates()
+        # Общий каркас страниц ({% extends "_layout.html" %}) компилируется один раз
+        self.app.jinja_loader = self.templates.get_loader()
+        self.app.jinja_env.filters.update(TEMPLATE_FILTERS)
+        self._templates_cache = None
+        self._template_options_cache = {}
+
+        # Уведомления об изменении задач для потоков статуса (SSE)
+        self._job_update_cond = threading.Condition()
+
+        # Кеш HTML протоколов и документации, отрендеренных из Markdown:
+        # (job_id, file_type) -> (mtime_ns, html), ('docs', doc_name) -> (mtime_ns, (html, toc))
+        self._markdown_cache = OrderedDict()
+        self._markdown_cache_lock = threading.Lock()
 
         # Кеш ответов чата по транскрипту (in-process, best-effort, отдельный на каждый worker)
         self._chat_cache = OrderedDict()
@@ -206,6 +299,9 @@ class WorkingMeetingWebApp:
 
         # Настраиваем middleware
         self.setup_middleware()
+
+        # Статические ресурсы (CSS/JS) с версионированными URL
+        self.setup_static_assets()
         
         # Настраиваем маршруты
         self.setup_routes()
@@ -217,6 +313,8 @@ class WorkingMeetingWebApp:
         # Максимальный размер файла
         max_size_mb = self.config.get("settings", {}).get("max_file_size_mb", 200)
         self.app.config['MAX_CONTENT_LENGTH'] = max_size_mb * 1024 * 1024
+        # Ответы API не сортируются по ключам: порядок полей задается кодом, без лишней работы
+        self.app.json.sort_keys = False
         
         # Поддерживаемые форматы файлов
         self.allowed_extensions = {'mp3', 'wav', 'flac', 'aac', 'm4a', 'ogg', 'opus', 'mp4', 'avi', 'mov', 'mkv', 'wmv', 'webm'}
@@ -232,10 +330,10 @@ class WorkingMeetingWebApp:
         # Настройки обработки
         self.processing_settings = self.config.get("settings", {})
         
-        # Создаем строки для HTML
+        # Создаем строки для HTML (экранируются один раз, шаблон вставляет их как есть)
         self.allowed_extensions_list = sorted(list(self.allowed_extensions))
-        self.accept_string = ','.join([f'.{ext}' for ext in self.allowed_extensions_list])
-        self.formats_display = ', '.join([ext.upper() for ext in self.allowed_extensions_list])
+        self.accept_string = escape(','.join([f'.{ext}' for ext in self.allowed_extensions_list]))
+        self.formats_display = escape(', '.join([ext.upper() for ext in self.allowed_extensions_list]))
         
         logger.info(f"Максимальный размер файла: {max_size_mb} МБ")
         logger.info(f"Поддерживаемые форматы: {self.formats_display}")
@@ -250,6 +348,249 @@ class WorkingMeetingWebApp:
         
         logger.info("Middleware аутентификации настроен")
     
+    def setup_static_assets(self):
+        """Настраивает версионированные URL статики, предсжатие и долгосрочное кеширование"""
+        self._static_versions = {}
+        self._static_compressed = {}
+        # Страницы без данных запроса: имя -> {'body': bytes, 'etag': str}
+        self._static_pages = {}
+        # Как построить такую страницу: имя -> (шаблон, функция контекста)
+        self._static_page_sources = {
+            'index': ('index.html', self._index_page_context),
+            'docs_index': ('docs_index.html', lambda: {'docs': DOCS_METADATA}),
+            'jobs_empty': ('jobs.html', lambda: {'jobs': [], 'is_admin': False}),
+            'jobs_empty_admin': ('jobs.html', lambda: {'jobs': [], 'is_admin': True}),
+        }
+        # Версия исходных данных страницы: при ее изменении страница рендерится заново
+        self._static_page_versions = {
+            'index': self._templates_config_mtime,
+        }
+
+        # Bootstrap: локальная раздача (web.self_host_assets) или CDN
+        web_config = self.config.get('web', {})
+        self.asset_bundle = AssetBundle()
+        if web_config.get('self_host_assets', False):
+            self.asset_bundle.load(timeout=web_config.get('assets_fetch_timeout', 10))
+        self._bundle_assets = {}
+        for filename, (data, mimetype) in self.asset_bundle.files.items():
+            compressible = mimetype.startswith('text/')
+            self._bundle_assets[filename] = {
+                'data': data,
+                'etag': hashlib.sha1(data).hexdigest(),
+                'mimetype': mimetype,
+                'variants': compress_payload(data) if compressible else {},
+            }
+
+        # Версия разметки страницы документации: входит в ее ETag
+        self._docs_view_version = hashlib.sha1(''.join([
+            self.templates.get_layout_template(),
+            self.templates.get_nav_template(),
+            self.templates.get_docs_view_template(),
+            self.asset_bundle.style_tags(),
+            self.asset_bundle.script_tags(),
+        ]).encode('utf-8') + b''.join(
+            self._read_static_file(filename) for filename in ('css/icons.css', 'css/docs-view.css', 'js/docs-view.mjs')
+        )).hexdigest()[:8]
+
+        self.app.jinja_env.globals.update(
+            static_url=self.static_url,
+            asset_styles=self.asset_bundle.style_tags(),
+            asset_scripts=self.asset_bundle.script_tags(),
+        )
+        self.app.view_functions['static'] = self._serve_static
+        self.app.after_request(self._add_static_cache_headers)
+        if self.config.get('web', {}).get('compress_responses', True):
+            self.app.after_request(self._compress_response)
+
+    def _get_compressed_static(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Возвращает заранее сжатые варианты статического файла (пересжимает при изменении)"""
+        if Path(filename).suffix.lower() not in COMPRESSIBLE_STATIC_EXTENSIONS:
+            return None
+        file_path = safe_join(self.app.static_folder, filename)
+        if not file_path or not os.path.isfile(file_path):
+            return None
+
+        mtime_ns = os.stat(file_path).st_mtime_ns
+        asset = self._static_compressed.get(filename)
+        if asset is None or asset['mtime_ns'] != mtime_ns:
+            data = Path(file_path).read_bytes()
+            asset = {
+                'mtime_ns': mtime_ns,
+                'etag': hashlib.sha1(data).hexdigest(),
+                'mimetype': mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+                'variants': compress_payload(data),
+            }
+            self._static_compressed[filename] = asset
+        return asset
+
+    def _serve_static(self, filename: str):
+        """Отдает статический файл, по возможности заранее сжатым (br/gzip)"""
+        asset = self._bundle_assets.get(filename) or self._get_compressed_static(filename)
+        if asset is None:
+            return self.app.send_static_file(filename)
+
+        encoding = choose_content_encoding(request.accept_encodings, asset['variants'])
+        if encoding is None and 'data' in asset:
+            # Файл бандла библиотек: на диске его нет, отдаем из памяти
+            response = Response(asset['data'], mimetype=asset['mimetype'])
+            response.set_etag(asset['etag'])
+            response.cache_control.no_cache = True
+            response = response.make_conditional(request)
+        elif encoding is None:
+            response = self.app.send_static_file(filename)
+        else:
+            response = Response(asset['variants'][encoding], mimetype=asset['mimetype'])
+            response.headers['Content-Encoding'] = encoding
+            response.set_etag(f"{asset['etag']}-{encoding}")
+            response.cache_control.no_cache = True
+            response = response.make_conditional(request)
+        response.vary.add('Accept-Encoding')
+        return response
+
+    def _read_static_file(self, filename: str) -> bytes:
+        """Читает статический файл; при ошибке возвращает пустое содержимое"""
+        try:
+            return (Path(self.app.static_folder) / filename).read_bytes()
+        except OSError as e:
+            logger.warning(f"Не удалось прочитать статический файл {filename}: {e}")
+            return b''
+
+    def static_url(self, filename: str) -> str:
+        """Возвращает URL статического файла с хешем содержимого в параметре v"""
+        version = self._static_versions.get(filename)
+        if version is None:
+            try:
+                file_path = Path(self.app.static_folder) / filename
+                version = hashlib.sha1(file_path.read_bytes()).hexdigest()[:12]
+            except OSError as e:
+                logger.warning(f"Не удалось вычислить версию статического файла {filename}: {e}")
+                return url_for('static', filename=filename)
+            self._static_versions[filename] = version
+        return url_for('static', filename=filename, v=version)
+
+    def _index_page_context(self) -> Dict[str, Any]:
+        """Контекст главной страницы: он не зависит от пользователя и запроса"""
+        return {
+            'template_options': self.get_template_options(selected='standard'),
+            'available_models': self.get_available_models(),
+            'default_model': self.get_default_model(),
+            'max_size_mb': self.app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024),
+            'accept_string': self.accept_string,
+            'formats_display': self.formats_display,
+        }
+
+    def _get_static_page(self, name: str) -> Dict[str, Any]:
+        """Возвращает готовую страницу без данных запроса, при первом обращении рендерит и сжимает ее"""
+        get_version = self._static_page_versions.get(name)
+        version = get_version() if get_version else None
+        page = self._static_pages.get(name)
+        if page is None or page['version'] != version:
+            template_name, get_context = self._static_page_sources[name]
+            body = render_template(template_name, **get_context()).encode('utf-8')
+            page = {
+                'body': body,
+                'etag': hashlib.sha1(body).hexdigest(),
+                'variants': compress_payload(body),
+                'version': version,
+            }
+            self._static_pages[name] = page
+        return page
+
+    def prebuild_static_pages(self):
+        """Рендерит страницы без данных запроса заранее, чтобы первый запрос не ждал рендера и сжатия"""
+        with self.app.test_request_context('/'):
+            for name in self._static_page_sources:
+                self._get_static_page(name)
+        logger.info(f"Подготовлено страниц без данных запроса: {len(self._static_pages)}")
+
+    def warmup(self):
+        """Выполняет работу первого запроса заранее (при preload_app — один раз в master gunicorn)
+
+        Компилирует все шаблоны, готовит страницы без данных запроса и прогоняет
+        служебный запрос /health: карта URL, middleware и JSON-провайдер
+        инициализируются до прихода первого пользователя.
+        """
+        started = time.monotonic()
+        for name in self.app.jinja_env.list_templates():
+            self.app.jinja_env.get_template(name)
+        self.prebuild_static_pages()
+        response = self.app.test_client().get('/health')
+        logger.info(f"Прогрев приложения завершен за {time.monotonic() - started:.2f} с (/health: {response.status_code})")
+
+    def _static_page_response(self, name: str, max_age: int = STATIC_PAGE_MAX_AGE):
+        """Отдает страницу, одинаковую для всех запросов: рендер и ETag вычисляются один раз.
+
+        Готовые байты (и их заранее сжатые br/gzip варианты) отдаются как есть
+        (direct_passthrough), без Jinja и без сжатия на каждый запрос.
+        Страницы за авторизацией передают max_age=0: браузер не кеширует их
+        публично и каждый раз перепроверяет по ETag.
+        """
+        page = self._get_static_page(name)
+
+        encoding = choose_content_encoding(request.accept_encodings, page['variants'])
+        if encoding is None:
+            response = Response(page['body'], mimetype='text/html', direct_passthrough=True)
+            response.set_etag(page['etag'])
+        else:
+            response = Response(page['variants'][encoding], mimetype='text/html', direct_passthrough=True)
+            response.headers['Content-Encoding'] = encoding
+            response.set_etag(f"{page['etag']}-{encoding}")
+        response.vary.add('Accept-Encoding')
+        if max_age:
+            response.cache_control.public = True
+            response.cache_control.max_age = max_age
+        else:
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+    def _private_conditional_response(self, response):
+        """Добавляет ETag к ответу с данными пользователя; повторный запрос без изменений получает 304
+
+        Браузер перепроверяет ответ при каждом обращении (no-cache), общие кеши его не сохраняют.
+        """
+        response.add_etag()
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+    def _compress_response(self, response):
+        """Сжимает HTML/JSON ответы маршрутов (br/gzip), если клиент это поддерживает
+
+        Пропускаются потоковые ответы и файлы (direct_passthrough), уже сжатые
+        ответы и тела меньше COMPRESS_MIN_SIZE. Сильный ETag становится слабым:
+        сжатое тело отличается побайтно, но 304 по If-None-Match продолжает работать.
+        """
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_RESPONSE_MIMETYPES):
+            return response
+
+        available = ('br', 'gzip') if BROTLI_AVAILABLE else ('gzip',)
+        encoding = choose_content_encoding(request.accept_encodings, available)
+        response.vary.add('Accept-Encoding')
+        if encoding is None:
+            return response
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return response
+
+        response.set_data(compress_dynamic(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    def _add_static_cache_headers(self, response):
+        """Помечает версионированную статику как неизменяемую (кеш браузера на год)"""
+        if request.endpoint == 'static' and request.args.get('v') and response.status_code in (200, 304):
+            response.cache_control.public = True
+            response.cache_control.max_age = 31536000
+            response.cache_control.immutable = True
+            response.cache_control.no_cache = None
+        return response
+
     def _init_confluence(self):
         """Инициализирует Confluence интеграцию"""
         try:
@@ -361,9 +702,29 @@ class WorkingMeetingWebApp:
         благодаря чему веб-UI, CLI-утилиты и core-обработчик видят одинаковый
         список шаблонов.
         """
-        templates_config_path = self.config.get("paths", {}).get(
-            "templates_config", "templates_config.json"
-        )
+        # Файл перечитывается только при изменении (по mtime)
+        mtime_ns = self._templates_config_mtime()
+        if self._templates_cache is not None and self._templates_cache[0] == mtime_ns:
+            return self._templates_cache[1]
+
+        descriptions = self._load_template_descriptions(self._templates_config_path())
+        self._templates_cache = (mtime_ns, descriptions)
+        self._template_options_cache = {}
+        return descriptions
+
+    def _templates_config_path(self) -> str:
+        """Путь к templates_config.json"""
+        return self.config.get("paths", {}).get("templates_config", "templates_config.json")
+
+    def _templates_config_mtime(self) -> Optional[int]:
+        """Время изменения templates_config.json (None, если файла нет)"""
+        try:
+            return os.stat(self._templates_config_path()).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load_template_descriptions(self, templates_config_path: str) -> Dict[str, str]:
+        """Читает описания шаблонов из templates_config.json (с фоллбэком на встроенный список)"""
         try:
             with open(templates_config_path, "r", encoding="utf-8") as f:
                 templates_config = json.load(f)
@@ -385,6 +746,16 @@ class WorkingMeetingWebApp:
             "auto": "Автоматическое определение типа встречи"
         }
 
+    def get_template_options(self, selected: Optional[str] = None, exclude: Optional[str] = None):
+        """Возвращает готовый HTML <option> шаблонов (кешируется до изменения templates_config.json)"""
+        templates = self.get_available_templates()
+        key = (selected, exclude)
+        options = self._template_options_cache.get(key)
+        if options is None:
+            options = self.templates.build_template_options(templates, selected=selected, exclude=exclude)
+            self._template_options_cache[key] = options
+        return options
+
     def get_available_models(self) -> Dict[str, str]:
         """Возвращает доступные модели OpenRouter (id -> человеко-читаемое описание) из config.available_models"""
         return self.config.get("available_models", {})
@@ -540,6 +911,40 @@ class WorkingMeetingWebApp:
             while len(self._chat_cache) > max_size:
                 self._chat_cache.popitem(last=False)
 
+    def get_rendered_markdown(self, key: Tuple[str, str], file_path: str, render=render_markdown,
+                              max_size: int = 64) -> Tuple[int, Any]:
+        """Возвращает (mtime_ns, результат render) для файла Markdown; рендерит заново только при изменении файла"""
+        mtime_ns = os.stat(file_path).st_mtime_ns
+        with self._markdown_cache_lock:
+            item = self._markdown_cache.get(key)
+            if item and item[0] == mtime_ns:
+                self._markdown_cache.move_to_end(key)
+                return item
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            item = (mtime_ns, render(f.read()))
+
+        with self._markdown_cache_lock:
+            self._markdown_cache[key] = item
+            self._markdown_cache.move_to_end(key)
+            while len(self._markdown_cache) > max_size:
+                self._markdown_cache.popitem(last=False)
+        return item
+
+    def _status_page_context(self, job_id: str, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Данные для страницы статуса и ее карточки с действиями"""
+        stage = self.compute_job_stage(job)
+        return {
+            'job_id': job_id,
+            'job': job,
+            'stage': stage,
+            'stage_display': self.templates.get_stage_display(stage),
+            'other_template_options': self.get_template_options(exclude=job['template']),
+            'retry_template_options': self.get_template_options(selected=job['template']),
+            'available_models': self.get_available_models(),
+            'current_model': self.get_job_model(job),
+        }
+
     def compute_job_stage(self, job: Dict[str, Any]) -> str:
         """Определяет отображаемый этап задачи по status + наличию transcript_file.
 
@@ -564,6 +969,24 @@ class WorkingMeetingWebApp:
     def update_job_status(self, job_id: str, **kwargs):
         """Безопасно обновляет статус задачи в базе данных"""
         self.update_job_in_db(job_id, kwargs)
+        self._notify_job_update()
+
+    def _notify_job_update(self):
+        """Будит потоки статуса (SSE), ожидающие изменений задач"""
+        with self._job_update_cond:
+            self._job_update_cond.notify_all()
+
+    def _job_status_payload(self, job: Dict) -> Dict[str, Any]:
+        """Формирует данные статуса задачи для API и потока событий"""
+        return {
+            'status': job['status'],
+            'stage': self.compute_job_stage(job),
+            'transcript_ready': bool(job.get('transcript_file')),
+            'progress': job['progress'],
+            'message': job['message'],
+            'filename': job['filename'],
+            'template': job['template']
+        }
     
     def get_job_status(self, job_id: str) -> Optional[Dict]:
         """Безопасно получает статус задачи из базы данных"""
@@ -636,6 +1059,11 @@ class WorkingMeetingWebApp:
         """Возвращает каталог для временных файлов конкретной задачи."""
         return self.temp_folder / job_id
 
+    def get_chunked_upload_path(self, user_id: str, upload_id: str, complete: bool = False) -> Path:
+        """Файл загружаемого частями файла в temp_files (брошенные загрузки удаляет очистка temp_files)"""
+        key = hashlib.sha1(f"{user_id}:{upload_id}".encode('utf-8')).hexdigest()
+        return self.temp_folder / f"upload_{key}.{'complete' if complete else 'part'}"
+
     def _temp_cleanup_loop(self):
         """Фоновый цикл периодической очистки устаревших временных файлов."""
         # Первая чистка — сразу при старте, чтобы убрать остатки прошлых запусков.
@@ -1029,26 +1457,10 @@ class WorkingMeetingWebApp:
             if not user:
                 return jsonify({'error': 'User authentication failed'}), 401
             
-            templates = self.get_available_templates()
-            available_models = self.get_available_models()
-            default_model = self.get_default_model()
-            max_size_mb = self.app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)
-
-            # Получаем информацию о пользователе для отображения
-            user_info = get_current_user()
-            user_name = self.user_manager.get_user_display_name(user_info) if user_info else "Unknown User"
-
-            return render_template_string(
-                self.templates.get_index_template(),
-                templates=templates,
-                available_models=available_models,
-                default_model=default_model,
-                max_size_mb=max_size_mb,
-                accept_string=self.accept_string,
-                formats_display=self.formats_display,
-                user_name=user_name,
-                user_id=get_current_user_id()
-            )
+            # Без flash-сообщений страница одинакова для всех пользователей
+            if '_flashes' in session:
+                return render_template('index.html', **self._index_page_context())
+            return self._static_page_response('index', max_age=0)
         
         @self.app.route('/upload', methods=['POST'])
         @require_auth()
@@ -1063,21 +1475,28 @@ class WorkingMeetingWebApp:
                 
                 user_id = get_current_user_id()
                 
-                if 'file' not in request.files:
+                # Файл либо пришел в форме, либо уже загружен частями через /upload/chunk
+                upload_id = request.form.get('upload_id', '')
+                if upload_id:
+                    file = None
+                    original_filename = request.form.get('filename', '')
+                elif 'file' in request.files:
+                    file = request.files['file']
+                    original_filename = file.filename
+                else:
                     flash('Файл не выбран', 'error')
                     return redirect(url_for('index'))
                 
-                file = request.files['file']
                 template_type = request.form.get('template', 'standard')
                 selected_model = self.resolve_model(request.form.get('model'))
 
-                logger.info(f"📤 Получен файл для загрузки: '{file.filename}' (пользователь: {user_id}, модель: {selected_model})")
+                logger.info(f"📤 Получен файл для загрузки: '{original_filename}' (пользователь: {user_id}, модель: {selected_model})")
                 
-                if file.filename == '':
+                if original_filename == '':
                     flash('Файл не выбран', 'error')
                     return redirect(url_for('index'))
                 
-                if not self.allowed_file(file.filename):
+                if not self.allowed_file(original_filename):
                     flash(f'Неподдерживаемый формат файла. Разрешены: {self.formats_display}', 'error')
                     return redirect(url_for('index'))
                 
@@ -1085,8 +1504,7 @@ class WorkingMeetingWebApp:
                 job_id = str(uuid.uuid4())
                 
                 # Сохраняем файл в пользовательскую директорию
-                original_filename = file.filename
-                filename = secure_filename_unicode(file.filename)
+                filename = secure_filename_unicode(original_filename)
                 user_upload_dir = self.upload_folder / user_id
                 user_upload_dir.mkdir(exist_ok=True)
                 file_path = user_upload_dir / f"{job_id}_{filename}"
@@ -1096,7 +1514,14 @@ class WorkingMeetingWebApp:
                 logger.info(f"   Безопасное имя: '{filename}'")
                 logger.info(f"   Полный путь: '{file_path}'")
                 
-                file.save(str(file_path))
+                if file is not None:
+                    file.save(str(file_path))
+                else:
+                    complete_path = self.get_chunked_upload_path(user_id, upload_id, complete=True)
+                    if not complete_path.exists():
+                        flash('Загрузка файла не завершена, попробуйте еще раз', 'error')
+                        return redirect(url_for('index'))
+                    shutil.move(str(complete_path), str(file_path))
                 
                 logger.info(f"📁 Файл загружен: {filename} (ID: {job_id}, пользователь: {user_id}, шаблон: {template_type})")
                 
@@ -1135,6 +1560,45 @@ class WorkingMeetingWebApp:
                 flash(f'Ошибка загрузки файла: {str(e)}', 'error')
                 return redirect(url_for('index'))
         
+        @self.app.route('/upload/chunk', methods=['POST'])
+        @require_auth(redirect_on_failure=False)
+        def upload_chunk():
+            """Прием очередной части файла (Content-Range); после последней части файл готов для /upload"""
+            upload_id = request.headers.get('X-Upload-Id', '')
+            content_range = CONTENT_RANGE_RE.fullmatch(request.headers.get('Content-Range', ''))
+            if not UPLOAD_ID_RE.fullmatch(upload_id) or not content_range:
+                return jsonify({'error': 'Invalid upload id or Content-Range'}), 400
+
+            start, end, total = (int(value) for value in content_range.groups())
+            if total > self.app.config['MAX_CONTENT_LENGTH']:
+                max_size = self.app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)
+                return jsonify({'error': f'Файл слишком большой. Максимальный размер: {max_size} МБ'}), 413
+
+            part_path = self.get_chunked_upload_path(get_current_user_id(), upload_id)
+            received = part_path.stat().st_size if part_path.exists() else 0
+            # Часть не с той позиции (повтор после обрыва): клиент продолжит с received
+            if start != received:
+                return jsonify({'received': received}), 409
+
+            data = request.get_data(cache=False)
+            if end < start or end >= total or len(data) != end - start + 1:
+                return jsonify({'error': 'Chunk size does not match Content-Range'}), 400
+
+            # Пишем по смещению start, а не в конец файла: если повтор той же части (нестабильная сеть)
+            # прошел проверку одновременно с оригиналом, он перезапишет те же байты, а не допишет их еще раз
+            with os.fdopen(os.open(part_path, os.O_WRONLY | os.O_CREAT, 0o600), 'wb') as f:
+                f.seek(start)
+                f.write(data)
+                f.flush()
+                received = os.fstat(f.fileno()).st_size
+            if received == total:
+                try:
+                    os.replace(part_path, self.get_chunked_upload_path(get_current_user_id(), upload_id, complete=True))
+                except FileNotFoundError:
+                    # Последнюю часть одновременно принял повторный запрос и уже переименовал файл
+                    pass
+            return jsonify({'received': received})
+
         @self.app.route('/status/<job_id>')
         @require_auth()
         def status(job_id: str):
@@ -1144,21 +1608,26 @@ class WorkingMeetingWebApp:
                 flash('Задача не найдена или у вас нет доступа к ней', 'error')
                 return redirect(url_for('index'))
             
-            templates = self.get_available_templates()
-            available_models = self.get_available_models()
-            current_model = self.get_job_model(job)
-            stage = self.compute_job_stage(job)
-
-            return render_template_string(
-                self.templates.get_status_template(),
-                job_id=job_id,
-                job=job,
-                stage=stage,
-                templates=templates,
-                available_models=available_models,
-                current_model=current_model
+            return render_template(
+                'status.html',
+                **self._status_page_context(job_id, job)
             )
 
+        @self.app.route('/api/job_actions/<job_id>')
+        @require_auth(redirect_on_failure=False)
+        def api_job_actions(job_id: str):
+            """HTML карточки статуса задачи для обновления страницы без перезагрузки"""
+            job = self.get_job_status(job_id)
+            if not job:
+                return jsonify({'error': 'Job not found or access denied'}), 404
+
+            response = Response(render_template(
+                '_job_actions.html',
+                **self._status_page_context(job_id, job)
+            ))
+            response.cache_control.no_store = True
+            return response
+
         @self.app.route('/api/status/<job_id>')
         @require_auth(redirect_on_failure=False)
         def api_status(job_id: str):
@@ -1167,16 +1636,72 @@ class WorkingMeetingWebApp:
             if not job:
                 return jsonify({'error': 'Job not found or access denied'}), 404
 
-            return jsonify({
-                'status': job['status'],
-                'stage': self.compute_job_stage(job),
-                'transcript_ready': bool(job.get('transcript_file')),
-                'progress': job['progress'],
-                'message': job['message'],
-                'filename': job['filename'],
-                'template': job['template']
-            })
+            return self._private_conditional_response(jsonify(self._job_status_payload(job)))
+
+        @self.app.route('/api/status_stream/<job_id>')
+        @require_auth(redirect_on_failure=False)
+        def api_status_stream(job_id: str):
+            """Поток Server-Sent Events с обновлениями статуса задачи"""
+            job = self.get_job_status(job_id)
+            if not job:
+                return jsonify({'error': 'Job not found or access denied'}), 404
+
+            owner_id = None if is_current_user_admin() else get_current_user_id()
+
+            def generate():
+                last_payload = None
+                deadline = time.monotonic() + STATUS_STREAM_MAX_SECONDS
+                last_sent = time.monotonic()
+                current = job
+                yield f"retry: {STATUS_STREAM_RETRY_MS}\n\n"
+                while current:
+                    payload = json.dumps(self._job_status_payload(current), ensure_ascii=False)
+                    if payload != last_payload:
+                        last_payload = payload
+                        last_sent = time.monotonic()
+                        yield f"data: {payload}\n\n"
+                    elif time.monotonic() - last_sent >= STATUS_STREAM_KEEPALIVE_SECONDS:
+                        last_sent = time.monotonic()
+                        yield ": keepalive\n\n"
+                    if current['status'] in ('completed', 'error') or time.monotonic() >= deadline:
+                        return
+                    with self._job_update_cond:
+                        self._job_update_cond.wait(timeout=STATUS_STREAM_POLL_SECONDS)
+                    current = self.db_manager.get_job_by_id(job_id, owner_id)
+
+            return Response(
+                stream_with_context(generate()),
+                mimetype='text/event-stream',
+                # X-Accel-Buffering: nginx не должен копить события в буфере
+                headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+            )
         
+        @self.app.route('/api/raw/<job_id>/<file_type>')
+        @require_auth(redirect_on_failure=False)
+        def api_raw_file(job_id: str, file_type: str):
+            """Содержимое результирующего файла как текст, с ETag и ответом 304"""
+            job = self.get_job_status(job_id)
+            if not job:
+                return jsonify({'error': 'Job not found or access denied'}), 404
+
+            if file_type == 'transcript':
+                file_path = job.get('transcript_file')
+                mimetype = 'text/plain'
+            elif file_type == 'summary':
+                file_path = job.get('summary_file')
+                mimetype = 'text/markdown'
+            else:
+                return jsonify({'error': 'Unknown file type'}), 400
+
+            if not file_path or not os.path.exists(file_path):
+                return jsonify({'error': 'File not found'}), 404
+
+            response = send_file(file_path, mimetype=mimetype, conditional=True, etag=True)
+            # Файл виден только владельцу задачи: общие кеши его не сохраняют
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+
         @self.app.route('/download/<job_id>/<file_type>')
         @require_auth()
         def download_file(job_id: str, file_type: str):
@@ -1234,18 +1759,21 @@ class WorkingMeetingWebApp:
                     flash('Файл не найден', 'error')
                     return redirect(url_for('status', job_id=job_id))
                 
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                # Транскрипт страница подгружает через /api/raw, протокол рендерится здесь (с кешем)
+                content_html = None
+                if is_markdown:
+                    _, content_html = self.get_rendered_markdown((job_id, file_type), file_path)
                 
-                return render_template_string(
-                    self.templates.get_view_template(),
-                    content=content,
+                response = Response(render_template(
+                    'view.html',
+                    content_html=content_html,
                     file_title=file_title,
                     filename=job['filename'],
                     job_id=job_id,
                     file_type=file_type,
                     is_markdown=is_markdown
-                )
+                ))
+                return self._private_conditional_response(response)
                 
             except Exception as e:
                 logger.error(f"❌ Ошибка просмотра файла: {e}")
@@ -1266,8 +1794,8 @@ class WorkingMeetingWebApp:
                 flash('Транскрипт недоступен — чат по этой задаче невозможен', 'error')
                 return redirect(url_for('status', job_id=job_id))
 
-            return render_template_string(
-                self.templates.get_chat_template(),
+            return render_template(
+                'chat.html',
                 job_id=job_id,
                 filename=job.get('filename', ''),
                 available_models=self.get_available_models(),
@@ -1315,7 +1843,7 @@ class WorkingMeetingWebApp:
             cache_key = self._chat_cache_key(selected_model, transcript_fp, history)
             cached = self.chat_cache_get(cache_key, cfg['response_cache_ttl'])
             if cached is not None:
-                return jsonify({'reply': cached, 'model': selected_model, 'cached': True})
+                return jsonify({'reply': cached, 'html': render_markdown(cached), 'model': selected_model, 'cached': True})
 
             try:
                 from openrouter_client import OpenRouterClient
@@ -1342,7 +1870,7 @@ class WorkingMeetingWebApp:
                 return jsonify({'error': 'Модель вернула пустой ответ'}), 502
 
             self.chat_cache_put(cache_key, reply, cfg['response_cache_size'])
-            return jsonify({'reply': reply, 'model': selected_model, 'cached': False})
+            return jsonify({'reply': reply, 'html': render_markdown(reply), 'model': selected_model, 'cached': False})
 
         @self.app.route('/generate_protocol/<job_id>', methods=['POST'])
         @require_auth()
@@ -1506,9 +2034,13 @@ class WorkingMeetingWebApp:
                         entry['user_display'] = job_data.get('user_display', job_data['user_id'])
                     jobs.append(entry)
 
-                return render_template_string(
-                    self.templates.get_jobs_template(),
+                if not jobs:
+                    return self._static_page_response('jobs_empty_admin' if admin else 'jobs_empty', max_age=0)
+
+                return render_template(
+                    'jobs.html',
                     jobs=jobs,
+                    job_rows=self.templates.render_jobs_rows(jobs, admin),
                     is_admin=admin,
                 )
 
@@ -1574,8 +2106,15 @@ class WorkingMeetingWebApp:
                     start_date = None
                     end_date = None
                 
-                return render_template_string(
-                    self.templates.get_statistics_template(),
+                # Подписи шаблонов и доля успешных обработок считаются здесь, а не в цикле Jinja
+                for row in stats.get('templates', []):
+                    row['display_name'] = (row['template'] or '').title()
+                    row['success_rate'] = (
+                        row['completed_count'] / row['usage_count'] * 100 if row['usage_count'] else 0
+                    )
+                
+                return render_template(
+                    'statistics.html',
                     stats=stats,
                     days_back=days_back,
                     start_date=start_date,
@@ -1800,43 +2339,62 @@ class WorkingMeetingWebApp:
         @self.app.route('/docs')
         def docs_index():
             """Главная страница документации"""
-            return render_template_string(self.templates.get_docs_index_template())
+            return self._static_page_response('docs_index')
+        
+        @self.app.route('/api/docs/list')
+        def docs_list():
+            """Список документов в JSON (название, ссылка, иконка, описание)"""
+            response = jsonify([
+                {
+                    'name': doc['name'],
+                    'title': doc['title'],
+                    'href': url_for('view_docs', doc_name=doc['name']),
+                    'icon': doc['icon'],
+                    'summary': doc['summary'],
+                }
+                for doc in DOCS_METADATA
+            ])
+            response.add_etag()
+            response.cache_control.public = True
+            response.cache_control.max_age = STATIC_PAGE_MAX_AGE
+            return response.make_conditional(request)
         
         @self.app.route('/docs/<doc_name>')
         def view_docs(doc_name: str):
             """Просмотр конкретного документа"""
-            docs_map = {
-                'guidelines': 'meeting_recording_guidelines.md',
-                'checklist': 'quick_meeting_checklist.md',
-                'setup': 'recording_setup_guide.md'
-            }
-            
-            if doc_name not in docs_map:
+            doc = DOCS_BY_NAME.get(doc_name)
+            if doc is None:
                 flash('Документ не найден', 'error')
                 return redirect(url_for('docs_index'))
             
             try:
-                file_path = docs_map[doc_name]
+                file_path = doc['file']
                 if not os.path.exists(file_path):
                     flash('Файл документации не найден', 'error')
                     return redirect(url_for('docs_index'))
                 
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                doc_titles = {
-                    'guidelines': 'Полное руководство по проведению встреч',
-                    'checklist': 'Быстрый чек-лист для записи встреч',
-                    'setup': 'Техническое руководство по настройке записи'
-                }
-                
-                return render_template_string(
-                    self.templates.get_docs_view_template(),
-                    content=content,
-                    doc_title=doc_titles[doc_name],
-                    doc_name=doc_name
+                mtime_ns, (content_html, toc) = self.get_rendered_markdown(
+                    ('docs', doc_name), file_path, render=render_docs_markdown
                 )
                 
+                # Страница меняется только вместе с файлом документа или разметкой приложения
+                etag = f"{mtime_ns:x}-{len(content_html):x}-{self._docs_view_version}"
+                if request.if_none_match.contains_weak(etag):
+                    response = Response(status=304)
+                else:
+                    # <head> уходит клиенту сразу, и браузер начинает загружать стили, пока отдается тело
+                    response = Response(stream_template(
+                        'docs_view.html',
+                        content_html=content_html,
+                        toc=toc,
+                        doc_title=doc['title'],
+                        doc_name=doc_name
+                    ), mimetype='text/html')
+                response.set_etag(etag, weak=True)
+                response.cache_control.public = True
+                response.cache_control.max_age = STATIC_PAGE_MAX_AGE
+                return response
+                
             except Exception as e:
                 logger.error(f"❌ Ошибка чтения документации: {e}")
                 flash(f'Ошибка чтения документации: {str(e)}', 'error')
@@ -2157,6 +2715,7 @@ class WorkingMeetingWebApp:
                         (progress, message, job_id)
                     )
                     conn.commit()
+                    self._notify_job_update()
             except Exception as e:
                 logger.error(f"Ошибка обновления прогресса для {job_id}: {e}")
         
@@ -2245,6 +2804,7 @@ class WorkingMeetingWebApp:
                         WHERE job_id = ?
                     """, (str(transcript_file), job_id))
                 conn.commit()
+                self._notify_job_update()
 
             logger.info(f"✅ Транскрибация файла {job_id} завершена успешно: {transcript_file}")
 
@@ -2281,6 +2841,7 @@ class WorkingMeetingWebApp:
                     WHERE job_id = ?
                 """, (str(summary_file), job_id))
                 conn.commit()
+                self._notify_job_update()
 
             logger.info(f"✅ Обработка файла {job_id} завершена успешно")
 
@@ -2299,6 +2860,7 @@ class WorkingMeetingWebApp:
                         WHERE job_id = ?
                     """, (f'Ошибка обработки: {str(e)}', str(e), job_id))
                     conn.commit()
+                    self._notify_job_update()
             except Exception as db_error:
                 logger.error(f"Ошибка обновления статуса ошибки в БД: {db_error}")
         
@@ -2352,6 +2914,7 @@ class WorkingMeetingWebApp:
                         (progress, message, job_id)
                     )
                     conn.commit()
+                    self._notify_job_update()
                     logger.debug(f"📊 Прогресс обновлен для {job_id}: {progress}% - {message}")
             except Exception as e:
                 logger.error(f"Ошибка обновления прогресса для {job_id}: {e}")
@@ -2414,6 +2977,7 @@ class WorkingMeetingWebApp:
                                 WHERE job_id = ?
                             """, (transcript_file, str(summary_file), job_id))
                             conn.commit()
+                            self._notify_job_update()
                         
                         logger.info(f"✅ Генерация протокола {job_id} завершена успешно")
                     except Exception as db_error:
@@ -2438,6 +3002,7 @@ class WorkingMeetingWebApp:
                         WHERE job_id = ?
                     """, (f'Ошибка генерации протокола: {str(e)}', str(e), job_id))
                     conn.commit()
+                    self._notify_job_update()
             except Exception as db_error:
                 logger.error(f"Ошибка обновления статуса ошибки в БД: {db_error}")
     
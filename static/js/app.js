@@ -0,0 +1,443 @@
+/*
+ * Скрипты страниц Meeting Processor: загрузка файла, статус задачи, публикация в Confluence
+ */
+
+// Загрузка файла частями: обрыв сети повторяет только текущую часть, а не весь файл
+const UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024;
+const UPLOAD_CHUNK_RETRIES = 3;
+
+function newUploadId() {
+    if (window.crypto && crypto.randomUUID) {
+        return crypto.randomUUID();
+    }
+    return Date.now().toString(36) + Math.random().toString(36).slice(2);
+}
+
+// Отправляет часть файла с позиции offset; возвращает, сколько байт уже есть на сервере
+function sendUploadChunk(file, uploadId, offset, onProgress) {
+    return new Promise(function(resolve, reject) {
+        const chunk = file.slice(offset, offset + UPLOAD_CHUNK_SIZE);
+        const xhr = new XMLHttpRequest();
+
+        xhr.upload.addEventListener('progress', function(e) {
+            onProgress(offset + e.loaded);
+        });
+        xhr.addEventListener('load', function() {
+            let data = {};
+            try {
+                data = JSON.parse(xhr.responseText);
+            } catch (error) {
+                // Ответ не JSON (например, страница ошибки прокси)
+            }
+            // 409: сервер уже получил другую часть файла, продолжаем с его позиции
+            if ((xhr.status === 200 || xhr.status === 409) && typeof data.received === 'number') {
+                resolve(data.received);
+            } else {
+                const error = new Error(data.error || 'HTTP ' + xhr.status);
+                error.fatal = xhr.status >= 400 && xhr.status < 500;
+                reject(error);
+            }
+        });
+        xhr.addEventListener('error', function() {
+            reject(new Error('Ошибка сети при загрузке файла'));
+        });
+
+        xhr.open('POST', '/upload/chunk');
+        xhr.setRequestHeader('X-Upload-Id', uploadId);
+        xhr.setRequestHeader('Content-Range', 'bytes ' + offset + '-' + (offset + chunk.size - 1) + '/' + file.size);
+        xhr.send(chunk);
+    });
+}
+
+async function uploadFileInChunks(file, uploadId, onProgress) {
+    let offset = 0;
+    let failures = 0;
+    while (offset < file.size) {
+        try {
+            offset = await sendUploadChunk(file, uploadId, offset, onProgress);
+            failures = 0;
+        } catch (error) {
+            failures += 1;
+            if (error.fatal || failures > UPLOAD_CHUNK_RETRIES) {
+                throw error;
+            }
+            await new Promise(resolve => setTimeout(resolve, 1000 * failures));
+        }
+    }
+}
+
+// Главная страница: загрузка файла с индикатором прогресса
+function initUploadForm() {
+    const uploadForm = document.getElementById('uploadForm');
+    if (!uploadForm) {
+        return;
+    }
+
+    uploadForm.addEventListener('submit', function(e) {
+        e.preventDefault();
+
+        const formData = new FormData(this);
+        const fileInput = document.getElementById('fileInput');
+        const uploadProgress = document.getElementById('uploadProgress');
+        const uploadProgressBar = document.getElementById('uploadProgressBar');
+        const uploadProgressText = document.getElementById('uploadProgressText');
+        const submitBtn = document.getElementById('submitBtn');
+        const file = fileInput.files[0];
+
+        // Проверяем, выбран ли файл
+        if (!file) {
+            alert('Пожалуйста, выберите файл');
+            return;
+        }
+        if (!file.size) {
+            alert('Выбранный файл пуст');
+            return;
+        }
+
+        // Показываем прогресс бар и блокируем кнопку
+        uploadProgress.style.display = 'block';
+        submitBtn.disabled = true;
+        submitBtn.innerHTML = '<i class="fas fa-spinner fa-spin me-2"></i>Загрузка...';
+
+        function resetForm(message) {
+            alert(message);
+            uploadProgress.style.display = 'none';
+            submitBtn.disabled = false;
+            submitBtn.innerHTML = '<i class="fas fa-rocket me-2"></i>Начать обработку';
+        }
+
+        // Отслеживание прогресса загрузки: события progress приходят чаще кадров,
+        // поэтому запоминаем последнее значение и обновляем DOM не чаще раза за кадр.
+        // Процент целый, и если он не изменился, кадр не планируется вовсе
+        let lastPct = 0;
+        let renderPending = false;
+        function showProgress(loaded) {
+            const pct = Math.min(100, (loaded * 100 / file.size) | 0);
+            if (pct === lastPct) {
+                return;
+            }
+            lastPct = pct;
+            if (!renderPending) {
+                renderPending = true;
+                requestAnimationFrame(function() {
+                    const text = lastPct + '%';
+                    uploadProgressBar.style.width = text;
+                    uploadProgressText.textContent = text;
+                    renderPending = false;
+                });
+            }
+        }
+
+        // Сначала файл загружается частями, затем форма отправляется без файла, со ссылкой на загрузку
+        const uploadId = newUploadId();
+        uploadFileInChunks(file, uploadId, showProgress).then(function() {
+            formData.delete('file');
+            formData.append('upload_id', uploadId);
+            formData.append('filename', file.name);
+
+            const xhr = new XMLHttpRequest();
+            xhr.addEventListener('load', function() {
+                if (xhr.status === 200) {
+                    // Задача создана (или показано сообщение об ошибке) - перенаправляем
+                    window.location.href = xhr.responseURL;
+                } else {
+                    resetForm('Ошибка загрузки файла');
+                }
+            });
+            xhr.addEventListener('error', function() {
+                resetForm('Ошибка сети при загрузке файла');
+            });
+            xhr.open('POST', '/upload');
+            xhr.send(formData);
+        }).catch(function(error) {
+            resetForm('Ошибка загрузки файла: ' + error.message);
+        });
+    });
+}
+
+// Страница статуса: обновления по Server-Sent Events без перезагрузки страницы
+function initStatusPage(jobId, options) {
+    initConfluencePublication(jobId);
+    if (!options.streaming) {
+        return;
+    }
+
+    let transcriptReady = options.transcriptReady;
+    // Сервер сам присылает событие при изменении статуса (Server-Sent Events)
+    const statusStream = new EventSource('/api/status_stream/' + jobId);
+    statusStream.onmessage = function(event) {
+        const data = JSON.parse(event.data);
+        if (data.status === 'completed' || data.status === 'error') {
+            statusStream.close();
+            refreshJobActions(jobId);
+        } else if (!transcriptReady && data.transcript_ready) {
+            transcriptReady = true;
+            refreshJobActions(jobId);
+        } else {
+            const progressBar = document.querySelector('#jobStatusBody .progress-bar');
+            const alertDiv = document.querySelector('#jobStatusBody .alert');
+
+            progressBar.style.width = data.progress + '%';
+            progressBar.textContent = data.progress + '%';
+            alertDiv.textContent = data.message;
+        }
+    };
+    statusStream.onerror = function() {
+        console.error('Ошибка потока статуса, переподключение...');
+    };
+}
+
+// Обновляет карточку статуса без перезагрузки страницы
+function refreshJobActions(jobId) {
+    fetch('/api/job_actions/' + jobId)
+        .then(response => {
+            if (!response.ok) {
+                throw new Error('HTTP ' + response.status);
+            }
+            return response.text();
+        })
+        .then(html => {
+            document.getElementById('jobStatusBody').innerHTML = html;
+            initConfluencePublication(jobId);
+        })
+        .catch(() => location.reload());
+}
+
+// Confluence publication functionality
+function initConfluencePublication(jobId) {
+    const confluenceForm = document.getElementById('confluenceForm');
+    if (!confluenceForm) {
+        return;
+    }
+    const basePageUrlInput = document.getElementById('base_page_url');
+    const pageTitleInput = document.getElementById('page_title');
+    const publishBtn = document.getElementById('publishBtn');
+    const publicationResult = document.getElementById('publicationResult');
+    const publicationAlert = document.getElementById('publicationAlert');
+
+    // Validate URL format when input changes
+    basePageUrlInput.addEventListener('input', function() {
+        const url = this.value;
+        validateConfluenceUrl(url);
+    });
+
+    // Auto-generate page title if empty
+    pageTitleInput.addEventListener('focus', function() {
+        if (!this.value) {
+            const today = new Date();
+            const dateStr = today.getFullYear() +
+                          String(today.getMonth() + 1).padStart(2, '0') +
+                          String(today.getDate()).padStart(2, '0');
+            this.placeholder = dateStr + ' - Протокол встречи';
+        }
+    });
+
+    function validateConfluenceUrl(url) {
+        // Confluence Server формат 1: https://wiki.domain.com/pages/viewpage.action?pageId=123456
+        const serverPattern1 = /^https?:\/\/[^\/]+\/pages\/viewpage\.action\?pageId=\d+/;
+
+        // Confluence Server формат 2: https://wiki.domain.com/display/SPACE/PAGE
+        const serverPattern2 = /^https?:\/\/[^\/]+\/display\/[^\/]+\/[^\/]+/;
+
+        // Confluence Cloud формат: https://domain.atlassian.net/wiki/spaces/SPACE/pages/123456/Page+Title
+        const cloudPattern = /^https?:\/\/[^\/]+\.atlassian\.net\/wiki\/spaces\/[^\/]+\/pages\/\d+/;
+
+        const isServer1 = serverPattern1.test(url);
+        const isServer2 = serverPattern2.test(url);
+        const isCloud = cloudPattern.test(url);
+        const isValid = isServer1 || isServer2 || isCloud;
+
+        if (url && !isValid) {
+            basePageUrlInput.classList.add('is-invalid');
+            if (!document.querySelector('.invalid-feedback')) {
+                const feedback = document.createElement('div');
+                feedback.className = 'invalid-feedback';
+                feedback.textContent = 'Неверный формат URL Confluence. Поддерживаются форматы:\n• Cloud: https://domain.atlassian.net/wiki/spaces/SPACE/pages/123456/Page+Title\n• Server: https://wiki.domain.com/pages/viewpage.action?pageId=123456\n• Server: https://wiki.domain.com/display/SPACE/PAGE';
+                basePageUrlInput.parentNode.appendChild(feedback);
+            }
+        } else {
+            basePageUrlInput.classList.remove('is-invalid');
+            const feedback = document.querySelector('.invalid-feedback');
+            if (feedback) {
+                feedback.remove();
+            }
+        }
+
+        return isValid;
+    }
+
+    // Handle form submission
+    confluenceForm.addEventListener('submit', function(e) {
+        e.preventDefault();
+
+        const basePageUrl = basePageUrlInput.value.trim();
+        if (!basePageUrl) {
+            showAlert('Пожалуйста, укажите URL базовой страницы', 'danger');
+            return;
+        }
+
+        if (!validateConfluenceUrl(basePageUrl)) {
+            showAlert('Неверный формат URL Confluence', 'danger');
+            return;
+        }
+
+        // Show loading state
+        publishBtn.disabled = true;
+        publishBtn.innerHTML = '<i class="fas fa-spinner fa-spin me-2"></i>Публикация...';
+
+        // Prepare form data
+        const formData = new FormData(this);
+
+        // Auto-generate title if empty
+        if (!pageTitleInput.value.trim()) {
+            const today = new Date();
+            const dateStr = today.getFullYear() +
+                          String(today.getMonth() + 1).padStart(2, '0') +
+                          String(today.getDate()).padStart(2, '0');
+            formData.set('page_title', dateStr + ' - Протокол встречи');
+        }
+
+        // Submit via AJAX
+        fetch(this.action, {
+            method: 'POST',
+            body: formData,
+            headers: {
+                'X-Requested-With': 'XMLHttpRequest'
+            }
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                showAlert(
+                    '<i class="fas fa-check-circle me-2"></i>' +
+                    'Протокол успешно опубликован в Confluence! ' +
+                    '<a href="' + data.page_url + '" target="_blank" class="alert-link">' +
+                    '<i class="fas fa-external-link-alt me-1"></i>Открыть страницу</a>',
+                    'success'
+                );
+                loadPublicationHistory();
+            } else {
+                showAlert(
+                    '<i class="fas fa-exclamation-triangle me-2"></i>' +
+                    'Ошибка публикации: ' + (data.error || 'Неизвестная ошибка'),
+                    'danger'
+                );
+            }
+        })
+        .catch(error => {
+            console.error('Publication error:', error);
+            showAlert(
+                '<i class="fas fa-exclamation-triangle me-2"></i>' +
+                'Ошибка сети при публикации',
+                'danger'
+            );
+        })
+        .finally(() => {
+            // Reset button state
+            publishBtn.disabled = false;
+            publishBtn.innerHTML = '<i class="fas fa-cloud-upload-alt me-2"></i>Опубликовать в Confluence';
+        });
+    });
+
+    function showAlert(message, type) {
+        publicationAlert.className = 'alert alert-' + type;
+        publicationAlert.innerHTML = message;
+        publicationResult.style.display = 'block';
+
+        // Auto-hide success messages after 10 seconds
+        if (type === 'success') {
+            setTimeout(() => {
+                publicationResult.style.display = 'none';
+            }, 10000);
+        }
+    }
+
+    function loadPublicationHistory() {
+        console.log('🔍 DEBUG: Loading publication history for job ' + jobId);
+        fetch('/confluence_publications/' + jobId)
+            .then(response => {
+                console.log('🔍 DEBUG: Publication history response status:', response.status);
+                return response.json();
+            })
+            .then(data => {
+                console.log('🔍 DEBUG: Publication history data:', data);
+                if (data.publications && data.publications.length > 0) {
+                    console.log('🔍 DEBUG: Displaying', data.publications.length, 'publications');
+                    displayPublicationHistory(data.publications);
+                } else {
+                    console.log('🔍 DEBUG: No publications found or empty array');
+                }
+            })
+            .catch(error => {
+                console.error('🔍 DEBUG: Error loading publication history:', error);
+            });
+    }
+
+    // Создает элемент с классами и (необязательно) текстом; текст не разбирается как HTML
+    function createElement(tag, className, text) {
+        const element = document.createElement(tag);
+        if (className) element.className = className;
+        if (text) element.textContent = text;
+        return element;
+    }
+
+    function createIcon(className) {
+        return createElement('i', 'fas ' + className);
+    }
+
+    function displayPublicationHistory(publications) {
+        const historyContent = document.getElementById('publicationHistoryContent');
+        const historySection = document.getElementById('publicationHistory');
+
+        // Список собирается во фрагменте и вставляется в документ одной операцией;
+        // данные публикаций попадают в разметку только через textContent
+        const fragment = document.createDocumentFragment();
+        const list = createElement('div', 'list-group list-group-flush');
+        publications.forEach(pub => {
+            const date = new Date(pub.created_at).toLocaleString('ru-RU');
+            const statusClass = pub.status === 'published' ? 'success' : 'danger';
+            const statusIcon = pub.status === 'published' ? 'check-circle' : 'exclamation-circle';
+
+            const item = createElement('div', 'list-group-item');
+            const row = createElement('div', 'd-flex justify-content-between align-items-start');
+            const info = createElement('div');
+
+            const title = createElement('h6', 'mb-1');
+            title.append(createIcon('fa-' + statusIcon + ' text-' + statusClass + ' me-2'), pub.page_title || 'Протокол встречи');
+
+            const meta = createElement('p', 'mb-1 text-muted small');
+            meta.append(
+                createIcon('fa-calendar me-1'), date,
+                createIcon('fa-folder ms-3 me-1'), pub.space_key || 'N/A'
+            );
+            info.append(title, meta);
+
+            const actions = createElement('div');
+            if (pub.page_url && /^https?:\/\//i.test(pub.page_url)) {
+                const link = createElement('a', 'btn btn-sm btn-outline-primary');
+                link.href = pub.page_url;
+                link.target = '_blank';
+                link.append(createIcon('fa-external-link-alt me-1'), 'Открыть');
+                actions.append(link);
+            } else {
+                actions.append(createElement('span', 'badge bg-danger', 'Ошибка'));
+            }
+            row.append(info, actions);
+            item.append(row);
+
+            if (pub.error_message) {
+                const error = createElement('small', 'text-danger');
+                error.append(createIcon('fa-exclamation-triangle me-1'), pub.error_message);
+                item.append(error);
+            }
+            list.append(item);
+        });
+        fragment.append(list);
+
+        historyContent.replaceChildren(fragment);
+        historySection.style.display = 'block';
+    }
+
+    // Load publication history on page load
+    loadPublicationHistory();
+}
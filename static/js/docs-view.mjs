@@ -0,0 +1,59 @@
+/*
+ * Страница просмотра документации: оглавление, кнопка "Наверх", копирование ссылок на заголовки.
+ * Markdown, оглавление и якоря заголовков уже подготовлены на сервере.
+ */
+
+let copyToastTimer = null;
+
+function showCopiedToast(copyToast) {
+    copyToast.hidden = false;
+    clearTimeout(copyToastTimer);
+    copyToastTimer = setTimeout(() => { copyToast.hidden = true; }, 2000);
+}
+
+// Действия кнопок страницы (атрибут data-action)
+const actions = {
+    'print': () => window.print(),
+    'toggle-toc': () => {
+        const toc = document.getElementById('toc');
+        toc.hidden = !toc.hidden;
+    },
+    'scroll-top': () => window.scrollTo({ top: 0, behavior: 'smooth' }),
+};
+
+export function init() {
+    const copyToast = document.getElementById('copy-toast');
+
+    // Показываем/скрываем кнопку "Наверх" без обработчика scroll:
+    // браузер сам сообщает, когда метка на 300px уходит за верх экрана
+    const backToTop = document.querySelector('.back-to-top');
+    new IntersectionObserver(function(entries) {
+        backToTop.classList.toggle('visible', !entries[0].isIntersecting && entries[0].boundingClientRect.top < 0);
+    }).observe(document.getElementById('scroll-sentinel'));
+
+    // Один делегированный обработчик: кнопки страницы, копирование ссылки
+    // на заголовок и плавная прокрутка для якорных ссылок
+    document.addEventListener('click', function(e) {
+        const button = e.target.closest('[data-action]');
+        if (button && actions[button.dataset.action]) {
+            actions[button.dataset.action]();
+            return;
+        }
+
+        const heading = e.target.closest('#markdown-content :is(h1, h2, h3, h4)[id]');
+        if (heading) {
+            const url = window.location.origin + window.location.pathname + '#' + heading.id;
+            navigator.clipboard.writeText(url).then(() => showCopiedToast(copyToast));
+            return;
+        }
+
+        const link = e.target.closest('a[href^="#"]');
+        if (link) {
+            const targetElement = document.getElementById(link.getAttribute('href').substring(1));
+            if (targetElement) {
+                e.preventDefault();
+                targetElement.scrollIntoView({ behavior: 'smooth', block: 'start' });
+            }
+        }
+    });
+}
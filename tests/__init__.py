@@ -1,3 +1,45 @@
 """
 Test suite for Confluence integration
-"""
\ No newline at end of file
+"""
+
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+
+# The application log goes to a temporary directory instead of the repository's logs/
+if 'LOG_DIR' not in os.environ:
+    os.environ['LOG_DIR'] = tempfile.mkdtemp(prefix='meeting-processor-logs-')
+    atexit.register(shutil.rmtree, os.environ['LOG_DIR'], True)
+
+
+def import_wsgi():
+    """Import wsgi, which builds the application at import time, on a temporary database
+
+    The application creates its folders relative to the working directory and
+    the secret key under INSTANCE_DIR, so both point to a temporary directory.
+    """
+    if 'wsgi' in sys.modules:
+        return sys.modules['wsgi']
+    from unittest.mock import patch
+
+    work_dir = tempfile.mkdtemp(prefix='meeting-processor-wsgi-')
+    atexit.register(shutil.rmtree, work_dir, True)
+    os.environ.setdefault('INSTANCE_DIR', os.path.join(work_dir, 'instance'))
+    config = {
+        'auth': {'debug_mode': True},
+        'database': {'path': os.path.join(work_dir, 'test.db')},
+        'temp_files': {'base_path': os.path.join(work_dir, 'temp')},
+    }
+    cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        with patch('run_web.ConfigLoader.load_config', return_value=config), \
+             patch('run_web.ConfigLoader.load_api_keys', return_value={}), \
+             patch('run_web.ConfigLoader.validate_api_keys',
+                   return_value=(True, True, 'test_deepgram_key', 'test_claude_key')):
+            import wsgi
+    finally:
+        os.chdir(cwd)
+    return wsgi
@@ -0,0 +1,653 @@
+#!/usr/bin/env python3
+"""
+Tests for web routes: status streaming, static assets and cached pages
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import tempfile
+import threading
+import os
+import sys
+import json
+import gzip
+import re
+import shutil
+from pathlib import Path
+
+import requests
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from run_web import WorkingMeetingWebApp
+from web_assets import AssetBundle, BOOTSTRAP_CSS_URL, BOOTSTRAP_JS_URL, subresource_integrity
+
+
+class WebAppTestCase(unittest.TestCase):
+    """Base class: application in debug auth mode with one job of the debug user"""
+
+    job_status = 'processing'
+    extra_config = {}
+
+    def setUp(self):
+        """Create application and a test job"""
+        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.test_db.close()
+        # Uploads, results and temporary files go to a directory removed after the test
+        self.work_dir = tempfile.mkdtemp()
+        self.test_config = {
+            'auth': {'debug_mode': True},
+            'database': {'path': self.test_db.name},
+            'temp_files': {'base_path': os.path.join(self.work_dir, 'temp')},
+            **self.extra_config,
+        }
+
+        with patch('run_web.ConfigLoader.load_config') as mock_load_config, \
+             patch('run_web.ConfigLoader.load_api_keys') as mock_load_api_keys, \
+             patch('run_web.ConfigLoader.validate_api_keys') as mock_validate_keys:
+            mock_load_config.return_value = self.test_config
+            mock_load_api_keys.return_value = {}
+            mock_validate_keys.return_value = (True, True, 'test_deepgram_key', 'test_claude_key')
+            # The constructor creates its relative folders in the current directory
+            cwd = os.getcwd()
+            os.chdir(self.work_dir)
+            try:
+                self.app = WorkingMeetingWebApp()
+            finally:
+                os.chdir(cwd)
+
+        self.app.upload_folder = Path(self.work_dir, 'uploads')
+        self.app.output_folder = Path(self.work_dir, 'output')
+        self.app.upload_folder.mkdir()
+        self.app.output_folder.mkdir()
+        self.app.app.config['TESTING'] = True
+        self.client = self.app.app.test_client()
+
+        # The first request creates the debug user
+        self.client.get('/')
+        self.user_id = 'debug_user'
+
+        self.job_id = 'job-test-1'
+        self.app.db_manager.create_job({
+            'job_id': self.job_id,
+            'user_id': self.user_id,
+            'filename': 'meeting.mp3',
+            'template': 'standard',
+            'status': 'uploaded',
+            'progress': 0,
+            'message': 'Файл загружен, ожидает обработки',
+            'file_path': '/tmp/meeting.mp3',
+            'metadata': {'model': 'test-model'},
+        })
+        self.set_job(status=self.job_status, progress=10)
+
+    def static_url(self, filename):
+        """Versioned URL of a static file"""
+        with self.app.app.test_request_context():
+            return self.app.static_url(filename)
+
+    def tearDown(self):
+        """Clean up test files"""
+        self.app.executor.shutdown(wait=False)
+        try:
+            os.unlink(self.test_db.name)
+        except OSError:
+            pass
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def set_job(self, **fields):
+        """Update the test job directly in the database"""
+        assignments = ', '.join(f"{name} = ?" for name in fields)
+        with self.app.db_manager._get_connection() as conn:
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE job_id = ?", (*fields.values(), self.job_id))
+            conn.commit()
+
+
+class TestChunkedUpload(WebAppTestCase):
+    """Tests for uploading a file in parts through /upload/chunk"""
+
+    def setUp(self):
+        super().setUp()
+        self.upload_id = 'upload-0001'
+
+    def send_chunk(self, data, start, total, upload_id=None):
+        """Send one part of the file with its Content-Range"""
+        return self.client.post('/upload/chunk', data=data, headers={
+            'X-Upload-Id': upload_id or self.upload_id,
+            'Content-Range': f'bytes {start}-{start + len(data) - 1}/{total}',
+        })
+
+    def test_chunks_assembled_and_job_created(self):
+        """Parts are appended in order and the assembled file becomes a job"""
+        response = self.send_chunk(b'abc', 0, 5)
+        self.assertEqual(response.get_json(), {'received': 3})
+        self.assertEqual(self.send_chunk(b'de', 3, 5).get_json(), {'received': 5})
+
+        with patch.object(self.app.executor, 'submit') as submit:
+            response = self.client.post('/upload', data={
+                'upload_id': self.upload_id, 'filename': 'встреча.mp3', 'template': 'standard',
+            })
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('/status/', response.headers['Location'])
+        submit.assert_called_once()
+        uploaded = list(self.app.upload_folder.rglob('*встреча.mp3'))
+        self.assertEqual(len(uploaded), 1)
+        self.assertEqual(uploaded[0].read_bytes(), b'abcde')
+        self.assertEqual(list(self.app.temp_folder.iterdir()), [])
+
+    def test_out_of_order_chunk_reports_offset(self):
+        """A part from the wrong offset is rejected with the number of bytes received"""
+        self.send_chunk(b'abc', 0, 6)
+        response = self.send_chunk(b'abc', 0, 6)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.get_json(), {'received': 3})
+
+    def test_concurrent_duplicate_chunk_written_once(self):
+        """A retried part that passed the offset check together with the original is not appended twice"""
+        self.send_chunk(b'abc', 0, 6)
+        # The retry saw the file before the original part was written
+        with patch('pathlib.Path.exists', return_value=False):
+            self.assertEqual(self.send_chunk(b'abc', 0, 6).get_json(), {'received': 3})
+        self.assertEqual(self.send_chunk(b'def', 3, 6).get_json(), {'received': 6})
+        complete = self.app.get_chunked_upload_path(self.user_id, self.upload_id, complete=True)
+        self.assertEqual(complete.read_bytes(), b'abcdef')
+
+    def test_invalid_requests(self):
+        """Oversized files, bad headers and unfinished uploads are rejected"""
+        too_large = self.app.app.config['MAX_CONTENT_LENGTH'] + 1
+        self.assertEqual(self.send_chunk(b'abc', 0, too_large).status_code, 413)
+        self.assertEqual(self.send_chunk(b'abc', 0, 3, upload_id='../x').status_code, 400)
+        self.assertEqual(self.send_chunk(b'abc', 0, 2).status_code, 400)
+
+        self.send_chunk(b'abc', 0, 6)
+        response = self.client.post('/upload', data={'upload_id': self.upload_id, 'filename': 'a.mp3'})
+        self.assertEqual(response.status_code, 302)
+        self.assertNotIn('/status/', response.headers['Location'])
+
+
+class TestStatusStream(WebAppTestCase):
+    """Tests for the Server-Sent Events status stream"""
+
+    def test_stream_pushes_changes_until_terminal_state(self):
+        """Each change is sent once and the stream ends when the job completes"""
+        def finish_job():
+            self.set_job(progress=50, message='Транскрибация...')
+            self.app._notify_job_update()
+            self.set_job(status='completed', progress=100)
+            self.app._notify_job_update()
+
+        timer = threading.Timer(0.2, finish_job)
+        timer.start()
+        response = self.client.get(f'/api/status_stream/{self.job_id}')
+        timer.join()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        self.assertEqual(response.headers['X-Accel-Buffering'], 'no')
+        self.assertTrue(response.get_data(as_text=True).startswith('retry: '))
+        events = [json.loads(line[len('data: '):])
+                  for line in response.get_data(as_text=True).splitlines() if line.startswith('data: ')]
+        self.assertEqual(events[0]['progress'], 10)
+        self.assertEqual(events[-1]['status'], 'completed')
+        self.assertEqual(len(events), len({json.dumps(event, sort_keys=True) for event in events}))
+
+    def test_stream_unknown_job(self):
+        """Unknown job returns 404"""
+        response = self.client.get('/api/status_stream/unknown')
+        self.assertEqual(response.status_code, 404)
+
+
+class TestJobActions(WebAppTestCase):
+    """Tests for the status card fragment used instead of a page reload"""
+
+    def test_fragment_follows_job_stage(self):
+        """The fragment contains only the status card for the current stage"""
+        fragment = self.client.get(f'/api/job_actions/{self.job_id}').get_data(as_text=True)
+        self.assertIn('progress-bar-animated', fragment)
+        self.assertNotIn('<nav', fragment)
+        self.assertNotIn('confluenceForm', fragment)
+
+        self.set_job(status='completed', progress=100, transcript_file='/tmp/t.txt', summary_file='/tmp/s.md')
+        response = self.client.get(f'/api/job_actions/{self.job_id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.cache_control.no_store)
+        fragment = response.get_data(as_text=True)
+        self.assertIn(f'/view/{self.job_id}/summary', fragment)
+        self.assertIn('confluenceForm', fragment)
+
+    def test_retry_form_preselects_job_template(self):
+        """The protocol retry form offers prebuilt options with the job template selected"""
+        self.set_job(status='error', transcript_file='/tmp/t.txt')
+        fragment = self.client.get(f'/api/job_actions/{self.job_id}').get_data(as_text=True)
+        self.assertIn(f'/retry_protocol/{self.job_id}', fragment)
+        self.assertIn('<option value="standard" selected>', fragment)
+
+    def test_unknown_job(self):
+        """Unknown job returns 404"""
+        response = self.client.get('/api/job_actions/unknown')
+        self.assertEqual(response.status_code, 404)
+
+
+class TestViewFile(WebAppTestCase):
+    """Tests for the file view page"""
+
+    job_status = 'completed'
+
+    def setUp(self):
+        super().setUp()
+        self.output_dir = tempfile.mkdtemp()
+        self.summary_path = os.path.join(self.output_dir, 'meeting_summary.md')
+        with open(self.summary_path, 'w', encoding='utf-8') as f:
+            f.write('# Протокол\n\n- пункт')
+        self.set_job(summary_file=self.summary_path)
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+
+    def test_summary_rendered_on_server(self):
+        """The protocol is rendered to HTML on the server, without marked.js"""
+        response = self.client.get(f'/view/{self.job_id}/summary')
+        self.assertEqual(response.status_code, 200)
+        page = response.get_data(as_text=True)
+        self.assertIn('<h1>Протокол</h1>', page)
+        self.assertNotIn('marked', page)
+
+    def test_summary_rerendered_after_change(self):
+        """The cached HTML is refreshed when the file changes"""
+        self.client.get(f'/view/{self.job_id}/summary')
+        with open(self.summary_path, 'w', encoding='utf-8') as f:
+            f.write('# Новый протокол')
+        stat = os.stat(self.summary_path)
+        os.utime(self.summary_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        page = self.client.get(f'/view/{self.job_id}/summary').get_data(as_text=True)
+        self.assertIn('<h1>Новый протокол</h1>', page)
+
+    def test_view_revalidated_by_etag(self):
+        """An unchanged protocol page is answered with 304"""
+        response = self.client.get(f'/view/{self.job_id}/summary')
+        self.assertTrue(response.cache_control.private)
+        response = self.client.get(f'/view/{self.job_id}/summary',
+                                   headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get(f'/api/status/{self.job_id}')
+        etag = response.headers['ETag']
+        self.assertEqual(self.client.get(f'/api/status/{self.job_id}',
+                                         headers={'If-None-Match': etag}).status_code, 304)
+        self.set_job(message='Готово')
+        self.assertEqual(self.client.get(f'/api/status/{self.job_id}',
+                                         headers={'If-None-Match': etag}).status_code, 200)
+
+    def test_transcript_loaded_from_raw_endpoint(self):
+        """The transcript page is a thin shell; the text comes from /api/raw with an ETag"""
+        transcript_path = os.path.join(self.output_dir, 'meeting_transcript.txt')
+        with open(transcript_path, 'w', encoding='utf-8') as f:
+            f.write('Спикер 1: <привет>')
+        self.set_job(transcript_file=transcript_path)
+
+        page = self.client.get(f'/view/{self.job_id}/transcript').get_data(as_text=True)
+        self.assertIn(f'data-src="/api/raw/{self.job_id}/transcript"', page)
+        self.assertNotIn('привет', page)
+
+        response = self.client.get(f'/api/raw/{self.job_id}/transcript')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'text/plain')
+        self.assertEqual(response.get_data(as_text=True), 'Спикер 1: <привет>')
+        self.assertTrue(response.cache_control.private)
+        response.close()
+
+        response = self.client.get(f'/api/raw/{self.job_id}/transcript',
+                                   headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(response.status_code, 304)
+        response.close()
+        self.assertEqual(self.client.get(f'/api/raw/{self.job_id}/audio').status_code, 400)
+
+
+class TestDocsView(WebAppTestCase):
+    """Tests for the documentation viewer"""
+
+    def test_rendered_on_server(self):
+        """Documentation is rendered to HTML on the server, without marked.js"""
+        response = self.client.get('/docs/checklist')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        page = response.get_data(as_text=True)
+        self.assertIn('<h1 id="быстрый-чек-лист-для-записи-встреч"', page)
+        self.assertIn('<a href="#быстрый-чек-лист-для-записи-встреч">', page)
+        self.assertNotIn('marked', page)
+        self.assertNotIn('<style>', page)
+        self.assertIn(self.static_url('css/docs-view.css'), page)
+        self.assertNotIn('<style>', page)
+        self.assertIn(self.static_url('css/docs-view.css'), page)
+
+    def test_script_is_preloaded_module(self):
+        """Page logic is a cached ES module, preloaded from <head>"""
+        page = self.client.get('/docs/checklist').get_data(as_text=True)
+        module_url = self.static_url('js/docs-view.mjs')
+        self.assertLess(page.index(f'<link rel="modulepreload" href="{module_url}">'), page.index('</head>'))
+        self.assertIn(f"import {{ init }} from '{module_url}';", page)
+        self.assertNotIn('onclick', page)
+        self.assertEqual(self.client.get(module_url).mimetype, 'text/javascript')
+
+    def test_conditional_get(self):
+        """Repeat views are answered with 304 by the weak ETag"""
+        response = self.client.get('/docs/checklist')
+        etag = response.headers['ETag']
+        self.assertTrue(etag.startswith('W/'))
+
+        response = self.client.get('/docs/checklist', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+
+    def test_index_and_list_share_metadata(self):
+        """The index cards and the JSON list are built from the same document metadata"""
+        page = self.client.get('/docs').get_data(as_text=True)
+        response = self.client.get('/api/docs/list')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.cache_control.public)
+        docs = response.get_json()
+        self.assertEqual([doc['name'] for doc in docs], ['checklist', 'guidelines', 'setup'])
+        for doc in docs:
+            self.assertIn(f'href="{doc["href"]}"', page)
+            self.assertIn(doc['summary'], page)
+
+        response = self.client.get('/api/docs/list', headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    def test_unknown_document(self):
+        """Unknown documents redirect to the documentation index"""
+        response = self.client.get('/docs/unknown')
+        self.assertEqual(response.status_code, 302)
+
+
+class TestStaticAssets(WebAppTestCase):
+    """Tests for versioned and precompressed static files"""
+
+    def test_versioned_url_is_immutable(self):
+        """Versioned static URLs are cached for a year"""
+        url = self.static_url('css/progress.css')
+        self.assertIn('?v=', url)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.cache_control.immutable)
+        self.assertEqual(response.cache_control.max_age, 31536000)
+
+    def test_precompressed_gzip_and_conditional_get(self):
+        """Compressible files are served gzip-encoded and support If-None-Match"""
+        url = self.static_url('css/progress.css')
+        response = self.client.get(url, headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers.get('Content-Encoding'), 'gzip')
+        self.assertIn('Accept-Encoding', response.headers.get('Vary', ''))
+        with open(os.path.join(self.app.app.static_folder, 'css', 'progress.css'), 'rb') as f:
+            self.assertEqual(gzip.decompress(response.data), f.read())
+
+        response = self.client.get(url, headers={
+            'Accept-Encoding': 'gzip',
+            'If-None-Match': response.headers['ETag'],
+        })
+        self.assertEqual(response.status_code, 304)
+
+    def test_icons_are_defined(self):
+        """Every icon on the pages and in app.js is defined in icons.css; Font Awesome is not loaded"""
+        static_folder = self.app.app.static_folder
+        with open(os.path.join(static_folder, 'css', 'icons.css'), encoding='utf-8') as f:
+            defined = set(re.findall(r'^\.(fa-[\w-]+) \{', f.read(), re.MULTILINE))
+        with open(os.path.join(static_folder, 'js', 'app.js'), encoding='utf-8') as f:
+            self.assertTrue(set(re.findall(r"fa-[a-z][\w-]*", f.read())) <= defined)
+
+        self.set_job(transcript_file='/tmp/t.txt')
+        urls = ('/', '/jobs', f'/status/{self.job_id}', '/statistics',
+                '/docs', '/docs/checklist', '/docs/guidelines', '/docs/setup')
+        for url in urls:
+            with self.subTest(url=url):
+                page = self.client.get(url).get_data(as_text=True)
+                self.assertNotIn('font-awesome', page)
+                self.assertIn('css/icons.css', page)
+                for classes in re.findall(r'<i class="([^"]*)"', page):
+                    self.assertTrue(set(re.findall(r'fa-[\w-]+', classes)) <= defined, classes)
+
+    def test_pages_use_shared_script(self):
+        """Page logic comes from the cached app.js instead of inline scripts"""
+        app_js_url = self.static_url('js/app.js')
+        for url in ('/', f'/status/{self.job_id}'):
+            with self.subTest(url=url):
+                page = self.client.get(url).get_data(as_text=True)
+                self.assertIn(f'<script src="{app_js_url}" defer>', page)
+                self.assertNotIn('XMLHttpRequest', page)
+                self.assertNotIn('EventSource', page)
+
+    def test_missing_file(self):
+        """Missing files still return 404"""
+        response = self.client.get('/static/css/missing.css', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, 404)
+
+
+class TestChatApi(WebAppTestCase):
+    """Tests for the transcript chat API"""
+
+    job_status = 'completed'
+
+    def setUp(self):
+        super().setUp()
+        transcript_path = os.path.join(self.work_dir, 'meeting_transcript.txt')
+        with open(transcript_path, 'w', encoding='utf-8') as f:
+            f.write('Спикер 1: добрый день')
+        self.set_job(transcript_file=transcript_path)
+
+    def test_reply_rendered_on_server(self):
+        """The reply comes with server-rendered HTML; raw HTML from the model is escaped"""
+        client = Mock()
+        client.create_message.return_value = '**Итог**\n\n<script>x</script>'
+        with patch('openrouter_client.OpenRouterClient', return_value=client):
+            response = self.client.post(f'/api/chat/{self.job_id}', json={
+                'messages': [{'role': 'user', 'content': 'О чем встреча?'}],
+            })
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data['reply'], '**Итог**\n\n<script>x</script>')
+        self.assertIn('<strong>Итог</strong>', data['html'])
+        self.assertNotIn('<script>', data['html'])
+
+        page = self.client.get(f'/chat/{self.job_id}')
+        self.assertEqual(page.status_code, 200)
+        self.assertNotIn('markdown-it', page.get_data(as_text=True))
+
+
+class TestStaticPages(WebAppTestCase):
+    """Tests for pages rendered once and served with an ETag"""
+
+    def test_docs_index_conditional_get(self):
+        """Repeat visits to the documentation index get 304 without a body"""
+        response = self.client.get('/docs')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Документация', response.get_data(as_text=True))
+        self.assertEqual(response.cache_control.max_age, 300)
+        etag = response.headers['ETag']
+
+        response = self.client.get('/docs', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+        self.assertEqual(response.headers['ETag'], etag)
+
+    def test_docs_index_precompressed(self):
+        """The prebuilt page is sent gzip-compressed when the client accepts it"""
+        plain = self.client.get('/docs')
+        response = self.client.get('/docs', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers.get('Content-Encoding'), 'gzip')
+        self.assertIn('Accept-Encoding', response.headers.get('Vary', ''))
+        self.assertEqual(gzip.decompress(response.data), plain.data)
+        self.assertNotEqual(response.headers['ETag'], plain.headers['ETag'])
+
+        response = self.client.get('/docs', headers={
+            'Accept-Encoding': 'gzip',
+            'If-None-Match': response.headers['ETag'],
+        })
+        self.assertEqual(response.status_code, 304)
+
+    def test_index_prebuilt_and_revalidated(self):
+        """The index page is served prebuilt and revalidated on every visit"""
+        response = self.client.get('/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.cache_control.no_cache)
+        self.assertFalse(response.cache_control.public)
+        self.assertEqual(response.data, self.client.get('/').data)
+
+        response = self.client.get('/', headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    def test_index_rebuilt_when_templates_config_changes(self):
+        """Editing templates_config.json updates the prebuilt index page and its ETag"""
+        config_path = os.path.join(self.work_dir, 'templates_config.json')
+        self.app.config['paths'] = {'templates_config': config_path}
+
+        def write_templates(description, mtime):
+            with open(config_path, 'w', encoding='utf-8') as f:
+                json.dump({'template_descriptions': {'standard': description}}, f)
+            os.utime(config_path, (mtime, mtime))
+
+        write_templates('Старое описание', 1_000_000)
+        response = self.client.get('/')
+        self.assertIn('Старое описание', response.get_data(as_text=True))
+
+        write_templates('Новое описание', 2_000_000)
+        updated = self.client.get('/', headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(updated.status_code, 200)
+        self.assertIn('Новое описание', updated.get_data(as_text=True))
+        self.assertNotEqual(updated.headers['ETag'], response.headers['ETag'])
+
+    def test_prebuilt_at_startup(self):
+        """Pages prebuilt outside of a request are served as is"""
+        self.app._static_pages.clear()
+        self.app.prebuild_static_pages()
+        self.assertEqual(set(self.app._static_pages), {'index', 'docs_index', 'jobs_empty', 'jobs_empty_admin'})
+        self.assertEqual(self.client.get('/').data, self.app._static_pages['index']['body'])
+        self.assertEqual(self.client.get('/docs').data, self.app._static_pages['docs_index']['body'])
+
+    def test_warmup_compiles_templates(self):
+        """Warmup compiles every template and prebuilds the static pages"""
+        env = self.app.app.jinja_env
+        self.app._static_pages.clear()
+        env.cache.clear()
+        self.app.warmup()
+        self.assertEqual(len(self.app._static_pages), 4)
+        self.assertGreaterEqual(len(env.cache), len(env.list_templates()))
+
+    def test_index_with_flash_is_rendered(self):
+        """Pending flash messages bypass the prebuilt page"""
+        with self.client.session_transaction() as session:
+            session['_flashes'] = [('error', 'Файл не выбран')]
+        page = self.client.get('/').get_data(as_text=True)
+        self.assertIn('Файл не выбран', page)
+        self.assertNotIn('Файл не выбран', self.client.get('/').get_data(as_text=True))
+
+    def test_empty_jobs_list(self):
+        """An empty jobs list is served prebuilt"""
+        self.app.db_manager.delete_job(self.job_id)
+        response = self.client.get('/jobs')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Нет обработанных файлов', response.get_data(as_text=True))
+        self.assertIn('ETag', response.headers)
+
+
+class TestResponseCompression(WebAppTestCase):
+    """Tests for on-the-fly compression of dynamic responses"""
+
+    def test_status_page_gzip(self):
+        """Rendered pages are gzip-compressed when the client accepts it"""
+        plain = self.client.get(f'/status/{self.job_id}')
+        self.assertNotIn('Content-Encoding', plain.headers)
+        response = self.client.get(f'/status/{self.job_id}', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers.get('Content-Encoding'), 'gzip')
+        self.assertIn('Accept-Encoding', response.headers.get('Vary', ''))
+        self.assertEqual(gzip.decompress(response.data), plain.data)
+
+    def test_small_and_streamed_responses_are_not_compressed(self):
+        """Small bodies and event streams are sent as is"""
+        self.set_job(status='completed', progress=100)
+        response = self.client.get(f'/api/status/{self.job_id}', headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', response.headers)
+        response = self.client.get(f'/api/status_stream/{self.job_id}', headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_etag_stays_usable(self):
+        """A compressed response keeps a weak ETag that still yields 304"""
+        response = self.client.get('/api/docs/list', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers.get('Content-Encoding'), 'gzip')
+        self.assertTrue(response.headers['ETag'].startswith('W/'))
+        response = self.client.get('/api/docs/list', headers={
+            'Accept-Encoding': 'gzip',
+            'If-None-Match': response.headers['ETag'],
+        })
+        self.assertEqual(response.status_code, 304)
+
+
+def fake_cdn_response(url, timeout=None):
+    """Fake CDN response for the asset bundle"""
+    response = Mock()
+    response.raise_for_status.return_value = None
+    response.content = f'/* {url} */'.encode()
+    return response
+
+
+class TestSelfHostedAssets(WebAppTestCase):
+    """Tests for the locally served Bootstrap bundle"""
+
+    extra_config = {'web': {'self_host_assets': True}}
+
+    def setUp(self):
+        # The fake files stand in for the published ones, including their SRI hashes
+        self.integrity = patch.multiple(
+            'web_assets',
+            BOOTSTRAP_CSS_INTEGRITY=subresource_integrity(fake_cdn_response(BOOTSTRAP_CSS_URL).content),
+            BOOTSTRAP_JS_INTEGRITY=subresource_integrity(fake_cdn_response(BOOTSTRAP_JS_URL).content),
+        )
+        self.integrity.start()
+        self.addCleanup(self.integrity.stop)
+        with patch('web_assets.requests.get', side_effect=fake_cdn_response):
+            super().setUp()
+
+    def test_pages_link_local_bundle(self):
+        """Pages reference the bundle instead of the CDN"""
+        page = self.client.get('/jobs').get_data(as_text=True)
+        self.assertIn('/static/vendor/css/bootstrap.css?v=', page)
+        self.assertIn('/static/vendor/js/bundle.js?v=', page)
+        self.assertNotIn('cdn.jsdelivr.net', page)
+
+        docs = self.client.get('/docs').get_data(as_text=True)
+        self.assertIn('/static/vendor/css/bootstrap.css?v=', docs)
+
+    def test_bundle_is_served(self):
+        """Bundle files are served from memory with long-lived caching"""
+        response = self.client.get('/static/vendor/css/bootstrap.css?v=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.cache_control.immutable)
+        self.assertIn('bootstrap.min.css', response.get_data(as_text=True))
+        response = self.client.get('/static/vendor/js/bundle.js?v=1')
+        self.assertIn('bootstrap.bundle.min.js', response.get_data(as_text=True))
+
+    def test_cdn_fallback_when_fetch_fails(self):
+        """Pages keep CDN links when the bundle cannot be fetched"""
+        bundle = AssetBundle()
+        with patch('web_assets.requests.get', side_effect=requests.ConnectionError('offline')):
+            self.assertFalse(bundle.load())
+        self.assertIn('cdn.jsdelivr.net/npm/bootstrap', bundle.style_tags())
+        self.assertIn('cdn.jsdelivr.net/npm/bootstrap', bundle.script_tags())
+        self.assertIn('<link rel="preconnect" href="https://cdn.jsdelivr.net" crossorigin>', bundle.style_tags())
+
+    def test_tampered_cdn_file_is_not_served(self):
+        """A fetched file that does not match its SRI hash keeps the pages on the CDN with integrity checks"""
+        self.integrity.stop()
+        bundle = AssetBundle()
+        with patch('web_assets.requests.get', side_effect=fake_cdn_response):
+            self.assertFalse(bundle.load())
+        self.assertEqual(bundle.files, {})
+        for tag in (bundle.style_tags(), bundle.script_tags()):
+            self.assertIn('integrity="sha384-', tag)
+            self.assertIn('crossorigin="anonymous"', tag)
+        self.integrity.start()
+
+
+if __name__ == '__main__':
+    unittest.main()
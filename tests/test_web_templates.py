@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Tests for HTML templates of the web application
+"""
+
+import unittest
+import json
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from unittest.mock import patch
+
+from jinja2 import Environment
+from markupsafe import Markup
+
+from web_templates import (
+    WebTemplates, TEMPLATE_FILTERS, _minify_html, fast_int, fast_tojson, render_daily_chart, render_markdown,
+    render_markdown_with_toc
+)
+
+
+class TestTemplateMinification(unittest.TestCase):
+    """Tests for import-time HTML minification"""
+
+    def test_collapses_whitespace_and_comments(self):
+        """Whitespace runs are collapsed and HTML comments removed"""
+        source = "<div>\n    <!-- comment -->\n    <span>  text  </span>\n</div>\n"
+        self.assertEqual(_minify_html(source), "<div> <span> text </span> </div>")
+
+    def test_preserves_whitespace_sensitive_blocks(self):
+        """Content of pre, textarea, script and style is left untouched"""
+        source = (
+            "<pre>line 1\n    line 2</pre>\n"
+            "<textarea>\n  a\n</textarea>\n"
+            "<script>\n  // <!-- not a comment -->\n  var a = 1;\n</script>\n"
+            "<style>\n  .a { color: red; }\n</style>"
+        )
+        minified = _minify_html(source)
+        self.assertIn("<pre>line 1\n    line 2</pre>", minified)
+        self.assertIn("<textarea>\n  a\n</textarea>", minified)
+        self.assertIn("<script>\n  // <!-- not a comment -->\n  var a = 1;\n</script>", minified)
+        self.assertIn("<style>\n  .a { color: red; }\n</style>", minified)
+
+    def test_preserves_jinja_tags(self):
+        """String literals inside Jinja expressions, statements and comments are left untouched"""
+        source = (
+            "<p>\n  {{ 'a   b' ~ \"<!-- x -->\" }}\n</p>\n"
+            "{% set label = 'c\n    d' %}\n"
+            "{# note:   keep #}"
+        )
+        minified = _minify_html(source)
+        self.assertIn("<p> {{ 'a   b' ~ \"<!-- x -->\" }} </p>", minified)
+        self.assertIn("{% set label = 'c\n    d' %}", minified)
+        self.assertIn("{# note:   keep #}", minified)
+
+    def test_minify_html_backend_is_opt_in(self):
+        """minify-html is used only when enabled with MINIFY_HTML=1"""
+        source = "<div>\n    <span>  text  </span>\n</div>"
+        with patch('web_templates.MINIFY_HTML_AVAILABLE', True), \
+             patch('web_templates.minify_html', create=True) as backend:
+            backend.minify.return_value = '<div><span>text</span></div>'
+            with patch.dict(os.environ, {'MINIFY_HTML': ''}):
+                self.assertEqual(_minify_html(source), "<div> <span> text </span> </div>")
+            with patch.dict(os.environ, {'MINIFY_HTML': '1'}):
+                self.assertEqual(_minify_html(source), '<div><span>text</span></div>')
+                backend.minify.side_effect = ValueError('unsupported')
+                self.assertEqual(_minify_html(source), "<div> <span> text </span> </div>")
+
+    def test_templates_are_minified_and_compile(self):
+        """Every template getter returns minified, valid Jinja source"""
+        templates = WebTemplates()
+        env = Environment()
+        env.filters.update(TEMPLATE_FILTERS)
+        for name in dir(templates):
+            if not name.startswith('get_') or not name.endswith('_template'):
+                continue
+            with self.subTest(template=name):
+                getter = getattr(templates, name)
+                source = getter()
+                self.assertLessEqual(len(source), len(getter.__wrapped__()))
+                self.assertIs(source, getter())
+                env.from_string(source)
+
+
+class TestLayout(unittest.TestCase):
+    """Tests for the shared page layout"""
+
+    def test_page_extends_layout(self):
+        """Pages get head, navigation and scripts from the shared layout"""
+        templates = WebTemplates()
+        env = Environment(loader=templates.get_loader(), autoescape=True)
+        html = env.from_string(templates.get_jobs_template()).render(
+            asset_styles=Markup('<link id="styles">'), asset_scripts=Markup('<script id="scripts"></script>'),
+            static_url=lambda filename: '/static/' + filename, jobs=[], jobs_rows='', is_admin=False
+        )
+        self.assertTrue(html.startswith('<!DOCTYPE html>'))
+        self.assertEqual(html.count('<nav'), 1)
+        self.assertIn('<link id="styles">', html)
+        self.assertLess(html.index('<script id="scripts">'), html.index('</body>'))
+
+    def test_pages_use_icon_subset(self):
+        """Pages load icons.css instead of Font Awesome; the docs viewer adds its own styles"""
+        templates = WebTemplates()
+        env = Environment(loader=templates.get_loader(), autoescape=True)
+        context = dict(
+            asset_styles=Markup('<link id="styles">'), asset_scripts=Markup('<script id="scripts"></script>'),
+            static_url=lambda filename: '/static/' + filename
+        )
+        html = env.from_string(templates.get_docs_index_template()).render(**context)
+        self.assertIn('<title>Документация - Meeting Processor</title>', html)
+        self.assertIn('<link id="styles"> <link href="/static/css/icons.css" rel="stylesheet">', html)
+        html = env.from_string(templates.get_docs_view_template()).render(doc_title='Чек-лист', **context)
+        self.assertLess(html.index('css/icons.css'), html.index('css/docs-view.css'))
+
+
+class TestMarkdownRendering(unittest.TestCase):
+    """Tests for server-side Markdown rendering"""
+
+    def test_renders_tables_and_strikethrough(self):
+        """GFM tables and strikethrough are supported"""
+        html = render_markdown("| a | b |\n|---|---|\n| 1 | 2 |\n\n~~old~~")
+        self.assertIn('<table>', html)
+        self.assertIn('<s>old</s>', html)
+
+    def test_breaks_option(self):
+        """Single newlines become <br> only when breaks are enabled"""
+        self.assertNotIn('<br', render_markdown("line 1\nline 2"))
+        self.assertIn('<br', render_markdown("line 1\nline 2", breaks=True))
+
+    def test_heading_ids_and_toc(self):
+        """Headings up to h4 get unique ids and are listed in the table of contents"""
+        html, toc = render_markdown_with_toc("# Обзор <x>\n\n## Шаги\n\n## Шаги\n\n##### Мелкий")
+        self.assertIn('<h1 id="обзор-x"', html)
+        self.assertIn('<h2 id="шаги"', html)
+        self.assertIn('<h2 id="шаги-2"', html)
+        self.assertNotIn('<h5 id=', html)
+        self.assertIn('<a href="#шаги-2">Шаги</a>', toc)
+        self.assertIn('Обзор &lt;x&gt;', toc)
+        self.assertEqual(toc.count('<li'), 3)
+
+    def test_sections_split_by_top_headings(self):
+        """The document is split into md-chunk sections at top-level h1/h2"""
+        html, _ = render_markdown_with_toc("Вступление\n\n# Обзор\n\n### Детали\n\n## Шаги\n\n- пункт")
+        self.assertEqual(html.count('<section class="md-chunk">'), 3)
+        self.assertEqual(html.count('</section>'), 3)
+        self.assertIn('<h3 id="детали" title="Нажмите, чтобы скопировать ссылку">Детали</h3>\n</section>', html)
+        self.assertEqual(render_markdown_with_toc("")[0], '')
+
+    def test_raw_html_is_escaped(self):
+        """Raw HTML in the source is not passed through"""
+        html = render_markdown("<script>alert(1)</script>")
+        self.assertNotIn('<script>', html)
+        self.assertIn('&lt;script&gt;', html)
+
+
+class TestFilters(unittest.TestCase):
+    """Tests for fast_tojson and fast_int filters"""
+
+    def test_tojson_is_html_safe(self):
+        """Embedded JSON cannot close the <script> tag or break attributes"""
+        dumped = fast_tojson({'text': "</script><b>'&"})
+        self.assertNotIn('<', dumped)
+        self.assertNotIn("'", dumped)
+        self.assertEqual(json.loads(dumped), {'text': "</script><b>'&"})
+
+    def test_int(self):
+        """Numbers are rendered as integers, invalid values as 0"""
+        self.assertEqual(fast_int(42.7), '42')
+        self.assertEqual(fast_int(None), '0')
+
+
+class TestDailyChart(unittest.TestCase):
+    """Tests for the server-rendered daily activity chart"""
+
+    def test_chart_is_inline_svg(self):
+        """Days are plotted oldest first with a tooltip per point and escaped labels"""
+        daily = [
+            {'date': '2025-01-03', 'protocols_count': 4, 'completed_count': 3},
+            {'date': '<b>', 'protocols_count': 2, 'completed_count': 2},
+            {'date': '2025-01-01', 'protocols_count': 0, 'completed_count': None},
+        ]
+        svg = render_daily_chart(daily)
+        self.assertTrue(svg.startswith('<svg'))
+        self.assertEqual(svg.count('<polyline'), 2)
+        self.assertEqual(svg.count('<circle'), 6)
+        self.assertLess(svg.index('2025-01-01: Протоколов создано — 0'), svg.index('2025-01-03: Протоколов создано — 4'))
+        self.assertIn('&lt;b&gt;', svg)
+        self.assertNotIn('<b>', svg)
+
+    def test_empty_and_single_day(self):
+        """No data renders nothing; a single day is drawn without dividing by zero"""
+        self.assertEqual(render_daily_chart([]), '')
+        svg = render_daily_chart([{'date': '2025-01-01', 'protocols_count': 0, 'completed_count': 0}])
+        self.assertEqual(svg.count('<circle'), 2)
+
+
+class TestTemplateOptions(unittest.TestCase):
+    """Tests for prebuilt <option> lists"""
+
+    def setUp(self):
+        self.templates = {'standard': 'Универсальный', 'business': 'Деловой <b>'}
+
+    def test_selected_and_escaped(self):
+        """The selected template is marked and descriptions are escaped"""
+        options = WebTemplates().build_template_options(self.templates, selected='standard')
+        self.assertIn('<option value="standard" selected>Standard - Универсальный</option>', options)
+        self.assertIn('<option value="business">Business - Деловой &lt;b&gt;</option>', options)
+
+    def test_exclude(self):
+        """The excluded template is omitted"""
+        options = WebTemplates().build_template_options(self.templates, exclude='standard')
+        self.assertNotIn('value="standard"', options)
+        self.assertIn('value="business"', options)
+
+
+class TestStageDisplay(unittest.TestCase):
+    """Tests for precomputed status page decorations"""
+
+    def test_known_and_unknown_stages(self):
+        """Terminal stages have their own decoration, others look in progress"""
+        templates = WebTemplates()
+        self.assertEqual(templates.get_stage_display('transcribed_only'), templates.get_stage_display('completed'))
+        self.assertEqual(templates.get_stage_display('transcription_error')['alert_class'], 'alert-danger')
+        in_progress = templates.get_stage_display('transcribing')
+        self.assertIn('fa-spin', in_progress['icon'])
+        self.assertIn('progress-bar-animated', in_progress['progress_class'])
+
+
+class TestJobsRows(unittest.TestCase):
+    """Tests for precompiled jobs table rows"""
+
+    def setUp(self):
+        self.job = {
+            'id': 'job-1',
+            'filename': '<script>.mp3',
+            'template': 'standard',
+            'stage': 'completed',
+            'progress': 100,
+            'created_at': '2025-01-01 10:00:00',
+            'user_display': 'user@example.com',
+        }
+
+    def test_row_contents(self):
+        """Rows contain escaped data, stage badge and progress class"""
+        rows = WebTemplates().render_jobs_rows([self.job])
+        self.assertIn('&lt;script&gt;.mp3', rows)
+        self.assertIn('Завершено', rows)
+        self.assertIn('progress-bar bg-success', rows)
+        self.assertIn('href="/status/job-1"', rows)
+        self.assertNotIn('user@example.com', rows)
+
+    def test_admin_column_and_unknown_stage(self):
+        """Admin rows show the user column; unknown stages fall back to pending"""
+        self.job['stage'] = 'pending'
+        rows = WebTemplates().render_jobs_rows([self.job, self.job], is_admin=True)
+        self.assertEqual(rows.count('<tr>'), 2)
+        self.assertIn('user@example.com', rows)
+        self.assertIn('Ожидание', rows)
+        self.assertIn('progress-bar bg-primary', rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
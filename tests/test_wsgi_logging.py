@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Tests for logging and middleware of the WSGI entry point
+"""
+
+import unittest
+import logging
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logging.handlers import QueueHandler
+from unittest.mock import Mock, patch
+
+from tests import import_wsgi
+
+wsgi = import_wsgi()
+
+
+def make_record(message, level=logging.INFO):
+    """Log record with a preformatted message"""
+    return logging.LogRecord('test', level, __file__, 0, message, None, None)
+
+
+class LogFileTestCase(unittest.TestCase):
+    """Base class: log path in a temporary directory, handlers closed after the test"""
+
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.log_dir, 'web_app.log')
+        self.handlers = []
+
+    def tearDown(self):
+        for handler in self.handlers:
+            handler.close()
+        shutil.rmtree(self.log_dir, ignore_errors=True)
+
+    def make_handler(self, **kwargs):
+        """Buffered handler on the test path with a message-only format"""
+        kwargs.setdefault('flush_interval', 3600)
+        handler = wsgi.BufferedRotatingFileHandler(self.path, encoding='utf-8', delay=True, **kwargs)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self.handlers.append(handler)
+        return handler
+
+    def read(self, path=None):
+        with open(path or self.path, encoding='utf-8') as f:
+            return f.read()
+
+
+class TestBufferedRotatingFileHandler(LogFileTestCase):
+    """Tests for size tracking, flushing and rotation of the shared log file"""
+
+    def test_records_buffered_until_error(self):
+        """INFO records stay in the buffer; an ERROR record flushes them together with itself"""
+        handler = self.make_handler()
+        handler.handle(make_record('first'))
+        self.assertEqual(os.path.getsize(self.path), 0)
+        handler.handle(make_record('failure', logging.ERROR))
+        self.assertEqual(self.read(), 'first\nfailure\n')
+
+    def test_flush_interval_elapsed(self):
+        """A record written after the flush interval flushes the buffer"""
+        handler = self.make_handler(flush_interval=0)
+        handler.handle(make_record('first'))
+        self.assertEqual(self.read(), 'first\n')
+
+    def test_rollover_with_two_handlers_on_one_path(self):
+        """Writes of every worker count toward maxBytes, so the shared file is rotated in time"""
+        max_bytes = 1000
+        handlers = [self.make_handler(maxBytes=max_bytes, backupCount=5, flush_interval=0) for _ in range(2)]
+        message = 'x' * 99
+        for i in range(40):
+            handlers[i % 2].handle(make_record(message))
+        for handler in handlers:
+            handler.flush()
+
+        self.assertTrue(os.path.exists(self.path + '.1'))
+        self.assertTrue(os.path.exists(self.path + '.3'))
+        for path in (self.path, self.path + '.1', self.path + '.2', self.path + '.3'):
+            with self.subTest(path=os.path.basename(path)):
+                self.assertLessEqual(os.path.getsize(path), max_bytes + len(message) + 1)
+
+    def test_size_includes_other_writers_after_flush(self):
+        """flush() takes the size from the file, including bytes of other handlers"""
+        first, second = self.make_handler(), self.make_handler()
+        first.handle(make_record('a' * 9, logging.ERROR))
+        second.handle(make_record('b' * 9, logging.ERROR))
+        first.flush()
+        self.assertEqual(first._size, 20)
+
+    def test_reopen_after_external_rename(self):
+        """After logrotate renames the file, the next flush reopens the log path"""
+        handler = self.make_handler(flush_interval=0)
+        handler.handle(make_record('before'))
+        os.rename(self.path, self.path + '.1')
+        handler.handle(make_record('during'))
+        handler.handle(make_record('after'))
+
+        self.assertEqual(self.read(self.path + '.1'), 'before\nduring\n')
+        self.assertEqual(self.read(), 'after\n')
+
+    def test_second_worker_does_not_rotate_again(self):
+        """A handler whose file was already rotated by another one reopens instead of rotating"""
+        first = self.make_handler(maxBytes=100, backupCount=5, flush_interval=0)
+        second = self.make_handler(maxBytes=100, backupCount=5, flush_interval=0)
+        second.handle(make_record('second'))
+        first.handle(make_record('first'))
+        first.handle(make_record('x' * 99))
+        second.handle(make_record('s' * 99))
+
+        self.assertFalse(os.path.exists(self.path + '.2'))
+        self.assertEqual(self.read(self.path + '.1'), 'second\nfirst\n')
+        self.assertEqual(self.read(), 'x' * 99 + '\n' + 's' * 99 + '\n')
+
+    def test_reset_after_fork_drops_inherited_buffer(self):
+        """The worker discards the master's buffered records and reopens the file"""
+        handler = self.make_handler()
+        handler.handle(make_record('master'))
+        handler.reset_after_fork()
+        self.assertIsNone(handler.stream)
+        handler.handle(make_record('worker', logging.ERROR))
+        self.assertEqual(self.read(), 'worker\n')
+
+
+class TestFlushingQueueListener(LogFileTestCase):
+    """Tests for the background thread writing queued records"""
+
+    def test_idle_queue_flushes_handlers(self):
+        """Buffered records reach the file when no further records arrive"""
+        handler = self.make_handler()
+        listener = wsgi.FlushingQueueListener(queue.SimpleQueue(), handler, flush_interval=0.05)
+        listener.start()
+        try:
+            listener.queue.put(make_record('idle'))
+            deadline = time.monotonic() + 5
+            while not (os.path.exists(self.path) and os.path.getsize(self.path)) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(self.read(), 'idle\n')
+        finally:
+            listener.stop()
+
+    def test_non_blocking_dequeue_raises_empty(self):
+        """Without blocking an empty queue is reported instead of waiting"""
+        listener = wsgi.FlushingQueueListener(queue.SimpleQueue())
+        with self.assertRaises(queue.Empty):
+            listener.dequeue(False)
+
+    def test_restart_after_fork(self):
+        """The worker gets a new queue and listener with the same handlers"""
+        handler = self.make_handler()
+        listener = wsgi.FlushingQueueListener(queue.SimpleQueue(), handler)
+        queue_handler = QueueHandler(listener.queue)
+        root_logger = logging.getLogger()
+        root_logger.addHandler(queue_handler)
+        try:
+            with patch.object(wsgi, '_log_listener', listener):
+                wsgi._restart_log_listener()
+                restarted = wsgi._log_listener
+                try:
+                    self.assertIsNot(restarted, listener)
+                    self.assertIs(queue_handler.queue, restarted.queue)
+                    self.assertEqual(restarted.handlers, (handler,))
+                finally:
+                    restarted.stop()
+        finally:
+            root_logger.removeHandler(queue_handler)
+
+    def test_flush_before_fork(self):
+        """Buffers are written out before fork"""
+        handler = self.make_handler()
+        handler.handle(make_record('pending'))
+        listener = wsgi.FlushingQueueListener(queue.SimpleQueue(), handler)
+        with patch.object(wsgi, '_log_listener', listener):
+            wsgi._flush_log_handlers()
+        self.assertEqual(self.read(), 'pending\n')
+
+
+class TestHealthProbeMiddleware(unittest.TestCase):
+    """Tests for the liveness probe answered before Flask"""
+
+    def setUp(self):
+        self.app = Mock(return_value=[b'app'])
+        self.start_response = Mock()
+        self.middleware = wsgi.health_probe_middleware(self.app)
+
+    def test_probe_answered_without_application(self):
+        """/healthz returns OK and does not reach the application"""
+        body = self.middleware({'PATH_INFO': '/healthz'}, self.start_response)
+        self.assertEqual(body, [b'OK'])
+        self.app.assert_not_called()
+        status, headers = self.start_response.call_args[0]
+        self.assertEqual(status, '200 OK')
+        self.assertIn(('Cache-Control', 'no-store'), headers)
+
+    def test_other_paths_passed_through(self):
+        """Every other path is handled by the application"""
+        environ = {'PATH_INFO': '/health'}
+        self.assertEqual(self.middleware(environ, self.start_response), [b'app'])
+        self.app.assert_called_once_with(environ, self.start_response)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the session signing key of the WSGI entry point
+"""
+
+import unittest
+import os
+import shutil
+import stat
+import sys
+import tempfile
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from unittest.mock import patch
+
+from tests import import_wsgi
+
+wsgi = import_wsgi()
+
+
+class TestLoadSecretKey(unittest.TestCase):
+    """Tests for reading and generating SECRET_KEY"""
+
+    def setUp(self):
+        self.instance_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.instance_dir, 'instance', 'secret_key')
+        env = patch.dict(os.environ)
+        env.start()
+        self.addCleanup(env.stop)
+        os.environ.pop('SECRET_KEY', None)
+
+    def tearDown(self):
+        shutil.rmtree(self.instance_dir, ignore_errors=True)
+
+    def test_environment_takes_precedence(self):
+        """SECRET_KEY from the environment is used and no file is created"""
+        os.environ['SECRET_KEY'] = 'from-env'
+        self.assertEqual(wsgi.load_secret_key(self.path), b'from-env')
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_generated_key_is_reused(self):
+        """The first call creates the key, later calls return the same one"""
+        key = wsgi.load_secret_key(self.path)
+        self.assertEqual(len(key), 32)
+        self.assertEqual(wsgi.load_secret_key(self.path), key)
+
+    def test_key_file_private(self):
+        """The key file is readable only by the owner and no temporary files remain"""
+        wsgi.load_secret_key(self.path)
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ['secret_key'])
+
+    def test_existing_key_wins(self):
+        """A key already published by another worker is not replaced"""
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'wb') as f:
+            f.write(b'existing-key')
+        self.assertEqual(wsgi.load_secret_key(self.path), b'existing-key')
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ['secret_key'])
+
+    def test_empty_key_file_raises(self):
+        """An empty key file is an error, never an empty key"""
+        os.makedirs(os.path.dirname(self.path))
+        open(self.path, 'wb').close()
+        with self.assertRaises(RuntimeError):
+            wsgi.load_secret_key(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Локальная раздача библиотек интерфейса (Bootstrap) для Meeting Processor
+
+При включенной настройке web.self_host_assets CSS/JS загружаются с CDN
+один раз при старте приложения и отдаются самим приложением с долгим кешированием.
+Если загрузка не удалась, страницы продолжают ссылаться на CDN.
+Иконки Font Awesome не загружаются: нужные контуры лежат в static/css/icons.css.
+"""
+
+import base64
+import hashlib
+import logging
+from typing import Dict, Tuple
+
+import requests
+from markupsafe import Markup
+
+logger = logging.getLogger(__name__)
+
+CDN_ORIGIN = "https://cdn.jsdelivr.net"
+BOOTSTRAP_CSS_URL = "https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css"
+BOOTSTRAP_JS_URL = "https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"
+# Subresource Integrity опубликованных файлов Bootstrap 5.1.3: браузер не выполнит подмененный
+# на CDN файл, а загруженный для локальной раздачи файл сверяется с тем же хешем
+BOOTSTRAP_CSS_INTEGRITY = "sha384-1BmE4kWBq78iYhFldvKuhfTAU6auU8tT94WrHftjDbrCEXSU1oBoqyl2QvZ6jIW3"
+BOOTSTRAP_JS_INTEGRITY = "sha384-ka7Sk0Gln4gmtz2MlQnikT1wXgYsOg+OMhuP+IlRH9sENBO0LRn5q+8nbTov4+1p"
+
+# Пути внутри /static/, по которым отдается бандл (файлов на диске нет)
+BUNDLE_CSS = "vendor/css/bootstrap.css"
+BUNDLE_JS = "vendor/js/bundle.js"
+
+
+def _content_version(data: bytes) -> str:
+    """Короткий хеш содержимого для версионирования URL"""
+    return hashlib.sha1(data).hexdigest()[:12]
+
+
+def subresource_integrity(data: bytes) -> str:
+    """Значение атрибута integrity (SHA-384) для содержимого файла"""
+    return "sha384-" + base64.b64encode(hashlib.sha384(data).digest()).decode('ascii')
+
+
+class AssetBundle:
+    """CSS/JS библиотек интерфейса, загруженные с CDN и отдаваемые приложением"""
+
+    def __init__(self):
+        # путь внутри /static/ -> (содержимое, MIME-тип)
+        self.files: Dict[str, Tuple[bytes, str]] = {}
+
+    @property
+    def loaded(self) -> bool:
+        """Бандл успешно загружен и отдается локально"""
+        return BUNDLE_CSS in self.files
+
+    def load(self, timeout: float = 10.0) -> bool:
+        """Загружает CSS и JS с CDN и сверяет их с SRI; при любой ошибке остается на CDN"""
+        try:
+            css = self._fetch(BOOTSTRAP_CSS_URL, BOOTSTRAP_CSS_INTEGRITY, timeout)
+            js = self._fetch(BOOTSTRAP_JS_URL, BOOTSTRAP_JS_INTEGRITY, timeout)
+        except (requests.RequestException, ValueError) as e:
+            logger.warning(f"Не удалось загрузить библиотеки интерфейса с CDN, используются внешние ссылки: {e}")
+            return False
+
+        self.files = {
+            BUNDLE_CSS: (css, 'text/css'),
+            BUNDLE_JS: (js, 'text/javascript'),
+        }
+        total_kb = sum(len(data) for data, _ in self.files.values()) // 1024
+        logger.info(f"Библиотеки интерфейса загружены для локальной раздачи: {len(self.files)} файлов, {total_kb} КБ")
+        return True
+
+    @staticmethod
+    def _fetch(url: str, integrity: str, timeout: float) -> bytes:
+        response = requests.get(url, timeout=timeout)
+        response.raise_for_status()
+        if subresource_integrity(response.content) != integrity:
+            raise ValueError(f"содержимое {url} не совпадает с ожидаемым SRI")
+        return response.content
+
+    def _url(self, path: str) -> str:
+        return f"/static/{path}?v={_content_version(self.files[path][0])}"
+
+    def style_tags(self) -> Markup:
+        """Тег <link> со стилями Bootstrap (с CDN — с проверкой integrity)
+
+        Файлы с integrity запрашиваются в режиме CORS, поэтому и preconnect к CDN
+        нужен с crossorigin: иначе браузер откроет для них второе соединение.
+        """
+        if self.loaded:
+            return Markup(f'<link href="{self._url(BUNDLE_CSS)}" rel="stylesheet">')
+        return Markup(f'<link rel="preconnect" href="{CDN_ORIGIN}" crossorigin>'
+                      f'<link href="{BOOTSTRAP_CSS_URL}" rel="stylesheet" '
+                      f'integrity="{BOOTSTRAP_CSS_INTEGRITY}" crossorigin="anonymous">')
+
+    def script_tags(self) -> Markup:
+        """Тег <script> с Bootstrap JS; defer не блокирует разбор страницы, с CDN — с проверкой integrity"""
+        if self.loaded:
+            return Markup(f'<script src="{self._url(BUNDLE_JS)}" defer></script>')
+        return Markup(f'<script src="{BOOTSTRAP_JS_URL}" integrity="{BOOTSTRAP_JS_INTEGRITY}" '
+                      f'crossorigin="anonymous" defer></script>')
@@ -2,34 +2,372 @@
 HTML шаблоны для веб-приложения Meeting Processor
 """
 
-class WebTemplates:
-    """Класс для хранения HTML шаблонов веб-приложения"""
-    
-    def get_index_template(self):
-        """Возвращает HTML шаблон главной страницы"""
-        return '''
-<!DOCTYPE html>
-<html lang="ru">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Meeting Processor</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
-</head>
-<body class="bg-light">
-    <nav class="navbar navbar-dark bg-primary">
-        <div class="container">
-            <a class="navbar-brand" href="/"><i class="fas fa-microphone me-2"></i>Meeting Processor</a>
-            <div class="navbar-nav d-flex flex-row">
-                <a class="nav-link me-3" href="/"><i class="fas fa-home me-1"></i>Главная</a>
-                <a class="nav-link me-3" href="/jobs"><i class="fas fa-list me-1"></i>Все задачи</a>
-                <a class="nav-link me-3" href="/docs"><i class="fas fa-book me-1"></i>Документация</a>
-                <a class="nav-link" href="/statistics"><i class="fas fa-chart-bar me-1"></i>Статистика</a>
+import functools
+import json
+import logging
+import os
+import re
+
+from jinja2 import DictLoader, Environment
+from markdown_it import MarkdownIt
+from markupsafe import Markup, escape
+
+# Быстрая JSON-сериализация для встраивания данных в <script> (опционально)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Минификация шаблонов библиотекой minify-html (опционально, включается MINIFY_HTML=1)
+try:
+    import minify_html
+    MINIFY_HTML_AVAILABLE = True
+except ImportError:
+    MINIFY_HTML_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Блоки, содержимое которых нельзя трогать при минификации (пробелы значимы):
+# теги Jinja ({{ }}, {% %}, {# #}) со строковыми литералами и <pre>, <textarea>, <script>, <style>
+_PRESERVED_BLOCK_RE = re.compile(
+    r'\{\{.*?\}\}|\{%.*?%\}|\{#.*?#\}|<(pre|textarea|script|style)\b.*?</\1\s*>', re.S | re.I
+)
+_HTML_COMMENT_RE = re.compile(r'<!--.*?-->', re.S)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _collapse_whitespace(fragment):
+    """Удаляет HTML-комментарии и схлопывает последовательности пробелов в один"""
+    fragment = _HTML_COMMENT_RE.sub('', fragment)
+    return _WHITESPACE_RE.sub(' ', fragment)
+
+
+def _minify_html_external(source):
+    """Минифицирует HTML шаблона через minify-html; None, если библиотека отключена или не справилась"""
+    if not MINIFY_HTML_AVAILABLE or os.environ.get('MINIFY_HTML') != '1':
+        return None
+    try:
+        # JS не трогаем: в <script> встроены выражения Jinja
+        return minify_html.minify(
+            source,
+            minify_css=True,
+            minify_js=False,
+            keep_closing_tags=True,
+            keep_html_and_head_opening_tags=True,
+            preserve_brace_template_syntax=True,
+        ).strip()
+    except Exception as e:
+        logger.warning(f"minify-html не смог обработать шаблон, используется встроенная минификация: {e}")
+        return None
+
+
+def _minify_html(source):
+    """Минифицирует HTML шаблона, не затрагивая теги Jinja, <pre>, <textarea>, <script> и <style>"""
+    minified = _minify_html_external(source)
+    if minified is not None:
+        return minified
+    parts = []
+    position = 0
+    for match in _PRESERVED_BLOCK_RE.finditer(source):
+        parts.append(_collapse_whitespace(source[position:match.start()]))
+        parts.append(match.group(0))
+        position = match.end()
+    parts.append(_collapse_whitespace(source[position:]))
+    return ''.join(parts).strip()
+
+
+def _minified(method):
+    """Декоратор: минифицирует шаблон один раз на процесс и кеширует результат"""
+    cache = {}
+
+    @functools.wraps(method)
+    def wrapper():
+        if 'html' not in cache:
+            cache['html'] = _minify_html(method())
+        return cache['html']
+
+    return wrapper
+
+
+# Символы, которые JSON внутри HTML/<script> должен содержать только в виде \\uXXXX
+_HTML_UNSAFE_JSON = str.maketrans({
+    '<': '\\u003c',
+    '>': '\\u003e',
+    '&': '\\u0026',
+    "'": '\\u0027',
+})
+
+
+def fast_tojson(value):
+    """Фильтр Jinja: JSON для встраивания в HTML (как tojson, но через orjson, если установлен)"""
+    if ORJSON_AVAILABLE:
+        try:
+            dumped = orjson.dumps(value).decode('utf-8')
+        except TypeError:
+            dumped = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+    else:
+        dumped = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+    return Markup(dumped.translate(_HTML_UNSAFE_JSON))
+
+
+def fast_int(value):
+    """Фильтр Jinja: целое число без прохода экранирования (нечисловое значение -> 0)"""
+    try:
+        return Markup(int(value))
+    except (TypeError, ValueError):
+        return Markup(0)
+
+
+# График активности по дням: серии (поле статистики, подпись, цвет) и размеры области SVG
+_DAILY_CHART_SERIES = (
+    ('protocols_count', 'Протоколов создано', 'rgb(75, 192, 192)'),
+    ('completed_count', 'Успешно обработано', 'rgb(54, 162, 235)'),
+)
+_DAILY_CHART_WIDTH, _DAILY_CHART_HEIGHT = 800, 220
+_DAILY_CHART_PADDING = {'left': 40, 'right': 12, 'top': 28, 'bottom': 28}
+
+
+def render_daily_chart(daily):
+    """Фильтр Jinja: линейный график статистики по дням в виде встроенного SVG (без JS-библиотек)
+
+    Строки статистики приходят от новых дат к старым; на графике время идет слева направо.
+    """
+    days = list(reversed(daily or []))
+    if not days:
+        return Markup('')
+    pad = _DAILY_CHART_PADDING
+    plot_width = _DAILY_CHART_WIDTH - pad['left'] - pad['right']
+    plot_height = _DAILY_CHART_HEIGHT - pad['top'] - pad['bottom']
+    bottom = pad['top'] + plot_height
+    max_value = max(1, *(int(day.get(key) or 0) for day in days for key, _, _ in _DAILY_CHART_SERIES))
+
+    def x(index):
+        if len(days) == 1:
+            return pad['left'] + plot_width / 2
+        return pad['left'] + plot_width * index / (len(days) - 1)
+
+    def y(value):
+        return bottom - plot_height * value / max_value
+
+    parts = []
+    # Горизонтальные линии сетки с подписями значений
+    for value in sorted({0, max_value // 2, max_value}):
+        parts.append(Markup(
+            '<line x1="{0}" y1="{1:.1f}" x2="{2}" y2="{1:.1f}" stroke="#dee2e6"/>'
+            '<text x="{3}" y="{4:.1f}" text-anchor="end" font-size="11" fill="#6c757d">{5}</text>'
+        ).format(pad['left'], y(value), _DAILY_CHART_WIDTH - pad['right'], pad['left'] - 6, y(value) + 4, value))
+    # Подписи дат: первая, средняя и последняя
+    for index in sorted({0, len(days) // 2, len(days) - 1}):
+        anchor = 'start' if index == 0 and len(days) > 1 else 'end' if index == len(days) - 1 and len(days) > 1 else 'middle'
+        parts.append(Markup(
+            '<text x="{0:.1f}" y="{1}" text-anchor="{2}" font-size="11" fill="#6c757d">{3}</text>'
+        ).format(x(index), _DAILY_CHART_HEIGHT - 8, anchor, days[index].get('date', '')))
+    # Линии серий, точки с всплывающими подсказками и легенда
+    for number, (key, label, color) in enumerate(_DAILY_CHART_SERIES):
+        values = [int(day.get(key) or 0) for day in days]
+        parts.append(Markup('<polyline fill="none" stroke="{0}" stroke-width="2" points="{1}"/>').format(
+            color, ' '.join(f'{x(i):.1f},{y(v):.1f}' for i, v in enumerate(values))
+        ))
+        for index, value in enumerate(values):
+            parts.append(Markup(
+                '<circle cx="{0:.1f}" cy="{1:.1f}" r="3" fill="{2}"><title>{3}: {4} — {5}</title></circle>'
+            ).format(x(index), y(value), color, days[index].get('date', ''), label, value))
+        legend_x = pad['left'] + number * 180
+        parts.append(Markup(
+            '<rect x="{0}" y="6" width="12" height="12" fill="{1}"/>'
+            '<text x="{2}" y="16" font-size="12" fill="#212529">{3}</text>'
+        ).format(legend_x, color, legend_x + 18, label))
+
+    return Markup(
+        '<svg class="w-100 h-auto" viewBox="0 0 {0} {1}" role="img" aria-label="Активность по дням">{2}</svg>'
+    ).format(_DAILY_CHART_WIDTH, _DAILY_CHART_HEIGHT, Markup('').join(parts))
+
+
+# Фильтры, общие для окружения Flask и окружения фрагментов
+TEMPLATE_FILTERS = {
+    'fast_tojson': fast_tojson,
+    'fast_int': fast_int,
+    'daily_chart': render_daily_chart,
+}
+
+# Окружение для фрагментов, которые рендерятся вне контекста Flask
+_ENV = Environment(autoescape=True)
+_ENV.filters.update(TEMPLATE_FILTERS)
+
+# Markdown рендерится на сервере (CommonMark + таблицы и зачеркивание как в GFM);
+# сырой HTML из исходника не пропускается
+_MARKDOWN = MarkdownIt('commonmark', {'html': False}).enable(['table', 'strikethrough'])
+# Документация написана с одиночными переносами строк (как отображал marked с breaks: true)
+_MARKDOWN_BREAKS = MarkdownIt('commonmark', {'html': False, 'breaks': True}).enable(['table', 'strikethrough'])
+
+
+# Заголовки, которые попадают в оглавление документации
+_TOC_MAX_LEVEL = 4
+# Последовательности символов, которые заменяются дефисом в якоре заголовка
+_SLUG_RE = re.compile(r'[^\w]+')
+# Заголовки, с которых начинается новый раздел <section class="md-chunk">
+_CHUNK_HEADING_TAGS = ('h1', 'h2')
+
+
+def render_markdown(text, breaks=False):
+    """Рендерит Markdown в безопасный HTML (breaks=True: перенос строки -> <br>)"""
+    return Markup((_MARKDOWN_BREAKS if breaks else _MARKDOWN).render(text))
+
+
+def _heading_slug(title, used):
+    """Строит уникальный в пределах документа якорь заголовка"""
+    slug = _SLUG_RE.sub('-', title.lower()).strip('-') or 'section'
+    candidate = slug
+    suffix = 2
+    while candidate in used:
+        candidate = f'{slug}-{suffix}'
+        suffix += 1
+    used.add(candidate)
+    return candidate
+
+
+def render_markdown_with_toc(text, breaks=False):
+    """Рендерит Markdown в HTML и оглавление: заголовкам h1-h4 назначаются якоря по их тексту.
+
+    Документ разбивается на разделы <section class="md-chunk"> по заголовкам h1/h2,
+    чтобы браузер не верстал разделы за пределами экрана (content-visibility: auto).
+    """
+    md = _MARKDOWN_BREAKS if breaks else _MARKDOWN
+    tokens = md.parse(text)
+    used = set()
+    toc_items = []
+    chunk_starts = [0]
+    for index, token in enumerate(tokens):
+        if token.type != 'heading_open':
+            continue
+        if token.level == 0 and token.tag in _CHUNK_HEADING_TAGS and index > 0:
+            chunk_starts.append(index)
+        if int(token.tag[1:]) > _TOC_MAX_LEVEL:
+            continue
+        title = ''.join(
+            child.content for child in tokens[index + 1].children or ()
+            if child.type in ('text', 'code_inline')
+        ).strip()
+        slug = _heading_slug(title, used)
+        token.attrSet('id', slug)
+        token.attrSet('title', 'Нажмите, чтобы скопировать ссылку')
+        toc_items.append(Markup('<li class="ms-{}"><a href="#{}">{}</a></li>').format(
+            (int(token.tag[1:]) - 1) * 3, slug, title
+        ))
+
+    chunk_ends = chunk_starts[1:] + [len(tokens)]
+    html = Markup('').join(
+        Markup('<section class="md-chunk">{}</section>').format(
+            Markup(md.renderer.render(tokens[start:end], md.options, {}))
+        )
+        for start, end in zip(chunk_starts, chunk_ends) if end > start
+    )
+    toc = Markup('<ul>{}</ul>').format(Markup('').join(toc_items)) if toc_items else Markup('')
+    return html, toc
+
+# Бейджи статусов задач: словарь вместо цепочки {% if %} на каждую строку таблицы
+_JOB_STAGE_BADGES = {
+    'completed': Markup('<span class="badge bg-success"><i class="fas fa-check me-1"></i>Завершено</span>'),
+    'transcribed_only': Markup('<span class="badge bg-success"><i class="fas fa-check me-1"></i>Транскрипция готова (без протокола)</span>'),
+    'protocol_error': Markup('<span class="badge bg-warning text-dark"><i class="fas fa-exclamation-triangle me-1"></i>Транскрипт готов, ошибка протокола</span>'),
+    'transcription_error': Markup('<span class="badge bg-danger"><i class="fas fa-exclamation me-1"></i>Ошибка транскрибации</span>'),
+    'generating_protocol': Markup('<span class="badge bg-primary"><i class="fas fa-cog fa-spin me-1"></i>Генерация протокола</span>'),
+    'transcribing': Markup('<span class="badge bg-info text-dark"><i class="fas fa-microphone me-1"></i>Транскрибация</span>'),
+}
+_JOB_STAGE_BADGE_DEFAULT = Markup('<span class="badge bg-warning"><i class="fas fa-clock me-1"></i>Ожидание</span>')
+
+_JOB_PROGRESS_CLASSES = {
+    'completed': 'bg-success',
+    'transcribed_only': 'bg-success',
+    'protocol_error': 'bg-warning',
+    'transcription_error': 'bg-danger',
+}
+
+# Оформление страницы статуса по этапу задачи (иконка, цвет прогресса и сообщения)
+_STATUS_STAGE_DISPLAY = {
+    'completed': {
+        'icon': Markup('<i class="fas fa-check-circle fa-4x text-success"></i>'),
+        'progress_class': 'bg-success',
+        'alert_class': 'alert-success',
+    },
+    'protocol_error': {
+        'icon': Markup('<i class="fas fa-exclamation-triangle fa-4x text-warning"></i>'),
+        'progress_class': 'bg-warning',
+        'alert_class': 'alert-warning',
+    },
+    'transcription_error': {
+        'icon': Markup('<i class="fas fa-exclamation-circle fa-4x text-danger"></i>'),
+        'progress_class': 'bg-danger',
+        'alert_class': 'alert-danger',
+    },
+}
+_STATUS_STAGE_DISPLAY['transcribed_only'] = _STATUS_STAGE_DISPLAY['completed']
+_STATUS_STAGE_DISPLAY_IN_PROGRESS = {
+    'icon': Markup('<i class="fas fa-cog fa-spin fa-4x text-primary"></i>'),
+    'progress_class': 'bg-primary progress-bar-animated',
+    'alert_class': 'alert-info',
+}
+
+_JOBS_ROW_TEMPLATE = _ENV.from_string(_minify_html('''
+<tr>
+    <td><i class="fas fa-file me-1"></i>{{ job.filename }}</td>
+    {% if is_admin %}<td><small class="text-muted">{{ job.user_display }}</small></td>{% endif %}
+    <td><span class="badge bg-secondary">{{ 'без протокола' if job.template == 'none' else job.template }}</span></td>
+    <td>{{ badge }}</td>
+    <td>
+        <div class="progress" style="height: 20px; width: 100px;">
+            <div class="progress-bar {{ progress_class }}" style="width: {{ job.progress|fast_int }}%">
+                <small>{{ job.progress|fast_int }}%</small>
             </div>
         </div>
-    </nav>
-
+    </td>
+    <td class="text-nowrap">{{ job.created_at }}</td>
+    <td>
+        <a href="/status/{{ job.id }}" class="btn btn-sm btn-outline-primary">
+            <i class="fas fa-eye me-1"></i>Подробнее
+        </a>
+    </td>
+</tr>
+'''))
+
+
+# Документы раздела "Документация" в порядке отображения на главной странице документации
+DOCS_METADATA = (
+    {
+        'name': 'checklist',
+        'file': 'quick_meeting_checklist.md',
+        'title': 'Быстрый чек-лист для записи встреч',
+        'card_title': 'Быстрый чек-лист',
+        'summary': 'Краткий справочник для ежедневного использования: проверка перед встречей, правила во время встречи.',
+        'icon': 'fa-tasks',
+        'color': 'success',
+    },
+    {
+        'name': 'guidelines',
+        'file': 'meeting_recording_guidelines.md',
+        'title': 'Полное руководство по проведению встреч',
+        'card_title': 'Полное руководство',
+        'summary': 'Детальные рекомендации по всем аспектам: техническая подготовка, правила речи, примеры практики.',
+        'icon': 'fa-file-alt',
+        'color': 'info',
+    },
+    {
+        'name': 'setup',
+        'file': 'recording_setup_guide.md',
+        'title': 'Техническое руководство по настройке записи',
+        'card_title': 'Техническое руководство',
+        'summary': 'Подробные инструкции по настройке записи для Zoom, Google Meet, KTalk и проприетарного ПО.',
+        'icon': 'fa-cogs',
+        'color': 'warning',
+    },
+)
+
+# Главная страница: форма загрузки файла
+_INDEX_HTML = '''
+{% extends "_layout.html" %}
+{% block title %}Meeting Processor{% endblock %}
+{% block content %}
     <div class="container mt-4">
         {% with messages = get_flashed_messages(with_categories=true) %}
             {% if messages %}
@@ -51,11 +389,7 @@ class WebTemplates:
                             <div class="mb-3">
                                 <label for="template" class="form-label">Шаблон протокола:</label>
                                 <select class="form-select" name="template" required>
-                                    {% for template_id, description in templates.items() %}
-                                        <option value="{{ template_id }}" {% if template_id == 'standard' %}selected{% endif %}>
-                                            {{ template_id.title() }} - {{ description }}
-                                        </option>
-                                    {% endfor %}
+                                    {{ template_options }}
                                     <option value="none">Без протокола — только транскрибация</option>
                                 </select>
                                 <div class="form-text">
@@ -134,99 +468,24 @@ class WebTemplates:
             </div>
         </div>
     </div>
-
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
+{% endblock %}
+{% block scripts %}
+    <script src="{{ static_url('js/app.js') }}" defer></script>
     <script>
-        document.getElementById('uploadForm').addEventListener('submit', function(e) {
-            e.preventDefault();
-            
-            const formData = new FormData(this);
-            const fileInput = document.getElementById('fileInput');
-            const uploadProgress = document.getElementById('uploadProgress');
-            const uploadProgressBar = document.getElementById('uploadProgressBar');
-            const uploadProgressText = document.getElementById('uploadProgressText');
-            const submitBtn = document.getElementById('submitBtn');
-            
-            // Проверяем, выбран ли файл
-            if (!fileInput.files[0]) {
-                alert('Пожалуйста, выберите файл');
-                return;
-            }
-            
-            // Показываем прогресс бар и блокируем кнопку
-            uploadProgress.style.display = 'block';
-            submitBtn.disabled = true;
-            submitBtn.innerHTML = '<i class="fas fa-spinner fa-spin me-2"></i>Загрузка...';
-            
-            // Создаем XMLHttpRequest для отслеживания прогресса
-            const xhr = new XMLHttpRequest();
-            
-            // Отслеживание прогресса загрузки
-            xhr.upload.addEventListener('progress', function(e) {
-                if (e.lengthComputable) {
-                    const percentComplete = Math.round((e.loaded / e.total) * 100);
-                    uploadProgressBar.style.width = percentComplete + '%';
-                    uploadProgressText.textContent = percentComplete + '%';
-                }
-            });
-            
-            // Обработка завершения загрузки
-            xhr.addEventListener('load', function() {
-                if (xhr.status === 200) {
-                    // Успешная загрузка - перенаправляем
-                    window.location.href = xhr.responseURL;
-                } else {
-                    // Ошибка загрузки
-                    alert('Ошибка загрузки файла');
-                    uploadProgress.style.display = 'none';
-                    submitBtn.disabled = false;
-                    submitBtn.innerHTML = '<i class="fas fa-rocket me-2"></i>Начать обработку';
-                }
-            });
-            
-            // Обработка ошибок
-            xhr.addEventListener('error', function() {
-                alert('Ошибка сети при загрузке файла');
-                uploadProgress.style.display = 'none';
-                submitBtn.disabled = false;
-                submitBtn.innerHTML = '<i class="fas fa-rocket me-2"></i>Начать обработку';
-            });
-            
-            // Отправляем файл
-            xhr.open('POST', '/upload');
-            xhr.send(formData);
-        });
+        document.addEventListener('DOMContentLoaded', initUploadForm);
     </script>
-</body>
-</html>
+{% endblock %}
         '''
-    
-    def get_status_template(self):
-        """Возвращает HTML шаблон страницы статуса"""
-        return '''
-<!DOCTYPE html>
-<html lang="ru">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Статус обработки</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
-    <link href="/static/css/progress.css" rel="stylesheet">
-</head>
-<body class="bg-light">
-    <nav class="navbar navbar-dark bg-primary">
-        <div class="container">
-            <a class="navbar-brand" href="/"><i class="fas fa-microphone me-2"></i>Meeting Processor</a>
-            <div class="navbar-nav d-flex flex-row">
-                <a class="nav-link me-3" href="/"><i class="fas fa-home me-1"></i>Главная</a>
-                <a class="nav-link me-3" href="/jobs"><i class="fas fa-list me-1"></i>Все задачи</a>
-                <a class="nav-link me-3" href="/docs"><i class="fas fa-book me-1"></i>Документация</a>
-                <a class="nav-link" href="/statistics"><i class="fas fa-chart-bar me-1"></i>Статистика</a>
-            </div>
-        </div>
-    </nav>
 
+
+# Страница статуса задачи
+_STATUS_HTML = '''
+{% extends "_layout.html" %}
+{% block title %}Статус обработки{% endblock %}
+{% block head %}
+    <link href="{{ static_url('css/progress.css') }}" rel="stylesheet">
+{% endblock %}
+{% block content %}
     <div class="container mt-4">
         {% with messages = get_flashed_messages(with_categories=true) %}
             {% if messages %}
@@ -243,623 +502,576 @@ class WebTemplates:
             <div class="card-header bg-primary text-white">
                 <h4><i class="fas fa-tasks me-2"></i>Статус обработки</h4>
             </div>
-            <div class="card-body text-center">
-                <div class="mb-3">
-                            {% if stage in ['completed', 'transcribed_only'] %}
-                                <i class="fas fa-check-circle fa-4x text-success"></i>
-                            {% elif stage == 'protocol_error' %}
-                                <i class="fas fa-exclamation-triangle fa-4x text-warning"></i>
-                            {% elif stage == 'transcription_error' %}
-                                <i class="fas fa-exclamation-circle fa-4x text-danger"></i>
-                            {% else %}
-                                <i class="fas fa-cog fa-spin fa-4x text-primary"></i>
-                            {% endif %}
-                        </div>
-
-                        <h5>{{ job.filename }}</h5>
-                        <p class="text-muted">Шаблон: {{ 'без протокола' if job.template == 'none' else job.template }}</p>
+            <div class="card-body text-center" id="jobStatusBody">
+                {% include "_job_actions.html" %}
+            </div>
+        </div>
+    </div>
+{% endblock %}
+{% block scripts %}
+    <script src="{{ static_url('js/app.js') }}" defer></script>
+    <script>
+        document.addEventListener('DOMContentLoaded', function() {
+            initStatusPage({{ job_id|fast_tojson }}, {
+                streaming: {{ 'false' if stage in ['completed', 'transcribed_only', 'protocol_error', 'transcription_error'] else 'true' }},
+                transcriptReady: {{ 'true' if job.transcript_file else 'false' }}
+            });
+        });
+    </script>
+{% endblock %}
+        '''
 
-                        <div class="progress mb-3" style="height: 30px;">
-                            <div class="progress-bar
-                                {% if stage in ['completed', 'transcribed_only'] %}bg-success{% elif stage == 'protocol_error' %}bg-warning{% elif stage == 'transcription_error' %}bg-danger{% else %}bg-primary progress-bar-animated{% endif %}"
-                                style="width: {{ job.progress }}%">
-                                {{ job.progress }}%
-                            </div>
-                        </div>
 
-                        <div class="alert
-                            {% if stage in ['completed', 'transcribed_only'] %}alert-success{% elif stage == 'protocol_error' %}alert-warning{% elif stage == 'transcription_error' %}alert-danger{% else %}alert-info{% endif %}">
-                            {{ job.message }}
-                        </div>
+# Страница просмотра транскрипта или протокола
+_VIEW_HTML = '''
+{% extends "_layout.html" %}
+{% block title %}{{ file_title }}{% endblock %}
+{% block head %}
+    {% if is_markdown %}
+    <link href="{{ static_url('css/markdown.css') }}" rel="stylesheet">
+    {% endif %}
+{% endblock %}
+{% block content %}
+    <div class="container mt-4">
+        <div class="card shadow">
+            <div class="card-header bg-primary text-white d-flex justify-content-between align-items-center">
+                <h4><i class="fas fa-file-alt me-2"></i>{{ file_title }}</h4>
+                <div>
+                    {% if file_type == 'transcript' %}
+                    <a href="/chat/{{ job_id }}" class="btn btn-success btn-sm me-2">
+                        <i class="fas fa-robot me-1"></i>Спросить у ИИ
+                    </a>
+                    {% endif %}
+                    <a href="/download/{{ job_id }}/{{ file_type }}" class="btn btn-light btn-sm me-2">
+                        <i class="fas fa-download me-1"></i>Скачать
+                    </a>
+                    <a href="/status/{{ job_id }}" class="btn btn-outline-light btn-sm">
+                        <i class="fas fa-arrow-left me-1"></i>Назад
+                    </a>
+                </div>
+            </div>
+            <div class="card-body">
+                <div class="mb-3">
+                    <small class="text-muted">
+                        <i class="fas fa-file me-1"></i>Файл: {{ filename }}
+                    </small>
+                </div>
+                
+                {% if is_markdown %}
+                    <div id="markdown-content" class="markdown-content">{{ content_html }}</div>
+                {% else %}
+                    <!-- Текст загружается отдельным запросом: браузер кеширует его по ETag -->
+                    <pre id="file-content" class="bg-light p-3 rounded" style="white-space: pre-wrap; max-height: 70vh; overflow-y: auto;" data-src="/api/raw/{{ job_id }}/{{ file_type }}">Загрузка...</pre>
+                {% endif %}
+            </div>
+        </div>
+    </div>
+{% endblock %}
+{% block scripts %}
+    {% if not is_markdown %}
+    <script>
+        (function() {
+            const pre = document.getElementById('file-content');
+            fetch(pre.dataset.src)
+                .then(response => {
+                    if (!response.ok) {
+                        throw new Error('HTTP ' + response.status);
+                    }
+                    return response.text();
+                })
+                .then(text => { pre.textContent = text; })
+                .catch(error => { pre.textContent = 'Не удалось загрузить файл: ' + error.message; });
+        })();
+    </script>
+    {% endif %}
+{% endblock %}
+        '''
 
-                        {% if job.transcript_file %}
-                            <div class="row mb-3">
-                                <div class="col-md-6">
-                                    <a href="/view/{{ job_id }}/transcript" class="btn btn-outline-info w-100 mb-2">
-                                        <i class="fas fa-eye me-2"></i>Просмотреть транскрипт
-                                    </a>
-                                </div>
-                                <div class="col-md-6">
-                                    <a href="/download/{{ job_id }}/transcript" class="btn btn-outline-primary w-100 mb-2">
-                                        <i class="fas fa-file-alt me-2"></i>Скачать транскрипт
-                                    </a>
-                                </div>
-                            </div>
-                            <div class="row mb-3">
-                                <div class="col-12">
-                                    <a href="/chat/{{ job_id }}" class="btn btn-success w-100 mb-2">
-                                        <i class="fas fa-robot me-2"></i>Спросить у ИИ по транскрипту
-                                    </a>
-                                </div>
-                            </div>
-                        {% endif %}
 
-                        {% if stage in ['completed', 'transcribed_only'] %}
-                            {% if stage == 'completed' %}
-                                <div class="row mb-3">
-                                    <div class="col-md-6">
-                                        <a href="/view/{{ job_id }}/summary" class="btn btn-info w-100 mb-2">
-                                            <i class="fas fa-eye me-2"></i>Просмотреть протокол
-                                        </a>
-                                    </div>
-                                    <div class="col-md-6">
-                                        <a href="/download/{{ job_id }}/summary" class="btn btn-primary w-100 mb-2">
-                                            <i class="fas fa-file-download me-2"></i>Скачать протокол
-                                        </a>
-                                    </div>
-                                </div>
-                            {% endif %}
+# Страница списка задач
+_JOBS_HTML = '''
+{% extends "_layout.html" %}
+{% block title %}Все задачи{% endblock %}
+{% block content %}
+    <div class="container mt-4">
+        <div class="card shadow">
+            <div class="card-header bg-primary text-white">
+                <h4><i class="fas fa-list me-2"></i>{% if is_admin %}Все задачи (администратор){% else %}История обработки файлов{% endif %}</h4>
+            </div>
+            <div class="card-body">
+                {% if jobs %}
+                    <div class="table-responsive">
+                        <table class="table table-hover">
+                            <thead class="table-light">
+                                <tr>
+                                    <th>Файл</th>
+                                    {% if is_admin %}<th>Пользователь</th>{% endif %}
+                                    <th>Шаблон</th>
+                                    <th>Статус</th>
+                                    <th>Прогресс</th>
+                                    <th class="text-nowrap">Дата создания</th>
+                                    <th>Действия</th>
+                                </tr>
+                            </thead>
+                            <tbody>
+                                {{ job_rows }}
+                            </tbody>
+                        </table>
+                    </div>
+                {% else %}
+                    <div class="text-center py-5">
+                        <i class="fas fa-inbox fa-3x text-muted mb-3"></i>
+                        <h5 class="text-muted">Нет обработанных файлов</h5>
+                        <p class="text-muted">Загрузите первый файл для начала работы</p>
+                        <a href="/" class="btn btn-primary">
+                            <i class="fas fa-upload me-2"></i>Загрузить файл
+                        </a>
+                    </div>
+                {% endif %}
+            </div>
+        </div>
+    </div>
+{% endblock %}
+        '''
 
-                            <!-- Форма для генерации протокола -->
-                            <div class="card border-warning mb-3">
-                                <div class="card-header bg-warning text-dark">
-                                    <h6 class="mb-0"><i class="fas fa-magic me-2"></i>{% if stage == 'completed' %}Сгенерировать протокол в другом шаблоне{% else %}Сгенерировать протокол{% endif %}</h6>
-                                </div>
-                                <div class="card-body">
-                                    <form method="POST" action="/generate_protocol/{{ job_id }}">
-                                        <div class="row align-items-end">
-                                            <div class="col-md-5">
-                                                <label for="new_template" class="form-label">Выберите шаблон:</label>
-                                                <select class="form-select" name="new_template" required>
-                                                    {% for template_id, description in templates.items() %}
-                                                        {% if template_id != job.template %}
-                                                            <option value="{{ template_id }}">
-                                                                {{ template_id.title() }} - {{ description }}
-                                                            </option>
-                                                        {% endif %}
-                                                    {% endfor %}
-                                                </select>
-                                            </div>
-                                            <div class="col-md-4">
-                                                <label for="model" class="form-label">Модель:</label>
-                                                <select class="form-select" name="model" required>
-                                                    {% for model_id, description in available_models.items() %}
-                                                        <option value="{{ model_id }}" {% if model_id == current_model %}selected{% endif %}>
-                                                            {{ description }}
-                                                        </option>
-                                                    {% endfor %}
-                                                </select>
-                                            </div>
-                                            <div class="col-md-3">
-                                                <button type="submit" class="btn btn-warning w-100 text-nowrap">
-                                                    <i class="fas fa-cogs me-2"></i>Сгенерировать
-                                                </button>
-                                            </div>
-                                        </div>
-                                        <div class="form-text mt-2">
-                                            <i class="fas fa-info-circle me-1"></i>
-                                            Будет создан новый протокол на основе существующего транскрипта
-                                        </div>
-                                    </form>
-                                </div>
-                            </div>
 
-                            {% if stage == 'completed' %}
-                                <!-- Форма для публикации в Confluence -->
-                                <div class="card border-info mb-3">
-                                    <div class="card-header bg-info text-white">
-                                        <h6 class="mb-0"><i class="fas fa-cloud-upload-alt me-2"></i>Публикация в Confluence</h6>
-                                    </div>
-                                    <div class="card-body">
-                                        <form id="confluenceForm" method="POST" action="/publish_confluence/{{ job_id }}">
-                                            <div class="row">
-                                                <div class="col-md-12 mb-3">
-                                                    <label for="base_page_url" class="form-label">
-                                                        <i class="fas fa-link me-1"></i>URL базовой страницы Confluence <span class="text-danger">*</span>
-                                                    </label>
-                                                    <input type="url" class="form-control" id="base_page_url" name="base_page_url"
-                                                           placeholder="Server: https://wiki.domain.com/pages/viewpage.action?pageId=123456 или https://wiki.domain.com/display/SPACE/PAGE"
-                                                           required>
-                                                    <div class="form-text">
-                                                        <i class="fas fa-info-circle me-1"></i>
-                                                        URL страницы, под которой будет создан протокол встречи
-                                                    </div>
-                                                </div>
-                                            </div>
-                                            <div class="row">
-                                                <div class="col-md-8 mb-3">
-                                                    <label for="page_title" class="form-label">
-                                                        <i class="fas fa-heading me-1"></i>Заголовок страницы
-                                                    </label>
-                                                    <input type="text" class="form-control" id="page_title" name="page_title"
-                                                           placeholder="Автоматически сгенерируется из содержимого">
-                                                    <div class="form-text">
-                                                        Оставьте пустым для автоматической генерации
-                                                    </div>
-                                                </div>
-                                            </div>
-                                            <div class="row">
-                                                <div class="col-md-12">
-                                                    <button type="submit" class="btn btn-info w-100" id="publishBtn">
-                                                        <i class="fas fa-cloud-upload-alt me-2"></i>Опубликовать в Confluence
-                                                    </button>
-                                                </div>
-                                            </div>
-                                        </form>
-
-                                        <!-- Область для отображения результата публикации -->
-                                        <div id="publicationResult" class="mt-3" style="display: none;">
-                                            <div id="publicationAlert" class="alert" role="alert"></div>
-                                        </div>
-
-                                        <!-- История публикаций -->
-                                        <div id="publicationHistory" class="mt-4" style="display: none;">
-                                            <h6><i class="fas fa-history me-2"></i>История публикаций</h6>
-                                            <div id="publicationHistoryContent"></div>
-                                        </div>
-                                    </div>
-                                </div>
-                            {% endif %}
+# Главная страница документации
+_DOCS_INDEX_HTML = '''
+{% extends "_layout.html" %}
+{% block title %}Документация - Meeting Processor{% endblock %}
+{% block content %}
+    <div class="container mt-4">
+        <div class="row">
+            <div class="col-12">
+                <div class="card shadow mb-4">
+                    <div class="card-header bg-info text-white">
+                        <h3><i class="fas fa-book me-2"></i>Документация по проведению встреч</h3>
+                        <p class="mb-0">Руководства для получения качественных протоколов с помощью автоматической транскрибации</p>
+                    </div>
+                </div>
+            </div>
+        </div>
 
-                            <a href="/" class="btn btn-success">
-                                <i class="fas fa-plus me-2"></i>Обработать еще файл
-                            </a>
-                        {% elif stage == 'protocol_error' %}
-                            <!-- Форма для повторной генерации протокола -->
-                            <div class="card border-warning mb-3">
-                                <div class="card-header bg-warning text-dark">
-                                    <h6 class="mb-0"><i class="fas fa-redo me-2"></i>Повторить генерацию протокола</h6>
-                                </div>
-                                <div class="card-body">
-                                    <form method="POST" action="/retry_protocol/{{ job_id }}">
-                                        <div class="row align-items-end">
-                                            <div class="col-md-5">
-                                                <label for="retry_template" class="form-label">Шаблон протокола:</label>
-                                                <select class="form-select" id="retry_template" name="template" required>
-                                                    {% for template_id, description in templates.items() %}
-                                                        <option value="{{ template_id }}" {% if template_id == job.template %}selected{% endif %}>
-                                                            {{ template_id.title() }} - {{ description }}
-                                                        </option>
-                                                    {% endfor %}
-                                                </select>
-                                            </div>
-                                            <div class="col-md-4">
-                                                <label for="retry_model" class="form-label">Модель:</label>
-                                                <select class="form-select" id="retry_model" name="model" required>
-                                                    {% for model_id, description in available_models.items() %}
-                                                        <option value="{{ model_id }}" {% if model_id == current_model %}selected{% endif %}>
-                                                            {{ description }}
-                                                        </option>
-                                                    {% endfor %}
-                                                </select>
-                                            </div>
-                                            <div class="col-md-3">
-                                                <button type="submit" class="btn btn-warning w-100 text-nowrap">
-                                                    <i class="fas fa-redo me-2"></i>Повторить
-                                                </button>
-                                            </div>
-                                        </div>
-                                        <div class="form-text mt-2">
-                                            <i class="fas fa-info-circle me-1"></i>
-                                            Транскрипт уже готов — будет предпринята повторная попытка сгенерировать протокол
-                                        </div>
-                                    </form>
-                                </div>
-                            </div>
-                        {% elif stage == 'transcription_error' %}
-                            <a href="/" class="btn btn-primary">
-                                <i class="fas fa-upload me-2"></i>Попробовать снова
+        <div class="row">
+            {% for doc in docs %}
+            <div class="col-md-4 mb-4">
+                <div class="card h-100 shadow-sm">
+                    <div class="card-body">
+                        <div class="text-center mb-3">
+                            <i class="fas {{ doc.icon }} fa-3x text-{{ doc.color }}"></i>
+                        </div>
+                        <h5 class="card-title text-center">{{ doc.card_title }}</h5>
+                        <p class="card-text">{{ doc.summary }}</p>
+                        <div class="text-center">
+                            <a href="/docs/{{ doc.name }}" target="_blank" class="btn btn-{{ doc.color }}">
+                                <i class="fas fa-external-link-alt me-2"></i>Открыть
                             </a>
-                        {% endif %}
+                        </div>
                     </div>
                 </div>
-    </div>
-
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
-    <script>
-        {% if stage not in ['completed', 'transcribed_only', 'protocol_error', 'transcription_error'] %}
-            const initialTranscriptReady = {{ 'true' if job.transcript_file else 'false' }};
-            const statusPollId = setInterval(function() {
-                fetch('/api/status/{{ job_id }}')
-                    .then(response => response.json())
-                    .then(data => {
-                        if (data.status === 'completed' || data.status === 'error' || (!initialTranscriptReady && data.transcript_ready)) {
-                            clearInterval(statusPollId);
-                            location.reload();
-                        } else {
-                            const progressBar = document.querySelector('.progress-bar');
-                            const alertDiv = document.querySelector('.alert');
-
-                            progressBar.style.width = data.progress + '%';
-                            progressBar.textContent = data.progress + '%';
-                            alertDiv.textContent = data.message;
-                        }
-                    })
-                    .catch(error => console.error('Ошибка обновления статуса:', error));
-            }, 2000);
-        {% endif %}
+            </div>
+            {% endfor %}
+        </div>
 
-        {% if stage == 'completed' %}
-        // Confluence publication functionality
-        document.addEventListener('DOMContentLoaded', function() {
-            const confluenceForm = document.getElementById('confluenceForm');
-            const basePageUrlInput = document.getElementById('base_page_url');
-            const pageTitleInput = document.getElementById('page_title');
-            const publishBtn = document.getElementById('publishBtn');
-            const publicationResult = document.getElementById('publicationResult');
-            const publicationAlert = document.getElementById('publicationAlert');
-            
-            // Validate URL format when input changes
-            basePageUrlInput.addEventListener('input', function() {
-                const url = this.value;
-                validateConfluenceUrl(url);
-            });
-            
-            // Auto-generate page title if empty
-            pageTitleInput.addEventListener('focus', function() {
-                if (!this.value) {
-                    const today = new Date();
-                    const dateStr = today.getFullYear() +
-                                  String(today.getMonth() + 1).padStart(2, '0') +
-                                  String(today.getDate()).padStart(2, '0');
-                    this.placeholder = dateStr + ' - Протокол встречи';
-                }
-            });
-            
-            function validateConfluenceUrl(url) {
-                // Confluence Server формат 1: https://wiki.domain.com/pages/viewpage.action?pageId=123456
-                const serverPattern1 = /^https?:\/\/[^\/]+\/pages\/viewpage\.action\?pageId=\d+/;
-                
-                // Confluence Server формат 2: https://wiki.domain.com/display/SPACE/PAGE
-                const serverPattern2 = /^https?:\/\/[^\/]+\/display\/[^\/]+\/[^\/]+/;
-                
-                // Confluence Cloud формат: https://domain.atlassian.net/wiki/spaces/SPACE/pages/123456/Page+Title
-                const cloudPattern = /^https?:\/\/[^\/]+\.atlassian\.net\/wiki\/spaces\/[^\/]+\/pages\/\d+/;
-                
-                const isServer1 = serverPattern1.test(url);
-                const isServer2 = serverPattern2.test(url);
-                const isCloud = cloudPattern.test(url);
-                const isValid = isServer1 || isServer2 || isCloud;
-                
-                if (url && !isValid) {
-                    basePageUrlInput.classList.add('is-invalid');
-                    if (!document.querySelector('.invalid-feedback')) {
-                        const feedback = document.createElement('div');
-                        feedback.className = 'invalid-feedback';
-                        feedback.textContent = 'Неверный формат URL Confluence. Поддерживаются форматы:\n• Cloud: https://domain.atlassian.net/wiki/spaces/SPACE/pages/123456/Page+Title\n• Server: https://wiki.domain.com/pages/viewpage.action?pageId=123456\n• Server: https://wiki.domain.com/display/SPACE/PAGE';
-                        basePageUrlInput.parentNode.appendChild(feedback);
-                    }
-                } else {
-                    basePageUrlInput.classList.remove('is-invalid');
-                    const feedback = document.querySelector('.invalid-feedback');
-                    if (feedback) {
-                        feedback.remove();
-                    }
-                }
-                
-                return isValid;
-            }
-            
-            // Handle form submission
-            confluenceForm.addEventListener('submit', function(e) {
-                e.preventDefault();
-                
-                const basePageUrl = basePageUrlInput.value.trim();
-                if (!basePageUrl) {
-                    showAlert('Пожалуйста, укажите URL базовой страницы', 'danger');
-                    return;
-                }
-                
-                if (!validateConfluenceUrl(basePageUrl)) {
-                    showAlert('Неверный формат URL Confluence', 'danger');
-                    return;
-                }
-                
-                // Show loading state
-                publishBtn.disabled = true;
-                publishBtn.innerHTML = '<i class="fas fa-spinner fa-spin me-2"></i>Публикация...';
-                
-                // Prepare form data
-                const formData = new FormData(this);
-                
-                // Auto-generate title if empty
-                if (!pageTitleInput.value.trim()) {
-                    const today = new Date();
-                    const dateStr = today.getFullYear() +
-                                  String(today.getMonth() + 1).padStart(2, '0') +
-                                  String(today.getDate()).padStart(2, '0');
-                    formData.set('page_title', dateStr + ' - Протокол встречи');
-                }
-                
-                // Submit via AJAX
-                fetch(this.action, {
-                    method: 'POST',
-                    body: formData,
-                    headers: {
-                        'X-Requested-With': 'XMLHttpRequest'
-                    }
-                })
-                .then(response => response.json())
-                .then(data => {
-                    if (data.success) {
-                        showAlert(
-                            '<i class="fas fa-check-circle me-2"></i>' +
-                            'Протокол успешно опубликован в Confluence! ' +
-                            '<a href="' + data.page_url + '" target="_blank" class="alert-link">' +
-                            '<i class="fas fa-external-link-alt me-1"></i>Открыть страницу</a>',
-                            'success'
-                        );
-                        loadPublicationHistory();
-                    } else {
-                        showAlert(
-                            '<i class="fas fa-exclamation-triangle me-2"></i>' +
-                            'Ошибка публикации: ' + (data.error || 'Неизвестная ошибка'),
-                            'danger'
-                        );
-                    }
-                })
-                .catch(error => {
-                    console.error('Publication error:', error);
-                    showAlert(
-                        '<i class="fas fa-exclamation-triangle me-2"></i>' +
-                        'Ошибка сети при публикации',
-                        'danger'
-                    );
-                })
-                .finally(() => {
-                    // Reset button state
-                    publishBtn.disabled = false;
-                    publishBtn.innerHTML = '<i class="fas fa-cloud-upload-alt me-2"></i>Опубликовать в Confluence';
-                });
-            });
-            
-            function showAlert(message, type) {
-                publicationAlert.className = 'alert alert-' + type;
-                publicationAlert.innerHTML = message;
-                publicationResult.style.display = 'block';
-                
-                // Auto-hide success messages after 10 seconds
-                if (type === 'success') {
-                    setTimeout(() => {
-                        publicationResult.style.display = 'none';
-                    }, 10000);
-                }
-            }
-            
-            function loadPublicationHistory() {
-                console.log('🔍 DEBUG: Loading publication history for job {{ job_id }}');
-                fetch('/confluence_publications/{{ job_id }}')
-                    .then(response => {
-                        console.log('🔍 DEBUG: Publication history response status:', response.status);
-                        return response.json();
-                    })
-                    .then(data => {
-                        console.log('🔍 DEBUG: Publication history data:', data);
-                        if (data.publications && data.publications.length > 0) {
-                            console.log('🔍 DEBUG: Displaying', data.publications.length, 'publications');
-                            displayPublicationHistory(data.publications);
-                        } else {
-                            console.log('🔍 DEBUG: No publications found or empty array');
-                        }
-                    })
-                    .catch(error => {
-                        console.error('🔍 DEBUG: Error loading publication history:', error);
-                    });
-            }
-            
-            function displayPublicationHistory(publications) {
-                const historyContent = document.getElementById('publicationHistoryContent');
-                const historySection = document.getElementById('publicationHistory');
-                
-                let html = '<div class="list-group list-group-flush">';
-                publications.forEach(pub => {
-                    const date = new Date(pub.created_at).toLocaleString('ru-RU');
-                    const statusClass = pub.status === 'published' ? 'success' : 'danger';
-                    const statusIcon = pub.status === 'published' ? 'check-circle' : 'exclamation-circle';
-                    
-                    html += `
-                        <div class="list-group-item">
-                            <div class="d-flex justify-content-between align-items-start">
-                                <div>
-                                    <h6 class="mb-1">
-                                        <i class="fas fa-${statusIcon} text-${statusClass} me-2"></i>
-                                        ${pub.page_title || 'Протокол встречи'}
-                                    </h6>
-                                    <p class="mb-1 text-muted small">
-                                        <i class="fas fa-calendar me-1"></i>${date}
-                                        <i class="fas fa-folder ms-3 me-1"></i>${pub.space_key || 'N/A'}
-                                    </p>
-                                </div>
-                                <div>
-                                    ${pub.page_url ?
-                                        `<a href="${pub.page_url}" target="_blank" class="btn btn-sm btn-outline-primary">
-                                            <i class="fas fa-external-link-alt me-1"></i>Открыть
-                                        </a>` :
-                                        '<span class="badge bg-danger">Ошибка</span>'
-                                    }
-                                </div>
-                            </div>
-                            ${pub.error_message ?
-                                `<small class="text-danger">
-                                    <i class="fas fa-exclamation-triangle me-1"></i>${pub.error_message}
-                                </small>` :
-                                ''
-                            }
-                        </div>
-                    `;
-                });
-                html += '</div>';
-                
-                historyContent.innerHTML = html;
-                historySection.style.display = 'block';
-            }
-            
-            // Load publication history on page load
-            loadPublicationHistory();
-        });
-        {% endif %}
-    </script>
-</body>
-</html>
-        '''
-    
-    def get_view_template(self):
-        """Возвращает HTML шаблон для просмотра файлов"""
-        return '''
-<!DOCTYPE html>
-<html lang="ru">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{{ file_title }}</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
-    {% if is_markdown %}
-    <script src="https://cdn.jsdelivr.net/npm/marked/marked.min.js"></script>
-    <style>
-        .markdown-content {
-            line-height: 1.6;
-        }
-        .markdown-content h1, .markdown-content h2, .markdown-content h3 {
-            color: #0d6efd;
-            margin-top: 1.5rem;
-            margin-bottom: 0.5rem;
-        }
-        .markdown-content ul, .markdown-content ol {
-            margin-bottom: 1rem;
-        }
-        .markdown-content li {
-            margin-bottom: 0.25rem;
-        }
-        .markdown-content code {
-            background-color: #f8f9fa;
-            padding: 0.125rem 0.25rem;
-            border-radius: 0.25rem;
-        }
-        .markdown-content blockquote {
-            border-left: 4px solid #0d6efd;
-            padding-left: 1rem;
-            margin: 1rem 0;
-            background-color: #f8f9fa;
-            padding: 0.5rem 1rem;
-        }
-    </style>
-    {% endif %}
-</head>
-<body class="bg-light">
-    <nav class="navbar navbar-dark bg-primary">
-        <div class="container">
-            <a class="navbar-brand" href="/"><i class="fas fa-microphone me-2"></i>Meeting Processor</a>
-            <div class="navbar-nav d-flex flex-row">
-                <a class="nav-link me-3" href="/"><i class="fas fa-home me-1"></i>Главная</a>
-                <a class="nav-link me-3" href="/jobs"><i class="fas fa-list me-1"></i>Все задачи</a>
-                <a class="nav-link me-3" href="/docs"><i class="fas fa-book me-1"></i>Документация</a>
-                <a class="nav-link" href="/statistics"><i class="fas fa-chart-bar me-1"></i>Статистика</a>
+        <div class="row mt-4">
+            <div class="col-12">
+                <div class="card border-primary">
+                    <div class="card-header bg-primary text-white">
+                        <h5><i class="fas fa-lightbulb me-2"></i>Ключевые принципы</h5>
+                    </div>
+                    <div class="card-body">
+                        <div class="row">
+                            <div class="col-md-4">
+                                <h6><i class="fas fa-microphone text-primary me-2"></i>Главное правило</h6>
+                                <p class="small">Представление участников в начале встречи - КРИТИЧНО!</p>
+                            </div>
+                            <div class="col-md-4">
+                                <h6><i class="fas fa-comments text-success me-2"></i>Правила речи</h6>
+                                <p class="small">Четко говорить, делать паузы, называть себя при выступлении</p>
+                            </div>
+                            <div class="col-md-4">
+                                <h6><i class="fas fa-file-audio text-info me-2"></i>Техническая основа</h6>
+                                <p class="small">MP3, WAV, M4A, AAC (до 25МБ), 256 kbps, 44.1 kHz</p>
+                            </div>
+                        </div>
+                    </div>
+                </div>
             </div>
         </div>
-    </nav>
 
+        <div class="row mt-4">
+            <div class="col-12">
+                <div class="alert alert-info">
+                    <h6><i class="fas fa-info-circle me-2"></i>Как использовать документацию</h6>
+                    <ul class="mb-0">
+                        <li><strong>Новичкам:</strong> Начните с быстрого чек-листа, затем изучите полное руководство</li>
+                        <li><strong>Опытным пользователям:</strong> Используйте техническое руководство для настройки</li>
+                    </ul>
+                </div>
+            </div>
+        </div>
+    </div>
+{% endblock %}
+'''
+
+# Страница просмотра документа
+_DOCS_VIEW_HTML = '''
+{% extends "_layout.html" %}
+{% block title %}{{ doc_title }} - Meeting Processor{% endblock %}
+{% block styles %}
+    {{ super() }}
+    <link href="{{ static_url('css/docs-view.css') }}" rel="stylesheet">
+    <link rel="modulepreload" href="{{ static_url('js/docs-view.mjs') }}">
+{% endblock %}
+{% block nav %}
+    <!-- Когда метка уходит за верх экрана, показывается кнопка "Наверх" -->
+    <div id="scroll-sentinel"></div>
+    {% with nav_class='sticky-top' %}{% include "_nav.html" %}{% endwith %}
+{% endblock %}
+{% block content %}
     <div class="container mt-4">
         <div class="card shadow">
-            <div class="card-header bg-primary text-white d-flex justify-content-between align-items-center">
-                <h4><i class="fas fa-file-alt me-2"></i>{{ file_title }}</h4>
+            <div class="card-header bg-info text-white d-flex justify-content-between align-items-center">
+                <h4><i class="fas fa-book me-2"></i>{{ doc_title }}</h4>
                 <div>
-                    {% if file_type == 'transcript' %}
-                    <a href="/chat/{{ job_id }}" class="btn btn-success btn-sm me-2">
-                        <i class="fas fa-robot me-1"></i>Спросить у ИИ
-                    </a>
-                    {% endif %}
-                    <a href="/download/{{ job_id }}/{{ file_type }}" class="btn btn-light btn-sm me-2">
-                        <i class="fas fa-download me-1"></i>Скачать
-                    </a>
-                    <a href="/status/{{ job_id }}" class="btn btn-outline-light btn-sm">
-                        <i class="fas fa-arrow-left me-1"></i>Назад
-                    </a>
+                    <button type="button" data-action="print" class="btn btn-light btn-sm me-2">
+                        <i class="fas fa-print me-1"></i>Печать
+                    </button>
+                    <button type="button" data-action="toggle-toc" class="btn btn-outline-light btn-sm">
+                        <i class="fas fa-list me-1"></i>Содержание
+                    </button>
                 </div>
             </div>
             <div class="card-body">
-                <div class="mb-3">
-                    <small class="text-muted">
-                        <i class="fas fa-file me-1"></i>Файл: {{ filename }}
-                    </small>
+                <!-- Содержание (скрыто по умолчанию) -->
+                <div id="toc" class="toc" hidden>
+                    <h6><i class="fas fa-list me-2"></i>Содержание</h6>
+                    <div id="toc-content">{{ toc }}</div>
                 </div>
                 
-                {% if is_markdown %}
-                    <div id="markdown-content" class="markdown-content"></div>
-                    <script>
-                        const markdownText = {{ content|tojson }};
-                        document.getElementById('markdown-content').innerHTML = marked.parse(markdownText);
-                    </script>
-                {% else %}
-                    <pre class="bg-light p-3 rounded" style="white-space: pre-wrap; max-height: 70vh; overflow-y: auto;">{{ content }}</pre>
-                {% endif %}
+                <!-- Основной контент -->
+                <div id="markdown-content" class="markdown-content">{{ content_html }}</div>
             </div>
         </div>
     </div>
 
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
-</body>
-</html>
-        '''
+    <!-- Кнопка "Наверх" -->
+    <button type="button" data-action="scroll-top" class="btn btn-primary back-to-top" title="Наверх">
+        <i class="fas fa-arrow-up"></i>
+    </button>
 
-    def get_chat_template(self):
-        """Возвращает HTML шаблон страницы чата с ИИ по транскрипту"""
+    <!-- Уведомление о скопированной ссылке: один элемент, который только показывается и скрывается -->
+    <div id="copy-toast" class="alert alert-success position-fixed" role="status" hidden>
+        <i class="fas fa-check me-2"></i>Ссылка скопирована!
+    </div>
+{% endblock %}
+{% block scripts %}
+    <script type="module">
+        import { init } from '{{ static_url('js/docs-view.mjs') }}';
+        init();
+    </script>
+{% endblock %}
+'''
+
+
+class WebTemplates:
+    """Класс для хранения HTML шаблонов веб-приложения"""
+
+    def get_loader(self):
+        """Возвращает загрузчик шаблонов, которые рендерятся по имени и компилируются один раз"""
+        return DictLoader({
+            '_layout.html': self.get_layout_template(),
+            '_nav.html': self.get_nav_template(),
+            '_job_actions.html': self.get_job_actions_template(),
+            'index.html': self.get_index_template(),
+            'status.html': self.get_status_template(),
+            'view.html': self.get_view_template(),
+            'chat.html': self.get_chat_template(),
+            'jobs.html': self.get_jobs_template(),
+            'statistics.html': self.get_statistics_template(),
+            'docs_index.html': self.get_docs_index_template(),
+            'docs_view.html': self.get_docs_view_template(),
+        })
+
+    @staticmethod
+    @_minified
+    def get_layout_template():
+        """Возвращает общий каркас страниц: <head>, навигация и подключение скриптов"""
         return '''
 <!DOCTYPE html>
 <html lang="ru">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Чат с ИИ — {{ filename }}</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
-    <script src="https://cdn.jsdelivr.net/npm/marked/marked.min.js"></script>
-    <style>
-        html, body { height: 100%; }
-        body { background-color: #f8f9fa; display: flex; flex-direction: column; height: 100vh; overflow: hidden; }
-        .chat-shell { flex: 1 1 auto; min-height: 0; width: 100%; max-width: 900px; margin: 0 auto; padding: 1rem; display: flex; flex-direction: column; }
-        .chat-card { flex: 1; display: flex; flex-direction: column; min-height: 0; }
-        .chat-log { flex: 1; overflow-y: auto; padding: 1rem; background: #fff; }
-        .chat-msg { display: flex; margin-bottom: 0.75rem; }
-        .chat-msg-user { justify-content: flex-end; }
-        .chat-msg-assistant { justify-content: flex-start; }
-        .msg-col { display: flex; flex-direction: column; max-width: 80%; }
-        .chat-msg-user .msg-col { align-items: flex-end; }
-        .chat-msg > .chat-bubble { max-width: 80%; }
-        .chat-bubble {
-            max-width: 100%; padding: 0.6rem 0.9rem; border-radius: 1rem;
-            line-height: 1.5; word-wrap: break-word; overflow-wrap: anywhere;
-        }
-        .chat-msg-user .chat-bubble { background: #0d6efd; color: #fff; border-bottom-right-radius: 0.25rem; }
-        .chat-msg-assistant .chat-bubble { background: #f1f3f5; color: #212529; border-bottom-left-radius: 0.25rem; }
-        .chat-bubble p:last-child { margin-bottom: 0; }
-        .chat-bubble pre { background: #e9ecef; padding: 0.5rem; border-radius: 0.35rem; overflow-x: auto; }
-        .chat-bubble code { background: #e9ecef; padding: 0.1rem 0.3rem; border-radius: 0.25rem; }
-        .chat-bubble table { border-collapse: collapse; }
-        .chat-bubble th, .chat-bubble td { border: 1px solid #ced4da; padding: 0.25rem 0.5rem; }
-        .chat-error { color: #842029; background: #f8d7da; border: 1px solid #f5c2c7; }
-        .chat-empty { color: #6c757d; text-align: center; padding: 2rem 1rem; }
-        .cached-badge { font-size: 0.7rem; color: #6c757d; }
-        .msg-actions { margin-top: 0.25rem; }
-        .copy-btn { font-size: 0.72rem; padding: 0.1rem 0.45rem; line-height: 1.3; }
-        .typing span { display: inline-block; width: 6px; height: 6px; margin: 0 1px; background: #adb5bd; border-radius: 50%; animation: blink 1.2s infinite both; }
-        .typing span:nth-child(2) { animation-delay: 0.2s; }
-        .typing span:nth-child(3) { animation-delay: 0.4s; }
-        @keyframes blink { 0%, 80%, 100% { opacity: 0.2; } 40% { opacity: 1; } }
-        #chat-input { resize: none; min-height: 84px; max-height: 200px; }
-    </style>
+    <title>{% block title %}Meeting Processor{% endblock %}</title>
+    {% block styles %}
+    {{ asset_styles }}
+    <!-- Иконки: только используемые контуры Font Awesome, без CSS и шрифтов всей библиотеки -->
+    <link href="{{ static_url('css/icons.css') }}" rel="stylesheet">
+    {% endblock %}
+    {% block head %}{% endblock %}
 </head>
-<body>
+<body class="{% block body_class %}bg-light{% endblock %}">
+    {% block nav %}{% include "_nav.html" %}{% endblock %}
+    {% block content %}{% endblock %}
+    {% block vendor_scripts %}{{ asset_scripts }}{% endblock %}
+    {% block scripts %}{% endblock %}
+</body>
+</html>
+        '''
+
+    @staticmethod
+    @_minified
+    def get_nav_template():
+        """Возвращает HTML навигационной панели"""
+        return '''
+<nav class="navbar navbar-dark bg-primary{% if nav_class %} {{ nav_class }}{% endif %}">
+    <div class="container">
+        <a class="navbar-brand" href="/"><i class="fas fa-microphone me-2"></i>Meeting Processor</a>
+        <div class="navbar-nav d-flex flex-row">
+            <a class="nav-link me-3" href="/"><i class="fas fa-home me-1"></i>Главная</a>
+            <a class="nav-link me-3" href="/jobs"><i class="fas fa-list me-1"></i>Все задачи</a>
+            <a class="nav-link me-3" href="/docs"><i class="fas fa-book me-1"></i>Документация</a>
+            <a class="nav-link" href="/statistics"><i class="fas fa-chart-bar me-1"></i>Статистика</a>
+        </div>
+    </div>
+</nav>
+        '''
+
+    @staticmethod
+    @_minified
+    def get_index_template():
+        """Возвращает HTML шаблон главной страницы"""
+        return _INDEX_HTML
+    
+    @staticmethod
+    @_minified
+    def get_status_template():
+        """Возвращает HTML шаблон страницы статуса"""
+        return _STATUS_HTML
+    
+    @staticmethod
+    @_minified
+    def get_job_actions_template():
+        """Возвращает HTML карточки статуса задачи: этап, прогресс и доступные действия"""
+        return '''
+<div class="mb-3">
+    {{ stage_display.icon }}
+</div>
+
+<h5>{{ job.filename }}</h5>
+<p class="text-muted">Шаблон: {{ 'без протокола' if job.template == 'none' else job.template }}</p>
+
+<div class="progress mb-3" style="height: 30px;">
+    <div class="progress-bar {{ stage_display.progress_class }}"
+        style="width: {{ job.progress|fast_int }}%">
+        {{ job.progress|fast_int }}%
+    </div>
+</div>
+
+<div class="alert {{ stage_display.alert_class }}">
+    {{ job.message }}
+</div>
+
+{% if job.transcript_file %}
+    <div class="row mb-3">
+        <div class="col-md-6">
+            <a href="/view/{{ job_id }}/transcript" class="btn btn-outline-info w-100 mb-2">
+                <i class="fas fa-eye me-2"></i>Просмотреть транскрипт
+            </a>
+        </div>
+        <div class="col-md-6">
+            <a href="/download/{{ job_id }}/transcript" class="btn btn-outline-primary w-100 mb-2">
+                <i class="fas fa-file-alt me-2"></i>Скачать транскрипт
+            </a>
+        </div>
+    </div>
+    <div class="row mb-3">
+        <div class="col-12">
+            <a href="/chat/{{ job_id }}" class="btn btn-success w-100 mb-2">
+                <i class="fas fa-robot me-2"></i>Спросить у ИИ по транскрипту
+            </a>
+        </div>
+    </div>
+{% endif %}
+
+{% if stage in ['completed', 'transcribed_only'] %}
+    {% if stage == 'completed' %}
+        <div class="row mb-3">
+            <div class="col-md-6">
+                <a href="/view/{{ job_id }}/summary" class="btn btn-info w-100 mb-2">
+                    <i class="fas fa-eye me-2"></i>Просмотреть протокол
+                </a>
+            </div>
+            <div class="col-md-6">
+                <a href="/download/{{ job_id }}/summary" class="btn btn-primary w-100 mb-2">
+                    <i class="fas fa-file-download me-2"></i>Скачать протокол
+                </a>
+            </div>
+        </div>
+    {% endif %}
+
+    <!-- Форма для генерации протокола -->
+    <div class="card border-warning mb-3">
+        <div class="card-header bg-warning text-dark">
+            <h6 class="mb-0"><i class="fas fa-magic me-2"></i>{% if stage == 'completed' %}Сгенерировать протокол в другом шаблоне{% else %}Сгенерировать протокол{% endif %}</h6>
+        </div>
+        <div class="card-body">
+            <form method="POST" action="/generate_protocol/{{ job_id }}">
+                <div class="row align-items-end">
+                    <div class="col-md-5">
+                        <label for="new_template" class="form-label">Выберите шаблон:</label>
+                        <select class="form-select" name="new_template" required>
+                            {{ other_template_options }}
+                        </select>
+                    </div>
+                    <div class="col-md-4">
+                        <label for="model" class="form-label">Модель:</label>
+                        <select class="form-select" name="model" required>
+                            {% for model_id, description in available_models.items() %}
+                                <option value="{{ model_id }}" {% if model_id == current_model %}selected{% endif %}>
+                                    {{ description }}
+                                </option>
+                            {% endfor %}
+                        </select>
+                    </div>
+                    <div class="col-md-3">
+                        <button type="submit" class="btn btn-warning w-100 text-nowrap">
+                            <i class="fas fa-cogs me-2"></i>Сгенерировать
+                        </button>
+                    </div>
+                </div>
+                <div class="form-text mt-2">
+                    <i class="fas fa-info-circle me-1"></i>
+                    Будет создан новый протокол на основе существующего транскрипта
+                </div>
+            </form>
+        </div>
+    </div>
+
+    {% if stage == 'completed' %}
+        <!-- Форма для публикации в Confluence -->
+        <div class="card border-info mb-3">
+            <div class="card-header bg-info text-white">
+                <h6 class="mb-0"><i class="fas fa-cloud-upload-alt me-2"></i>Публикация в Confluence</h6>
+            </div>
+            <div class="card-body">
+                <form id="confluenceForm" method="POST" action="/publish_confluence/{{ job_id }}">
+                    <div class="row">
+                        <div class="col-md-12 mb-3">
+                            <label for="base_page_url" class="form-label">
+                                <i class="fas fa-link me-1"></i>URL базовой страницы Confluence <span class="text-danger">*</span>
+                            </label>
+                            <input type="url" class="form-control" id="base_page_url" name="base_page_url"
+                                   placeholder="Server: https://wiki.domain.com/pages/viewpage.action?pageId=123456 или https://wiki.domain.com/display/SPACE/PAGE"
+                                   required>
+                            <div class="form-text">
+                                <i class="fas fa-info-circle me-1"></i>
+                                URL страницы, под которой будет создан протокол встречи
+                            </div>
+                        </div>
+                    </div>
+                    <div class="row">
+                        <div class="col-md-8 mb-3">
+                            <label for="page_title" class="form-label">
+                                <i class="fas fa-heading me-1"></i>Заголовок страницы
+                            </label>
+                            <input type="text" class="form-control" id="page_title" name="page_title"
+                                   placeholder="Автоматически сгенерируется из содержимого">
+                            <div class="form-text">
+                                Оставьте пустым для автоматической генерации
+                            </div>
+                        </div>
+                    </div>
+                    <div class="row">
+                        <div class="col-md-12">
+                            <button type="submit" class="btn btn-info w-100" id="publishBtn">
+                                <i class="fas fa-cloud-upload-alt me-2"></i>Опубликовать в Confluence
+                            </button>
+                        </div>
+                    </div>
+                </form>
+
+                <!-- Область для отображения результата публикации -->
+                <div id="publicationResult" class="mt-3" style="display: none;">
+                    <div id="publicationAlert" class="alert" role="alert"></div>
+                </div>
+
+                <!-- История публикаций -->
+                <div id="publicationHistory" class="mt-4" style="display: none;">
+                    <h6><i class="fas fa-history me-2"></i>История публикаций</h6>
+                    <div id="publicationHistoryContent"></div>
+                </div>
+            </div>
+        </div>
+    {% endif %}
+
+    <a href="/" class="btn btn-success">
+        <i class="fas fa-plus me-2"></i>Обработать еще файл
+    </a>
+{% elif stage == 'protocol_error' %}
+    <!-- Форма для повторной генерации протокола -->
+    <div class="card border-warning mb-3">
+        <div class="card-header bg-warning text-dark">
+            <h6 class="mb-0"><i class="fas fa-redo me-2"></i>Повторить генерацию протокола</h6>
+        </div>
+        <div class="card-body">
+            <form method="POST" action="/retry_protocol/{{ job_id }}">
+                <div class="row align-items-end">
+                    <div class="col-md-5">
+                        <label for="retry_template" class="form-label">Шаблон протокола:</label>
+                        <select class="form-select" id="retry_template" name="template" required>
+                            {{ retry_template_options }}
+                        </select>
+                    </div>
+                    <div class="col-md-4">
+                        <label for="retry_model" class="form-label">Модель:</label>
+                        <select class="form-select" id="retry_model" name="model" required>
+                            {% for model_id, description in available_models.items() %}
+                                <option value="{{ model_id }}" {% if model_id == current_model %}selected{% endif %}>
+                                    {{ description }}
+                                </option>
+                            {% endfor %}
+                        </select>
+                    </div>
+                    <div class="col-md-3">
+                        <button type="submit" class="btn btn-warning w-100 text-nowrap">
+                            <i class="fas fa-redo me-2"></i>Повторить
+                        </button>
+                    </div>
+                </div>
+                <div class="form-text mt-2">
+                    <i class="fas fa-info-circle me-1"></i>
+                    Транскрипт уже готов — будет предпринята повторная попытка сгенерировать протокол
+                </div>
+            </form>
+        </div>
+    </div>
+{% elif stage == 'transcription_error' %}
+    <a href="/" class="btn btn-primary">
+        <i class="fas fa-upload me-2"></i>Попробовать снова
+    </a>
+{% endif %}
+        '''
+
+    @staticmethod
+    @_minified
+    def get_view_template():
+        """Возвращает HTML шаблон для просмотра файлов"""
+        return _VIEW_HTML
+
+    @staticmethod
+    @_minified
+    def get_chat_template():
+        """Возвращает HTML шаблон страницы чата с ИИ по транскрипту"""
+        return '''
+{% extends "_layout.html" %}
+{% block title %}Чат с ИИ — {{ filename }}{% endblock %}
+{% block head %}
+    <link href="{{ static_url('css/chat.css') }}" rel="stylesheet">
+{% endblock %}
+{% block body_class %}{% endblock %}
+{% block nav %}
     <nav class="navbar navbar-dark bg-primary">
         <div class="container">
             <a class="navbar-brand" href="/"><i class="fas fa-microphone me-2"></i>Meeting Processor</a>
@@ -869,7 +1081,8 @@ class WebTemplates:
             </div>
         </div>
     </nav>
-
+{% endblock %}
+{% block content %}
     <div class="chat-shell">
         <div class="card shadow chat-card">
             <div class="card-header bg-primary text-white">
@@ -909,7 +1122,10 @@ class WebTemplates:
             </div>
         </div>
     </div>
-
+{% endblock %}
+{# Bootstrap JS странице чата не нужен #}
+{% block vendor_scripts %}{% endblock %}
+{% block scripts %}
     <script>
         var jobId = "{{ job_id }}";
         var messages = [];
@@ -925,9 +1141,21 @@ class WebTemplates:
             input.style.height = Math.min(input.scrollHeight, 200) + 'px';
         }
 
+        // При наборе текста высота пересчитывается (с принудительным layout) не чаще раза за кадр
+        var growPending = false;
+        function scheduleAutoGrow() {
+            if (growPending) return;
+            growPending = true;
+            requestAnimationFrame(function () {
+                growPending = false;
+                autoGrow();
+            });
+        }
+
         function scrollToBottom() { chatLog.scrollTop = chatLog.scrollHeight; }
 
-        function addBubble(role, content, isMarkdown) {
+        // html — ответ модели, уже отрендеренный сервером из Markdown (сырой HTML модели не пропускается)
+        function addBubble(role, content, isHtml) {
             if (emptyState && emptyState.parentNode) emptyState.style.display = 'none';
             var wrap = document.createElement('div');
             wrap.className = 'chat-msg ' + (role === 'user' ? 'chat-msg-user' : 'chat-msg-assistant');
@@ -935,7 +1163,7 @@ class WebTemplates:
             col.className = 'msg-col';
             var bubble = document.createElement('div');
             bubble.className = 'chat-bubble';
-            if (isMarkdown) { bubble.innerHTML = marked.parse(content || ''); }
+            if (isHtml) { bubble.innerHTML = content || ''; }
             else { bubble.textContent = content; }
             col.appendChild(bubble);
             wrap.appendChild(col);
@@ -1043,175 +1271,82 @@ class WebTemplates:
                     addError(data.error || ('Ошибка сервера (' + resp.status + ')'));
                 } else {
                     messages.push({ role: 'assistant', content: data.reply });
-                    var wrap = addBubble('assistant', data.reply, true);
+                    var wrap = addBubble('assistant', data.html, true);
                     attachAssistantActions(wrap, data.reply, data.cached);
                 }
-            } catch (e) {
-                typing.remove();
-                userWrap.remove();
-                messages.pop();
-                input.value = text;
-                autoGrow();
-                addError('Не удалось связаться с сервером');
-            } finally {
-                sendBtn.disabled = false;
-                input.focus();
-            }
-        }
-
-        sendBtn.addEventListener('click', sendMessage);
-        input.addEventListener('input', autoGrow);
-        input.addEventListener('keydown', function (e) {
-            if (e.key === 'Enter' && !e.shiftKey) { e.preventDefault(); sendMessage(); }
-        });
-
-        clearBtn.addEventListener('click', function () {
-            if (!messages.length) return;
-            if (!confirm('Очистить историю диалога?')) return;
-            messages = [];
-            chatLog.innerHTML = '';
-            chatLog.appendChild(emptyState);
-            emptyState.style.display = '';
-        });
-
-        input.focus();
-    </script>
-</body>
-</html>
-        '''
-
-    def get_jobs_template(self):
-        """Возвращает HTML шаблон списка задач"""
-        return '''
-<!DOCTYPE html>
-<html lang="ru">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Все задачи</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
-</head>
-<body class="bg-light">
-    <nav class="navbar navbar-dark bg-primary">
-        <div class="container">
-            <a class="navbar-brand" href="/"><i class="fas fa-microphone me-2"></i>Meeting Processor</a>
-            <div class="navbar-nav d-flex flex-row">
-                <a class="nav-link me-3" href="/"><i class="fas fa-home me-1"></i>Главная</a>
-                <a class="nav-link me-3" href="/jobs"><i class="fas fa-list me-1"></i>Все задачи</a>
-                <a class="nav-link me-3" href="/docs"><i class="fas fa-book me-1"></i>Документация</a>
-                <a class="nav-link" href="/statistics"><i class="fas fa-chart-bar me-1"></i>Статистика</a>
-            </div>
-        </div>
-    </nav>
-
-    <div class="container mt-4">
-        <div class="card shadow">
-            <div class="card-header bg-primary text-white">
-                <h4><i class="fas fa-list me-2"></i>{% if is_admin %}Все задачи (администратор){% else %}История обработки файлов{% endif %}</h4>
-            </div>
-            <div class="card-body">
-                {% if jobs %}
-                    <div class="table-responsive">
-                        <table class="table table-hover">
-                            <thead class="table-light">
-                                <tr>
-                                    <th>Файл</th>
-                                    {% if is_admin %}<th>Пользователь</th>{% endif %}
-                                    <th>Шаблон</th>
-                                    <th>Статус</th>
-                                    <th>Прогресс</th>
-                                    <th class="text-nowrap">Дата создания</th>
-                                    <th>Действия</th>
-                                </tr>
-                            </thead>
-                            <tbody>
-                                {% for job in jobs %}
-                                    <tr>
-                                        <td><i class="fas fa-file me-1"></i>{{ job.filename }}</td>
-                                        {% if is_admin %}<td><small class="text-muted">{{ job.user_display }}</small></td>{% endif %}
-                                        <td><span class="badge bg-secondary">{{ 'без протокола' if job.template == 'none' else job.template }}</span></td>
-                                        <td>
-                                            {% if job.stage == 'completed' %}
-                                                <span class="badge bg-success"><i class="fas fa-check me-1"></i>Завершено</span>
-                                            {% elif job.stage == 'transcribed_only' %}
-                                                <span class="badge bg-success"><i class="fas fa-check me-1"></i>Транскрипция готова (без протокола)</span>
-                                            {% elif job.stage == 'protocol_error' %}
-                                                <span class="badge bg-warning text-dark"><i class="fas fa-exclamation-triangle me-1"></i>Транскрипт готов, ошибка протокола</span>
-                                            {% elif job.stage == 'transcription_error' %}
-                                                <span class="badge bg-danger"><i class="fas fa-exclamation me-1"></i>Ошибка транскрибации</span>
-                                            {% elif job.stage == 'generating_protocol' %}
-                                                <span class="badge bg-primary"><i class="fas fa-cog fa-spin me-1"></i>Генерация протокола</span>
-                                            {% elif job.stage == 'transcribing' %}
-                                                <span class="badge bg-info text-dark"><i class="fas fa-microphone me-1"></i>Транскрибация</span>
-                                            {% else %}
-                                                <span class="badge bg-warning"><i class="fas fa-clock me-1"></i>Ожидание</span>
-                                            {% endif %}
-                                        </td>
-                                        <td>
-                                            <div class="progress" style="height: 20px; width: 100px;">
-                                                <div class="progress-bar {% if job.stage in ['completed', 'transcribed_only'] %}bg-success{% elif job.stage == 'protocol_error' %}bg-warning{% elif job.stage == 'transcription_error' %}bg-danger{% else %}bg-primary{% endif %}"
-                                                    style="width: {{ job.progress }}%">
-                                                    <small>{{ job.progress }}%</small>
-                                                </div>
-                                            </div>
-                                        </td>
-                                        <td class="text-nowrap">{{ job.created_at }}</td>
-                                        <td>
-                                            <a href="/status/{{ job.id }}" class="btn btn-sm btn-outline-primary">
-                                                <i class="fas fa-eye me-1"></i>Подробнее
-                                            </a>
-                                        </td>
-                                    </tr>
-                                {% endfor %}
-                            </tbody>
-                        </table>
-                    </div>
-                {% else %}
-                    <div class="text-center py-5">
-                        <i class="fas fa-inbox fa-3x text-muted mb-3"></i>
-                        <h5 class="text-muted">Нет обработанных файлов</h5>
-                        <p class="text-muted">Загрузите первый файл для начала работы</p>
-                        <a href="/" class="btn btn-primary">
-                            <i class="fas fa-upload me-2"></i>Загрузить файл
-                        </a>
-                    </div>
-                {% endif %}
-            </div>
-        </div>
-    </div>
+            } catch (e) {
+                typing.remove();
+                userWrap.remove();
+                messages.pop();
+                input.value = text;
+                autoGrow();
+                addError('Не удалось связаться с сервером');
+            } finally {
+                sendBtn.disabled = false;
+                input.focus();
+            }
+        }
 
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
-</body>
-</html>
+        sendBtn.addEventListener('click', sendMessage);
+        input.addEventListener('input', scheduleAutoGrow);
+        input.addEventListener('keydown', function (e) {
+            if (e.key === 'Enter' && !e.shiftKey) { e.preventDefault(); sendMessage(); }
+        });
+
+        clearBtn.addEventListener('click', function () {
+            if (!messages.length) return;
+            if (!confirm('Очистить историю диалога?')) return;
+            messages = [];
+            chatLog.innerHTML = '';
+            chatLog.appendChild(emptyState);
+            emptyState.style.display = '';
+        });
+
+        input.focus();
+    </script>
+{% endblock %}
         '''
+
+    def get_stage_display(self, stage):
+        """Возвращает готовое оформление страницы статуса для этапа задачи"""
+        return _STATUS_STAGE_DISPLAY.get(stage, _STATUS_STAGE_DISPLAY_IN_PROGRESS)
+
+    def build_template_options(self, templates, selected=None, exclude=None):
+        """Строит HTML <option> для списка шаблонов протоколов"""
+        return Markup(''.join(
+            f'<option value="{escape(template_id)}"{" selected" if template_id == selected else ""}>'
+            f'{escape(template_id.title())} - {escape(description)}</option>'
+            for template_id, description in templates.items()
+            if template_id != exclude
+        ))
+
+    def render_jobs_rows(self, jobs, is_admin=False):
+        """Рендерит строки таблицы задач предкомпилированным шаблоном строки"""
+        render_row = _JOBS_ROW_TEMPLATE.render
+        return Markup(''.join(
+            render_row(
+                job=job,
+                is_admin=is_admin,
+                badge=_JOB_STAGE_BADGES.get(job['stage'], _JOB_STAGE_BADGE_DEFAULT),
+                progress_class=_JOB_PROGRESS_CLASSES.get(job['stage'], 'bg-primary'),
+            )
+            for job in jobs
+        ))
+
+    @staticmethod
+    @_minified
+    def get_jobs_template():
+        """Возвращает HTML шаблон списка задач"""
+        return _JOBS_HTML
     
-    def get_statistics_template(self):
+    @staticmethod
+    @_minified
+    def get_statistics_template():
         """Возвращает HTML шаблон страницы статистики"""
         return '''
-<!DOCTYPE html>
-<html lang="ru">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Статистика использования</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-</head>
-<body class="bg-light">
-    <nav class="navbar navbar-dark bg-primary">
-        <div class="container">
-            <a class="navbar-brand" href="/"><i class="fas fa-microphone me-2"></i>Meeting Processor</a>
-            <div class="navbar-nav d-flex flex-row">
-                <a class="nav-link me-3" href="/"><i class="fas fa-home me-1"></i>Главная</a>
-                <a class="nav-link me-3" href="/jobs"><i class="fas fa-list me-1"></i>Все задачи</a>
-                <a class="nav-link me-3" href="/docs"><i class="fas fa-book me-1"></i>Документация</a>
-                <a class="nav-link" href="/statistics"><i class="fas fa-chart-bar me-1"></i>Статистика</a>
-            </div>
-        </div>
-    </nav>
-
+{% extends "_layout.html" %}
+{% block title %}Статистика использования{% endblock %}
+{% block content %}
     <div class="container mt-4">
         <!-- Заголовок и фильтры -->
         <div class="row mb-4">
@@ -1320,7 +1455,7 @@ class WebTemplates:
                         <h5><i class="fas fa-chart-line me-2"></i>Активность по дням</h5>
                     </div>
                     <div class="card-body">
-                        <canvas id="dailyChart" height="100"></canvas>
+                        {{ stats.daily|daily_chart }}
                     </div>
                 </div>
             </div>
@@ -1396,13 +1531,10 @@ class WebTemplates:
                                     <tbody>
                                         {% for template in stats.templates %}
                                         <tr>
-                                            <td><strong>{{ template.template.title() }}</strong></td>
+                                            <td><strong>{{ template.display_name }}</strong></td>
                                             <td><span class="badge bg-info">{{ template.usage_count }}</span></td>
                                             <td><span class="badge bg-success">{{ template.completed_count }}</span></td>
-                                            <td>
-                                                {% set success_rate = (template.completed_count / template.usage_count * 100) if template.usage_count > 0 else 0 %}
-                                                <small>{{ "%.1f"|format(success_rate) }}%</small>
-                                            </td>
+                                            <td><small>{{ "%.1f"|format(template.success_rate) }}%</small></td>
                                         </tr>
                                         {% endfor %}
                                     </tbody>
@@ -1465,9 +1597,8 @@ class WebTemplates:
         </div>
         {% endif %}
     </div>
-
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
-    
+{% endblock %}
+{% block scripts %}
     <script>
         // Функции для работы с фильтром дат
         document.addEventListener('DOMContentLoaded', function() {
@@ -1599,444 +1730,18 @@ class WebTemplates:
         });
     </script>
     
-    {% if stats.daily %}
-    <script>
-        // График активности по дням
-        const dailyData = {{ stats.daily | tojson }};
-        
-        const ctx = document.getElementById('dailyChart').getContext('2d');
-        new Chart(ctx, {
-            type: 'line',
-            data: {
-                labels: dailyData.map(d => d.date).reverse(),
-                datasets: [{
-                    label: 'Протоколов создано',
-                    data: dailyData.map(d => d.protocols_count).reverse(),
-                    borderColor: 'rgb(75, 192, 192)',
-                    backgroundColor: 'rgba(75, 192, 192, 0.2)',
-                    tension: 0.1
-                }, {
-                    label: 'Успешно обработано',
-                    data: dailyData.map(d => d.completed_count).reverse(),
-                    borderColor: 'rgb(54, 162, 235)',
-                    backgroundColor: 'rgba(54, 162, 235, 0.2)',
-                    tension: 0.1
-                }]
-            },
-            options: {
-                responsive: true,
-                plugins: {
-                    title: {
-                        display: true,
-                        text: 'Активность по дням'
-                    }
-                },
-                scales: {
-                    y: {
-                        beginAtZero: true
-                    }
-                }
-            }
-        });
-    </script>
-    {% endif %}
-</body>
-</html>
+{% endblock %}
         '''
     
-    def get_docs_index_template(self):
+    @staticmethod
+    @_minified
+    def get_docs_index_template():
         """Возвращает HTML шаблон главной страницы документации"""
-        return '''
-<!DOCTYPE html>
-<html lang="ru">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Документация - Meeting Processor</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
-</head>
-<body class="bg-light">
-    <nav class="navbar navbar-dark bg-primary">
-        <div class="container">
-            <a class="navbar-brand" href="/"><i class="fas fa-microphone me-2"></i>Meeting Processor</a>
-            <div class="navbar-nav d-flex flex-row">
-                <a class="nav-link me-3" href="/"><i class="fas fa-home me-1"></i>Главная</a>
-                <a class="nav-link me-3" href="/jobs"><i class="fas fa-list me-1"></i>Все задачи</a>
-                <a class="nav-link me-3" href="/docs"><i class="fas fa-book me-1"></i>Документация</a>
-                <a class="nav-link" href="/statistics"><i class="fas fa-chart-bar me-1"></i>Статистика</a>
-            </div>
-        </div>
-    </nav>
-
-    <div class="container mt-4">
-        <div class="row">
-            <div class="col-12">
-                <div class="card shadow mb-4">
-                    <div class="card-header bg-info text-white">
-                        <h3><i class="fas fa-book me-2"></i>Документация по проведению встреч</h3>
-                        <p class="mb-0">Руководства для получения качественных протоколов с помощью автоматической транскрибации</p>
-                    </div>
-                </div>
-            </div>
-        </div>
-
-        <div class="row">
-            <div class="col-md-4 mb-4">
-                <div class="card h-100 shadow-sm">
-                    <div class="card-body">
-                        <div class="text-center mb-3">
-                            <i class="fas fa-tasks fa-3x text-success"></i>
-                        </div>
-                        <h5 class="card-title text-center">Быстрый чек-лист</h5>
-                        <p class="card-text">Краткий справочник для ежедневного использования: проверка перед встречей, правила во время встречи.</p>
-                        <div class="text-center">
-                            <a href="/docs/checklist" target="_blank" class="btn btn-success">
-                                <i class="fas fa-external-link-alt me-2"></i>Открыть
-                            </a>
-                        </div>
-                    </div>
-                </div>
-            </div>
-
-            <div class="col-md-4 mb-4">
-                <div class="card h-100 shadow-sm">
-                    <div class="card-body">
-                        <div class="text-center mb-3">
-                            <i class="fas fa-file-alt fa-3x text-info"></i>
-                        </div>
-                        <h5 class="card-title text-center">Полное руководство</h5>
-                        <p class="card-text">Детальные рекомендации по всем аспектам: техническая подготовка, правила речи, примеры практики.</p>
-                        <div class="text-center">
-                            <a href="/docs/guidelines" target="_blank" class="btn btn-info">
-                                <i class="fas fa-external-link-alt me-2"></i>Открыть
-                            </a>
-                        </div>
-                    </div>
-                </div>
-            </div>
-
-            <div class="col-md-4 mb-4">
-                <div class="card h-100 shadow-sm">
-                    <div class="card-body">
-                        <div class="text-center mb-3">
-                            <i class="fas fa-cogs fa-3x text-warning"></i>
-                        </div>
-                        <h5 class="card-title text-center">Техническое руководство</h5>
-                        <p class="card-text">Подробные инструкции по настройке записи для Zoom, Google Meet, KTalk и проприетарного ПО.</p>
-                        <div class="text-center">
-                            <a href="/docs/setup" target="_blank" class="btn btn-warning">
-                                <i class="fas fa-external-link-alt me-2"></i>Открыть
-                            </a>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-
-        <div class="row mt-4">
-            <div class="col-12">
-                <div class="card border-primary">
-                    <div class="card-header bg-primary text-white">
-                        <h5><i class="fas fa-lightbulb me-2"></i>Ключевые принципы</h5>
-                    </div>
-                    <div class="card-body">
-                        <div class="row">
-                            <div class="col-md-4">
-                                <h6><i class="fas fa-microphone text-primary me-2"></i>Главное правило</h6>
-                                <p class="small">Представление участников в начале встречи - КРИТИЧНО!</p>
-                            </div>
-                            <div class="col-md-4">
-                                <h6><i class="fas fa-comments text-success me-2"></i>Правила речи</h6>
-                                <p class="small">Четко говорить, делать паузы, называть себя при выступлении</p>
-                            </div>
-                            <div class="col-md-4">
-                                <h6><i class="fas fa-file-audio text-info me-2"></i>Техническая основа</h6>
-                                <p class="small">MP3, WAV, M4A, AAC (до 25МБ), 256 kbps, 44.1 kHz</p>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-
-        <div class="row mt-4">
-            <div class="col-12">
-                <div class="alert alert-info">
-                    <h6><i class="fas fa-info-circle me-2"></i>Как использовать документацию</h6>
-                    <ul class="mb-0">
-                        <li><strong>Новичкам:</strong> Начните с быстрого чек-листа, затем изучите полное руководство</li>
-                        <li><strong>Опытным пользователям:</strong> Используйте техническое руководство для настройки</li>
-                    </ul>
-                </div>
-            </div>
-        </div>
-    </div>
-
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
-</body>
-</html>
-        '''
+        return _DOCS_INDEX_HTML
     
-    def get_docs_view_template(self):
+    @staticmethod
+    @_minified
+    def get_docs_view_template():
         """Возвращает HTML шаблон для просмотра документации"""
-        return '''
-<!DOCTYPE html>
-<html lang="ru">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{{ doc_title }} - Meeting Processor</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
-    <script src="https://cdn.jsdelivr.net/npm/marked/marked.min.js"></script>
-    <style>
-        .markdown-content {
-            line-height: 1.7;
-            font-size: 16px;
-        }
-        .markdown-content h1 {
-            color: #0d6efd;
-            border-bottom: 3px solid #0d6efd;
-            padding-bottom: 0.5rem;
-            margin-top: 2rem;
-            margin-bottom: 1rem;
-        }
-        .markdown-content h2 {
-            color: #198754;
-            border-bottom: 2px solid #198754;
-            padding-bottom: 0.3rem;
-            margin-top: 1.5rem;
-            margin-bottom: 0.8rem;
-        }
-        .markdown-content h3 {
-            color: #fd7e14;
-            margin-top: 1.2rem;
-            margin-bottom: 0.6rem;
-        }
-        .markdown-content h4 {
-            color: #6f42c1;
-            margin-top: 1rem;
-            margin-bottom: 0.5rem;
-        }
-        .markdown-content ul, .markdown-content ol {
-            margin-bottom: 1rem;
-            padding-left: 1.5rem;
-        }
-        .markdown-content li {
-            margin-bottom: 0.3rem;
-        }
-        .markdown-content code {
-            background-color: #f8f9fa;
-            padding: 0.2rem 0.4rem;
-            border-radius: 0.25rem;
-            font-size: 0.9em;
-            color: #d63384;
-        }
-        .markdown-content pre {
-            background-color: #f8f9fa;
-            padding: 1rem;
-            border-radius: 0.5rem;
-            border-left: 4px solid #0d6efd;
-            overflow-x: auto;
-        }
-        .markdown-content pre code {
-            background: none;
-            padding: 0;
-            color: inherit;
-        }
-        .markdown-content blockquote {
-            border-left: 4px solid #0d6efd;
-            padding-left: 1rem;
-            margin: 1rem 0;
-            background-color: #f8f9fa;
-            padding: 0.8rem 1rem;
-            border-radius: 0.25rem;
-        }
-        .markdown-content table {
-            width: 100%;
-            margin-bottom: 1rem;
-            border-collapse: collapse;
-        }
-        .markdown-content table th,
-        .markdown-content table td {
-            padding: 0.75rem;
-            border: 1px solid #dee2e6;
-        }
-        .markdown-content table th {
-            background-color: #e9ecef;
-            font-weight: bold;
-        }
-        .markdown-content table tr:nth-child(even) {
-            background-color: #f8f9fa;
-        }
-        .markdown-content .emoji {
-            font-size: 1.2em;
-        }
-        .toc {
-            background-color: #f8f9fa;
-            border: 1px solid #dee2e6;
-            border-radius: 0.5rem;
-            padding: 1rem;
-            margin-bottom: 2rem;
-        }
-        .toc ul {
-            margin-bottom: 0;
-        }
-        .toc a {
-            text-decoration: none;
-            color: #0d6efd;
-        }
-        .toc a:hover {
-            text-decoration: underline;
-        }
-        .back-to-top {
-            position: fixed;
-            bottom: 20px;
-            right: 20px;
-            z-index: 1000;
-        }
-    </style>
-</head>
-<body class="bg-light">
-    <nav class="navbar navbar-dark bg-primary sticky-top">
-        <div class="container">
-            <a class="navbar-brand" href="/"><i class="fas fa-microphone me-2"></i>Meeting Processor</a>
-            <div class="navbar-nav d-flex flex-row">
-                <a class="nav-link me-3" href="/"><i class="fas fa-home me-1"></i>Главная</a>
-                <a class="nav-link me-3" href="/jobs"><i class="fas fa-list me-1"></i>Все задачи</a>
-                <a class="nav-link me-3" href="/docs"><i class="fas fa-book me-1"></i>Документация</a>
-                <a class="nav-link" href="/statistics"><i class="fas fa-chart-bar me-1"></i>Статистика</a>
-            </div>
-        </div>
-    </nav>
-
-    <div class="container mt-4">
-        <div class="card shadow">
-            <div class="card-header bg-info text-white d-flex justify-content-between align-items-center">
-                <h4><i class="fas fa-book me-2"></i>{{ doc_title }}</h4>
-                <div>
-                    <button onclick="window.print()" class="btn btn-light btn-sm me-2">
-                        <i class="fas fa-print me-1"></i>Печать
-                    </button>
-                    <button onclick="toggleToc()" class="btn btn-outline-light btn-sm">
-                        <i class="fas fa-list me-1"></i>Содержание
-                    </button>
-                </div>
-            </div>
-            <div class="card-body">
-                <!-- Содержание (скрыто по умолчанию) -->
-                <div id="toc" class="toc" style="display: none;">
-                    <h6><i class="fas fa-list me-2"></i>Содержание</h6>
-                    <div id="toc-content"></div>
-                </div>
-                
-                <!-- Основной контент -->
-                <div id="markdown-content" class="markdown-content"></div>
-            </div>
-        </div>
-    </div>
-
-    <!-- Кнопка "Наверх" -->
-    <button onclick="scrollToTop()" class="btn btn-primary back-to-top" title="Наверх">
-        <i class="fas fa-arrow-up"></i>
-    </button>
-
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
-    <script>
-        // Загружаем и отображаем markdown контент
-        const markdownText = {{ content|tojson }};
-        const contentDiv = document.getElementById('markdown-content');
-        
-        // Настраиваем marked для поддержки эмодзи
-        marked.setOptions({
-            breaks: true,
-            gfm: true
-        });
-        
-        // Конвертируем markdown в HTML
-        contentDiv.innerHTML = marked.parse(markdownText);
-        
-        // Генерируем содержание
-        generateToc();
-        
-        // Добавляем якоря к заголовкам
-        addAnchorsToHeadings();
-        
-        function generateToc() {
-            const headings = contentDiv.querySelectorAll('h1, h2, h3, h4');
-            const tocContent = document.getElementById('toc-content');
-            
-            if (headings.length === 0) {
-                document.getElementById('toc').style.display = 'none';
-                return;
-            }
-            
-            let tocHtml = '<ul>';
-            headings.forEach((heading, index) => {
-                const id = 'heading-' + index;
-                heading.id = id;
-                const level = parseInt(heading.tagName.charAt(1));
-                const indent = 'ms-' + ((level - 1) * 3);
-                tocHtml += `<li class="${indent}"><a href="#${id}">${heading.textContent}</a></li>`;
-            });
-            tocHtml += '</ul>';
-            
-            tocContent.innerHTML = tocHtml;
-        }
-        
-        function addAnchorsToHeadings() {
-            const headings = contentDiv.querySelectorAll('h1, h2, h3, h4');
-            headings.forEach(heading => {
-                heading.style.cursor = 'pointer';
-                heading.title = 'Нажмите, чтобы скопировать ссылку';
-                heading.addEventListener('click', function() {
-                    const url = window.location.origin + window.location.pathname + '#' + this.id;
-                    navigator.clipboard.writeText(url).then(() => {
-                        // Показываем уведомление
-                        const toast = document.createElement('div');
-                        toast.className = 'alert alert-success position-fixed';
-                        toast.style.cssText = 'top: 20px; right: 20px; z-index: 9999; opacity: 0.9;';
-                        toast.innerHTML = '<i class="fas fa-check me-2"></i>Ссылка скопирована!';
-                        document.body.appendChild(toast);
-                        setTimeout(() => toast.remove(), 2000);
-                    });
-                });
-            });
-        }
-        
-        function toggleToc() {
-            const toc = document.getElementById('toc');
-            toc.style.display = toc.style.display === 'none' ? 'block' : 'none';
-        }
-        
-        function scrollToTop() {
-            window.scrollTo({ top: 0, behavior: 'smooth' });
-        }
-        
-        // Показываем/скрываем кнопку "Наверх"
-        window.addEventListener('scroll', function() {
-            const backToTop = document.querySelector('.back-to-top');
-            if (window.pageYOffset > 300) {
-                backToTop.style.display = 'block';
-            } else {
-                backToTop.style.display = 'none';
-            }
-        });
-        
-        // Плавная прокрутка для якорных ссылок
-        document.addEventListener('click', function(e) {
-            if (e.target.tagName === 'A' && e.target.getAttribute('href').startsWith('#')) {
-                e.preventDefault();
-                const targetId = e.target.getAttribute('href').substring(1);
-                const targetElement = document.getElementById(targetId);
-                if (targetElement) {
-                    targetElement.scrollIntoView({ behavior: 'smooth', block: 'start' });
-                }
-            }
-        });
-    </script>
-</body>
-</html>
-        '''
+        return _DOCS_VIEW_HTML
 
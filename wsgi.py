@@ -7,25 +7,205 @@ Meeting Processor Web Application
 
 import os
 import sys
+import time
+import queue
+import secrets
+import atexit
 import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
-# Добавляем текущую директорию в путь
-sys.path.insert(0, os.path.dirname(__file__))
+# Добавляем директорию приложения в путь (один раз, даже при повторной загрузке модуля)
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+# Создаем logs директорию если её нет (единственная проверка при старте).
+# Путь абсолютный: лог не раздваивается, если gunicorn запущен из другой рабочей директории
+LOG_DIR = Path(os.environ.get('LOG_DIR') or Path(APP_DIR) / 'logs')
+LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+# Файл лога пишется пачками: буфер сбрасывается раз в LOG_FLUSH_INTERVAL секунд и сразу на ERROR.
+# Размер файла до ротации и число архивов настраиваются окружением под объем логов развертывания
+LOG_FLUSH_INTERVAL = float(os.environ.get('LOG_FLUSH_INTERVAL_S', 30))
+LOG_MAX_BYTES = int(os.environ.get('LOG_MAX_BYTES', 256 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.environ.get('LOG_BACKUP_COUNT', 3))
+LOG_BUFFER_SIZE = 64 * 1024
+# Дублирование записей в stderr: по умолчанию только в терминале и при разработке.
+# В production stderr собирает gunicorn/Docker, и каждая запись писалась бы второй раз
+_log_stderr = os.environ.get('LOG_STDERR', '').lower()
+LOG_STDERR = (_log_stderr in ('1', 'true', 'yes') if _log_stderr else
+              sys.stderr.isatty() or os.environ.get('FLASK_ENV') == 'development')
+
+# Окружение читается один раз при импорте: create_app может вызываться повторно (тесты, перезагрузка)
+CONFIG_FILE = os.environ.get('MEETING_CONFIG', 'config.json')
+# Ключ подписи сессий не кладем в logs/: логи ротируются, архивируются и пересылаются
+INSTANCE_DIR = Path(os.environ.get('INSTANCE_DIR') or Path(APP_DIR) / 'instance')
+SECRET_KEY_FILE = os.environ.get('SECRET_KEY_FILE', str(INSTANCE_DIR / 'secret_key'))
+JINJA_CACHE_DIR = os.environ.get('JINJA_CACHE_DIR', str(LOG_DIR / '.jinja_cache'))
+APP_CONFIG = {
+    'UPLOAD_FOLDER': os.environ.get('UPLOAD_FOLDER', 'web_uploads'),
+    'OUTPUT_FOLDER': os.environ.get('OUTPUT_FOLDER', 'web_output'),
+    'TEMPLATES_AUTO_RELOAD': False,
+}
+
+# Поток, который пишет записи логов из очереди в файл и консоль
+_log_listener = None
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler без flush() и stat() на каждую запись
+
+    Между сбросами размер файла считается по записанным байтам, запись
+    форматируется один раз, буфер сбрасывается по времени или сразу
+    для записей ERROR и выше (и при закрытии обработчика).
+
+    Несколько воркеров gunicorn пишут в один файл через свои дескрипторы:
+    при каждом сбросе размер берется из fstat, поэтому в лимит попадают и
+    записи других воркеров. Перед ротацией и при сбросе буфера проверяется,
+    не переименовал ли файл другой воркер (или внешний logrotate при
+    LOG_MAX_BYTES=0), и тогда файл переоткрывается вместо повторной ротации.
+    """
+
+    def __init__(self, *args, flush_interval: float = LOG_FLUSH_INTERVAL, **kwargs):
+        self.flush_interval = flush_interval
+        self._size = 0
+        self._last_flush = time.monotonic()
+        super().__init__(*args, **kwargs)
+
+    def _open(self):
+        stream = open(self.baseFilename, self.mode, buffering=LOG_BUFFER_SIZE,
+                      encoding=self.encoding, errors=self.errors)
+        self._size = os.path.getsize(self.baseFilename)
+        return stream
+
+    def _is_current_file(self) -> bool:
+        """Поток пишет в файл, который сейчас лежит по пути лога"""
+        try:
+            return os.stat(self.baseFilename).st_ino == os.fstat(self.stream.fileno()).st_ino
+        except OSError:
+            return False
+
+    def _reopen(self):
+        """Закрывает поток; файл откроется заново при следующей записи"""
+        self.stream.close()
+        self.stream = None
+
+    def reset_after_fork(self):
+        """Воркер открывает файл своим дескриптором, не используя буфер мастера
+
+        Поток мастера мог дописать в буфер записи уже после сброса перед fork:
+        их допишет сам мастер, а копия в воркере уходит в /dev/null.
+        """
+        if self.stream is None:
+            return
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        try:
+            os.dup2(devnull, self.stream.fileno())
+        finally:
+            os.close(devnull)
+        self._reopen()
+
+    def flush(self):
+        with self.lock:
+            super().flush()
+            if self.stream is not None:
+                self._size = os.fstat(self.stream.fileno()).st_size
+            self._last_flush = time.monotonic()
+
+    def emit(self, record):
+        try:
+            msg = self.format(record) + self.terminator
+            size = len(msg.encode(self.encoding or 'utf-8', errors='replace'))
+            if self.stream is not None and self.maxBytes > 0 and self._size + size >= self.maxBytes:
+                # После сброса размер известен с учетом записей других воркеров
+                self.flush()
+                if not self._is_current_file():
+                    self._reopen()
+                elif self._size + size >= self.maxBytes:
+                    self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(msg)
+            self._size += size
+            if record.levelno >= logging.ERROR or time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+                if not self._is_current_file():
+                    self._reopen()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class FlushingQueueListener(QueueListener):
+    """QueueListener, который сбрасывает буферы обработчиков, пока очередь пуста
+
+    Без этого последние записи перед паузой в запросах оставались бы в буфере
+    BufferedRotatingFileHandler до следующей записи: интервал сброса
+    ограничивает задержку и когда приложение простаивает.
+    """
+
+    def __init__(self, *args, flush_interval: float = LOG_FLUSH_INTERVAL, **kwargs):
+        self.flush_interval = flush_interval
+        super().__init__(*args, **kwargs)
+
+    def dequeue(self, block):
+        if not block:
+            return self.queue.get(False)
+        while True:
+            try:
+                return self.queue.get(True, timeout=self.flush_interval)
+            except queue.Empty:
+                for handler in self.handlers:
+                    handler.flush()
+
+
+def _flush_log_handlers():
+    """Перед fork сбрасывает буферы, чтобы воркер не дописал в файл копию записей мастера"""
+    if _log_listener is None:
+        return
+    for handler in _log_listener.handlers:
+        handler.flush()
+
+
+def _restart_log_listener():
+    """После fork поток записи логов не копируется: воркер запускает свой с новой очередью"""
+    global _log_listener
+    if _log_listener is None:
+        return
+    for handler in _log_listener.handlers:
+        if isinstance(handler, BufferedRotatingFileHandler):
+            handler.reset_after_fork()
+    log_queue = queue.SimpleQueue()
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, QueueHandler):
+            handler.queue = log_queue
+    _log_listener = FlushingQueueListener(log_queue, *_log_listener.handlers, respect_handler_level=True)
+    _log_listener.start()
+
+
+def _stop_log_listener():
+    """Дописывает оставшиеся в очереди записи при завершении процесса"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
 
-# Создаем logs директорию если её нет
-os.makedirs('logs', exist_ok=True)
 
 # Настройка унифицированного логирования для WSGI
 def setup_wsgi_logging(log_level: str = "INFO", log_file: str = "web_app.log"):
-    """Настраивает систему логирования для WSGI"""
-    from logging.handlers import RotatingFileHandler
+    """Настраивает систему логирования для WSGI
+
+    Потоки запросов только кладут записи в очередь (QueueHandler), а запись
+    на диск и в консоль выполняет фоновый QueueListener.
+    """
+    global _log_listener
     
     level = getattr(logging, log_level.upper(), logging.INFO)
     
-    # Создаем папку для логов
-    os.makedirs("logs", exist_ok=True)
-    log_path = os.path.join("logs", log_file)
+    # Папка logs создается один раз при импорте модуля
+    log_path = str(LOG_DIR / log_file)
     
     # Проверяем, не настроено ли уже логирование
     root_logger = logging.getLogger()
@@ -33,67 +213,143 @@ def setup_wsgi_logging(log_level: str = "INFO", log_file: str = "web_app.log"):
         # Логирование уже настроено, используем существующую конфигурацию
         return logging.getLogger(__name__)
     
-    # Очищаем существующие обработчики
-    for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
-    
     handlers = [
-        RotatingFileHandler(log_path, maxBytes=100*1024*1024, backupCount=3, encoding='utf-8'),
-        logging.StreamHandler()
+        BufferedRotatingFileHandler(log_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+                                    encoding='utf-8', delay=True)
     ]
+    if LOG_STDERR:
+        handlers.append(logging.StreamHandler())
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()
+    _log_listener = FlushingQueueListener(log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(_stop_log_listener)
+    # gunicorn с preload_app создает воркеры через fork уже после запуска потока
+    os.register_at_fork(before=_flush_log_handlers, after_in_child=_restart_log_listener)
+    
+    # Запись форматируется окончательно в обработчиках слушателя
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
     
-    logging.basicConfig(
-        level=level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=handlers,
-        force=True  # Переопределяем существующую конфигурацию
-    )
+    root_logger.addHandler(queue_handler)
+    root_logger.setLevel(level)
+    # Формат не использует поток и процесс: не собираем эти данные для каждой записи
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
     
-    # Настраиваем уровни для различных логгеров
+    # Встроенный сервер werkzeug может быть запущен и через `flask run`, минуя __main__;
+    # уровень логгера gunicorn настраиваем, только если приложение запущено им
     logging.getLogger('werkzeug').setLevel(logging.WARNING)
-    logging.getLogger('gunicorn').setLevel(logging.INFO)
+    if 'gunicorn' in sys.modules:
+        logging.getLogger('gunicorn').setLevel(logging.INFO)
     
     return logging.getLogger(__name__)
 
-logger = setup_wsgi_logging()
+logger = setup_wsgi_logging(os.environ.get('LOG_LEVEL', 'INFO'))
 
-def create_app():
-    """Создает и настраивает Flask приложение для production"""
+# Приложение импортируется после настройки логирования: ошибки импорта видны сразу при старте,
+# а под preload_app загруженные модули общие для всех воркеров
+from jinja2 import FileSystemBytecodeCache
+from run_web import WorkingMeetingWebApp
+
+def load_secret_key(path: str = SECRET_KEY_FILE) -> bytes:
+    """Возвращает SECRET_KEY: из окружения или из файла, общего для всех воркеров (создается один раз)"""
+    key = os.environ.get('SECRET_KEY')
+    if key:
+        return key.encode('utf-8')
+    os.makedirs(os.path.dirname(path) or '.', mode=0o700, exist_ok=True)
+    # Ключ пишем во временный файл и публикуем через os.link: файл появляется сразу
+    # целиком, а если воркеры стартуют одновременно, выигрывает только первый
+    tmp_path = f"{path}.{os.getpid()}.{secrets.token_hex(4)}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(secrets.token_bytes(32))
+    try:
+        os.link(tmp_path, path)
+        logger.warning("SECRET_KEY не задан в окружении, создан новый ключ: %s. "
+                       "При нескольких серверах задайте общий SECRET_KEY, иначе сессии не будут общими", path)
+    except FileExistsError:
+        pass
+    finally:
+        os.unlink(tmp_path)
+    with open(path, 'rb') as f:
+        key = f.read()
+    if not key:
+        raise RuntimeError(f"Файл ключа {path} пуст: задайте SECRET_KEY или удалите файл")
+    return key
+
+def create_app(warm: bool = True):
+    """Создает и настраивает Flask приложение для production (warm=True — с прогревом до первого запроса)"""
     
     try:
-        # Импортируем наше приложение
-        from run_web import WorkingMeetingWebApp
-        
         # Создаем приложение
-        config_file = os.environ.get('MEETING_CONFIG', 'config.json')
-        web_app = WorkingMeetingWebApp(config_file)
+        web_app = WorkingMeetingWebApp(CONFIG_FILE)
         
         # Настраиваем для production
         app = web_app.app
-        app.config.update(
-            SECRET_KEY=os.environ.get('SECRET_KEY', os.urandom(24)),
-            UPLOAD_FOLDER=os.environ.get('UPLOAD_FOLDER', 'web_uploads'),
-            OUTPUT_FOLDER=os.environ.get('OUTPUT_FOLDER', 'web_output'),
-        )
+        app.config.update(APP_CONFIG)
+        # Один ключ на все воркеры: сессии не сбрасываются, когда запрос попадает в другой процесс
+        app.config['SECRET_KEY'] = load_secret_key()
+        # Шаблоны меняются только вместе с кодом: не проверяем их актуальность при каждом рендере
+        app.jinja_env.auto_reload = False
+        
+        # Скомпилированные шаблоны сохраняются на диск: новые воркеры не компилируют их заново
+        try:
+            os.makedirs(JINJA_CACHE_DIR, exist_ok=True)
+            app.jinja_env.bytecode_cache = FileSystemBytecodeCache(JINJA_CACHE_DIR)
+        except OSError as e:
+            logger.warning("Кеш байткода шаблонов отключен (%s): %s", JINJA_CACHE_DIR, e)
+        
+        # Шаблоны, страницы без данных запроса и обработка запросов прогреваются при старте
+        # (gunicorn с preload_app делает это один раз, воркеры получают результат через fork)
+        if warm:
+            try:
+                web_app.warmup()
+            except Exception as e:
+                logger.warning("Прогрев не выполнен, работа будет сделана при первых запросах: %s", e)
         
         logger.info("Flask приложение создано успешно")
         return app
         
     except Exception as e:
-        logger.error(f"Ошибка создания приложения: {e}")
+        logger.error("Ошибка создания приложения: %s", e)
         raise
 
+def health_probe_middleware(wsgi_app, path: str = '/healthz'):
+    """Отвечает на проверки живости балансировщика до Flask (без сессий, аутентификации и БД)"""
+    body = b'OK'
+    headers = [('Content-Type', 'text/plain'), ('Content-Length', str(len(body))), ('Cache-Control', 'no-store')]
+
+    def middleware(environ, start_response):
+        if environ.get('PATH_INFO') == path:
+            start_response('200 OK', headers)
+            return [body]
+        return wsgi_app(environ, start_response)
+
+    return middleware
+
 # Создаем экземпляр приложения
 application = create_app()
+# /healthz — частые проверки живости; /health по-прежнему проверяет базу данных
+application.wsgi_app = health_probe_middleware(application.wsgi_app)
 
 # Для совместимости с различными WSGI серверами
 app = application
 
 if __name__ == "__main__":
-    # Для локального тестирования
+    # Встроенный сервер Werkzeug — только для локальной отладки (FLASK_ENV=development).
+    # В production: gunicorn --config gunicorn.conf.py wsgi:application
+    if os.environ.get('FLASK_ENV') != 'development':
+        print("Запуск в production: gunicorn --config gunicorn.conf.py wsgi:application\n"
+              "Для локальной отладки: FLASK_ENV=development python wsgi.py", file=sys.stderr)
+        sys.exit(1)
+
     port = int(os.environ.get('PORT', 8000))
     host = os.environ.get('HOST', '0.0.0.0')
-    debug = os.environ.get('FLASK_ENV') == 'development'
     
-    logger.info(f"Запуск development сервера на {host}:{port}")
-    application.run(host=host, port=port, debug=debug)
+    logger.info("Запуск development сервера на %s:%d", host, port)
+    application.run(host=host, port=port, debug=True, threaded=True)